@@ -0,0 +1,149 @@
+"""
+Concurrency benchmark for the sync vs async retrieval paths
+
+Loads the shipped FAISS index with a fake embedder that sleeps for a fixed
+latency (standing in for the Gemini round trip), fires N concurrent searches
+through RetrieverService.search and RetrieverService.asearch, and measures how
+long a 1 ms heartbeat task is starved of the event loop.
+
+Usage:
+    python benchmarks/async_retrieval_benchmark.py --concurrency 50 --latency-ms 80
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import List
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from langchain_core.embeddings import Embeddings
+from langchain_community.vectorstores import FAISS
+from com.mhire.app.services.rag.retriever import RetrieverService
+from com.mhire.app.services.rag.search_executor import SearchExecutor
+
+
+QUERIES = [
+    "I'm having cravings",
+    "can't sleep at night",
+    "where can I find treatment",
+    "feeling anxious and overwhelmed",
+    "how do I cope with withdrawal",
+]
+
+
+class SlowFakeEmbeddings(Embeddings):
+    """Deterministic hash-based embeddings with a simulated network latency"""
+
+    def __init__(self, dimension: int, latency_s: float):
+        self.dimension = dimension
+        self.latency_s = latency_s
+
+    def _vector(self, text: str) -> List[float]:
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        return [((digest[i % len(digest)] / 255.0) - 0.5) for i in range(self.dimension)]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(self.latency_s)
+        return [self._vector(t) for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        time.sleep(self.latency_s)
+        return self._vector(text)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        await asyncio.sleep(self.latency_s)
+        return [self._vector(t) for t in texts]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        await asyncio.sleep(self.latency_s)
+        return self._vector(text)
+
+
+def build_retriever(latency_s: float) -> RetrieverService:
+    """Build a RetrieverService over the shipped index without touching Gemini"""
+    faiss_path = project_root / "com/mhire/app/data/vector_db/faiss_index"
+    embeddings = SlowFakeEmbeddings(dimension=1, latency_s=latency_s)
+    vectorstore = FAISS.load_local(
+        str(faiss_path),
+        embeddings,
+        allow_dangerous_deserialization=True
+    )
+    embeddings.dimension = vectorstore.index.d
+
+    retriever = RetrieverService.__new__(RetrieverService)
+    retriever.similarity_threshold = 0.0
+    retriever.vectorstore = vectorstore
+    retriever.embeddings = embeddings
+    retriever.search_executor = SearchExecutor()
+    retriever.numpy_index = None
+    retriever.partitions = {}
+    retriever._stats_lock = threading.Lock()
+    retriever.search_counts = Counter()
+    return retriever
+
+
+async def _heartbeat(stop: asyncio.Event, lags: List[float], interval_s: float = 0.001):
+    """Record how late each 1 ms tick fires; large values mean a blocked loop"""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval_s
+        await asyncio.sleep(interval_s)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def run_mode(retriever: RetrieverService, mode: str, concurrency: int) -> dict:
+    """Fire `concurrency` searches at once and report wall time and loop lag"""
+    stop = asyncio.Event()
+    lags: List[float] = []
+    heartbeat = asyncio.create_task(_heartbeat(stop, lags))
+    await asyncio.sleep(0.01)
+
+    async def one(i: int):
+        query = QUERIES[i % len(QUERIES)]
+        if mode == "sync":
+            return retriever.search(query, top_k=3)
+        return await retriever.asearch(query, top_k=3)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await heartbeat
+
+    lags_ms = sorted(lag * 1000 for lag in lags) or [0.0]
+    return {
+        "mode": mode,
+        "concurrency": concurrency,
+        "wall_time_ms": round(elapsed * 1000, 2),
+        "loop_lag_max_ms": round(lags_ms[-1], 2),
+        "loop_lag_p99_ms": round(lags_ms[int(0.99 * (len(lags_ms) - 1))], 2),
+        "loop_lag_mean_ms": round(statistics.fmean(lags_ms), 2),
+    }
+
+
+async def main(concurrency: int, latency_ms: float):
+    retriever = build_retriever(latency_ms / 1000)
+    results = [
+        await run_mode(retriever, "sync", concurrency),
+        await run_mode(retriever, "async", concurrency),
+    ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sync vs async retrieval concurrency benchmark")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=80.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency, args.latency_ms))
@@ -0,0 +1,158 @@
+"""
+Regression corpus and micro-benchmark for the compiled keyword router
+
+Compares KeywordRouter against the original substring scan over
+RAG_TRIGGER_KEYWORDS. Every corpus query must route the same way as before,
+except the entries in INTENTIONAL_CHANGES (substring false positives fixed by
+word-boundary matching, and "-ing" forms the substring scan never reached).
+Exits non-zero on any unexpected difference.
+
+Usage:
+    python benchmarks/keyword_router_benchmark.py --iterations 2000
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from com.mhire.app.services.ai_chat.keyword_router import (
+    RAG_TRIGGER_KEYWORDS,
+    CATEGORY_PRIORITY,
+    KeywordRouter
+)
+
+
+CORPUS = [
+    "I want to kill myself",
+    "I'm having suicidal thoughts and don't know what to do",
+    "this is an emergency",
+    "I'm having really bad cravings tonight",
+    "I crave a drink so badly",
+    "I relapsed last weekend",
+    "I slipped up and used again",
+    "I got triggered at a party",
+    "I'm so stressful and overwhelmed",
+    "I feel lonely and anxious",
+    "What are withdrawal symptoms like?",
+    "I'm going through detox and have the shakes",
+    "I need help finding a program",
+    "Is there a hotline I can call?",
+    "Tell me about buprenorphine",
+    "Does naltrexone work for alcohol?",
+    "I've been drinking every night",
+    "How do I stop smoking cigarettes",
+    "I keep vaping at work",
+    "What coping strategies can I try?",
+    "Any tips for mindfulness and breathing?",
+    "I've been sober for 30 days",
+    "Where can I find an AA meeting",
+    "What are fentanyl test strips?",
+    "How does needle exchange work",
+    "I think I have depression",
+    "My panic attacks are getting worse",
+    "I can't sleep at night",
+    "I have a headache and stomach ache",
+    "hi",
+    "hello there",
+    "thanks so much",
+    "what's the weather like",
+    "tell me a joke",
+    "ok",
+    # Inflected short keywords must keep their category (crisis above all)
+    "I think I ODed",
+    "I OD'd last year",
+    "my friend keeps oding",
+    "he ODs every few months",
+    "that was really helpful",
+    "thanks for helping me",
+    "I keep calling my sponsor",
+    "my back is so painful",
+    "I coped better this week",
+    "I quit drugs last year",
+    "I got some tips from my counselor",
+]
+
+# Queries whose category intentionally changed, with (old, new) categories
+INTENTIONAL_CHANGES = {
+    "good morning": ("crisis", None),              # "od" inside "good"
+    "I love bananas": ("recovery", None),          # "na" inside "bananas"
+    "that doesn't matter": ("medication", None),   # "mat" inside "matter"
+    "I bought a new mattress": ("medication", None),
+    "which method is best?": ("crisis", "coping"),  # "od" and "meth" inside "method"
+    "I read an article about oxygen": ("substances", None),  # "oxy" inside "oxygen"
+    "call SAMHSA for me": ("help", "crisis"),       # upper-case keyword never matched
+    "managing stress is hard": ("recovery", "coping"),  # "na" inside "managing"; "manage" -> "managing"
+    "is overdosing on pills common?": ("substances", "crisis"),  # "overdose" -> "overdosing"
+    "that's odd": ("crisis", None),                 # "od" inside "odd"
+    "my legs are aching": (None, "physical"),       # "ache" -> "aching"
+}
+
+
+def legacy_route(query: str) -> Optional[str]:
+    """The original substring scan, kept here as the regression oracle"""
+    query_lower = query.lower()
+    for category in CATEGORY_PRIORITY:
+        if any(keyword in query_lower for keyword in RAG_TRIGGER_KEYWORDS.get(category, [])):
+            return category
+    return None
+
+
+def check_regressions(router: KeywordRouter) -> list:
+    failures = []
+    for query in CORPUS:
+        expected = legacy_route(query)
+        actual = router.route(query)
+        if actual != expected:
+            failures.append({"query": query, "legacy": expected, "router": actual})
+    for query, (old, new) in INTENTIONAL_CHANGES.items():
+        legacy, actual = legacy_route(query), router.route(query)
+        if legacy != old or actual != new:
+            failures.append({
+                "query": query,
+                "legacy": legacy,
+                "router": actual,
+                "expected": [old, new]
+            })
+    return failures
+
+
+def time_per_query_us(route, queries: list, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for query in queries:
+            route(query)
+    elapsed = time.perf_counter() - start
+    return elapsed / (iterations * len(queries)) * 1e6
+
+
+def main(iterations: int) -> int:
+    compile_start = time.perf_counter()
+    router = KeywordRouter(RAG_TRIGGER_KEYWORDS, CATEGORY_PRIORITY)
+    compile_ms = (time.perf_counter() - compile_start) * 1000
+
+    failures = check_regressions(router)
+    queries = CORPUS + list(INTENTIONAL_CHANGES)
+    report = {
+        "patterns": router.pattern_count,
+        "compile_ms": round(compile_ms, 3),
+        "legacy_us_per_query": round(time_per_query_us(legacy_route, queries, iterations), 2),
+        "router_us_per_query": round(time_per_query_us(router.route, queries, iterations), 2),
+        "corpus_size": len(queries),
+        "regressions": failures,
+    }
+    print(json.dumps(report, indent=2))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Keyword router regression check and micro-benchmark")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    sys.exit(main(args.iterations))
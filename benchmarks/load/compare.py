@@ -0,0 +1,70 @@
+"""
+Compare two load_test.py JSON reports (baseline vs candidate build)
+
+Prints p50/p95/p99, throughput and error rate side by side for the overall
+run and each scenario. With --max-p95-regression, exits non-zero when any
+p95 got worse by more than that fraction, so it can gate CI.
+
+Usage:
+    python benchmarks/load/compare.py results/main.json results/branch.json --max-p95-regression 0.1
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+def _change(before: Optional[float], after: Optional[float]) -> Optional[float]:
+    if before is None or after is None or before == 0:
+        return None
+    return (after - before) / before
+
+
+def _rows(name: str, baseline: Dict, candidate: Dict) -> List[str]:
+    rows = []
+    for key in ("p50", "p95", "p99"):
+        before, after = baseline["latency_ms"][key], candidate["latency_ms"][key]
+        change = _change(before, after)
+        rows.append(f"{name:<16} {key + ' ms':<16} {before!s:>10} {after!s:>10} "
+                    f"{'' if change is None else f'{change:+.1%}':>9}")
+    for key in ("throughput_rps", "error_rate"):
+        before, after = baseline[key], candidate[key]
+        change = _change(before, after)
+        rows.append(f"{name:<16} {key:<16} {before!s:>10} {after!s:>10} "
+                    f"{'' if change is None else f'{change:+.1%}':>9}")
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two load test reports")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--max-p95-regression", type=float, help="Fail if any p95 grows by more than this fraction")
+    args = parser.parse_args(argv)
+
+    baseline = json.loads(Path(args.baseline).read_text())
+    candidate = json.loads(Path(args.candidate).read_text())
+
+    print(f"{'scope':<16} {'metric':<16} {'baseline':>10} {'candidate':>10} {'change':>9}")
+    pairs = [("overall", baseline["overall"], candidate["overall"])]
+    pairs += [
+        (name, baseline["scenarios"][name], candidate["scenarios"][name])
+        for name in sorted(set(baseline["scenarios"]) & set(candidate["scenarios"]))
+    ]
+    regressions = []
+    for name, before, after in pairs:
+        for row in _rows(name, before, after):
+            print(row)
+        change = _change(before["latency_ms"]["p95"], after["latency_ms"]["p95"])
+        if args.max_p95_regression is not None and change is not None and change > args.max_p95_regression:
+            regressions.append(f"{name}: p95 {change:+.1%}")
+
+    if regressions:
+        print(f"\np95 regressions over {args.max_p95_regression:.0%}: " + ", ".join(regressions))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
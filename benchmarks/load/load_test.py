@@ -0,0 +1,246 @@
+"""
+Async load generator for the chat API
+
+Drives the FastAPI app either in-process (ASGI transport, no network) or a
+running server over HTTP, with a weighted request mix, and reports latency
+percentiles, throughput and error rate as JSON so builds can be compared.
+
+Two arrival models:
+- closed: --concurrency workers each send the next request as soon as the
+  previous one finishes (measures capacity)
+- open:   requests arrive as a Poisson process at --rate per second whether or
+  not earlier ones finished (measures latency under a given load). Latency is
+  measured from the scheduled arrival time, so a stalled server is not hidden
+  by the client slowing down.
+
+In-process runs default to the offline stub provider (LLM_PROVIDER=stub), so
+no Gemini quota is needed; use --provider gemini to hit the real API.
+
+Caches: single-flight result holding and the query embedding cache answer
+repeated payloads without doing the work, which inflates throughput. Payloads
+are varied by default (see scenarios.py), and in-process runs also start the
+app with SINGLE_FLIGHT_RESULT_TTL_SECONDS=0 and EMBEDDING_CACHE_SIZE=0 (and
+no on-disk embedding cache). Pass --warm-caches to keep the app's cache
+settings, and --fixed-payloads to repeat the fixed query lists. For --target
+URLs the server's own settings apply: start it with the same two variables
+set to 0 when the run is meant to measure real work.
+
+Usage:
+    python benchmarks/load/load_test.py --mode closed --concurrency 20 --duration 30
+    python benchmarks/load/load_test.py --mode open --rate 15 --duration 60 --output results/build.json
+    python benchmarks/load/load_test.py --target http://localhost:8000 --mix "rag=1,crisis=1"
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+from scenarios import DEFAULT_MIX, RequestMix
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.append(str(project_root))
+
+
+@dataclass
+class Sample:
+    scenario: str
+    status: int
+    latency: float
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and 200 <= self.status < 300
+
+
+def percentile(sorted_values: List[float], p: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(p * len(sorted_values)))]
+
+
+def summarize(samples: List[Sample], elapsed: float) -> Dict:
+    latencies = sorted(s.latency * 1000 for s in samples)
+    errors = sum(1 for s in samples if not s.ok)
+
+    def ms(value: Optional[float]) -> Optional[float]:
+        return round(value, 1) if value is not None else None
+
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "p50": ms(percentile(latencies, 0.50)),
+            "p95": ms(percentile(latencies, 0.95)),
+            "p99": ms(percentile(latencies, 0.99)),
+            "max": ms(latencies[-1] if latencies else None),
+        },
+        "status_codes": dict(Counter(str(s.status) for s in samples)),
+    }
+
+
+class LoadTest:
+    def __init__(self, client: httpx.AsyncClient, mix: RequestMix, seed: int, timeout: float):
+        self.client = client
+        self.mix = mix
+        self.rng = random.Random(seed)
+        self.timeout = timeout
+        self.samples: List[Sample] = []
+        self.dropped = 0
+
+    async def send(self, scheduled_at: Optional[float] = None):
+        scenario, (method, path, body) = self.mix.next(self.rng)
+        start = scheduled_at if scheduled_at is not None else time.perf_counter()
+        try:
+            response = await self.client.request(method, path, json=body, timeout=self.timeout)
+            sample = Sample(scenario, response.status_code, time.perf_counter() - start)
+        except Exception as e:
+            sample = Sample(scenario, 0, time.perf_counter() - start, error=type(e).__name__)
+        self.samples.append(sample)
+
+    async def run_closed(self, concurrency: int, duration: float):
+        stop_at = time.perf_counter() + duration
+
+        async def worker():
+            while time.perf_counter() < stop_at:
+                await self.send()
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    async def run_open(self, rate: float, duration: float, max_in_flight: int):
+        in_flight = set()
+        start = time.perf_counter()
+        next_arrival = start
+        while next_arrival < start + duration:
+            delay = next_arrival - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if len(in_flight) >= max_in_flight:
+                # The client is saturated; count it instead of queueing forever
+                self.dropped += 1
+            else:
+                task = asyncio.create_task(self.send(scheduled_at=next_arrival))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            next_arrival += self.rng.expovariate(rate)
+        if in_flight:
+            await asyncio.gather(*in_flight)
+
+    def report(self, elapsed: float, warmup: float) -> Dict:
+        by_scenario: Dict[str, List[Sample]] = {}
+        for sample in self.samples:
+            by_scenario.setdefault(sample.scenario, []).append(sample)
+        overall = summarize(self.samples, elapsed)
+        overall["dropped"] = self.dropped
+        return {
+            "overall": overall,
+            "scenarios": {name: summarize(samples, elapsed) for name, samples in sorted(by_scenario.items())},
+            "warmup_seconds": warmup,
+        }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=project_root, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _build_client(args) -> httpx.AsyncClient:
+    if args.target == "asgi":
+        # Provider settings are read when the app modules are imported
+        os.environ["LLM_PROVIDER"] = args.provider
+        os.environ.setdefault("EMBEDDING_PROVIDER", args.provider)
+        if not args.warm_caches:
+            os.environ["SINGLE_FLIGHT_RESULT_TTL_SECONDS"] = "0"
+            os.environ["EMBEDDING_CACHE_SIZE"] = "0"
+            os.environ["EMBEDDING_CACHE_DB_PATH"] = ""
+        from com.mhire.app.main import app
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest", limits=limits)
+    limits = httpx.Limits(max_connections=max(args.concurrency, args.max_in_flight))
+    return httpx.AsyncClient(base_url=args.target, limits=limits)
+
+
+async def main_async(args) -> Dict:
+    mix = RequestMix.parse(args.mix, varied=not args.fixed_payloads)
+    async with _build_client(args) as client:
+        if args.warmup > 0:
+            warmup = LoadTest(client, mix, args.seed + 1, args.timeout)
+            await warmup.run_closed(min(args.concurrency, 4), args.warmup)
+
+        test = LoadTest(client, mix, args.seed, args.timeout)
+        start = time.perf_counter()
+        if args.mode == "open":
+            await test.run_open(args.rate, args.duration, args.max_in_flight)
+        else:
+            await test.run_closed(args.concurrency, args.duration)
+        elapsed = time.perf_counter() - start
+
+    result = test.report(elapsed, args.warmup)
+    result["config"] = {
+        "target": args.target,
+        "provider": args.provider if args.target == "asgi" else None,
+        "mode": args.mode,
+        "concurrency": args.concurrency if args.mode == "closed" else None,
+        "rate_rps": args.rate if args.mode == "open" else None,
+        "duration_seconds": args.duration,
+        "mix": mix.weights,
+        "varied_payloads": mix.varied,
+        "caches": ("warm" if args.warm_caches else "cold") if args.target == "asgi" else "server-configured",
+        "seed": args.seed,
+        "git_revision": _git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+    result["elapsed_seconds"] = round(elapsed, 2)
+    return result
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", default="asgi", help='"asgi" for in-process, or a base URL like http://localhost:8000')
+    parser.add_argument("--provider", default="stub", choices=["stub", "gemini"], help="Model provider for in-process runs")
+    parser.add_argument("--mode", default="closed", choices=["closed", "open"])
+    parser.add_argument("--concurrency", type=int, default=10, help="Workers in closed mode")
+    parser.add_argument("--rate", type=float, default=10.0, help="Arrivals per second in open mode")
+    parser.add_argument("--max-in-flight", type=int, default=1000, help="Open mode: drop arrivals beyond this many outstanding")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to generate load")
+    parser.add_argument("--warmup", type=float, default=0.0, help="Seconds of unrecorded closed-loop load first")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Weighted scenarios, e.g. " + DEFAULT_MIX)
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request client timeout in seconds")
+    parser.add_argument("--fixed-payloads", action="store_true", help="Repeat the fixed query lists instead of varying them")
+    parser.add_argument("--warm-caches", action="store_true", help="In-process: keep result holding and the embedding cache on")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    result = asyncio.run(main_async(args))
+    report = json.dumps(result, indent=2)
+    print(report)
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
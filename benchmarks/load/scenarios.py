@@ -0,0 +1,154 @@
+"""
+Request mixes for the load-testing harness
+
+Each scenario builds one (method, path, json_body) request. A mix is a
+weighted choice over scenarios, parsed from strings like
+"rag=4,general=3,crisis=1,long_history=1,session_title=1".
+
+By default every payload is varied: queries get a random opener and
+personal detail, and histories start at a random turn and carry random
+details. Repeated identical payloads would be answered by single-flight
+result holding and the embedding cache rather than by real work. Trivial
+turns ("hi", "thanks!") are kept verbatim so they still exercise the fast
+path. With varied=False the fixed lists are used as-is, e.g. to measure a
+cache-friendly workload on purpose.
+"""
+
+import random
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Tuple
+
+CRISIS_QUERIES = [
+    "I don't want to be here anymore, I keep thinking about suicide",
+    "I think I took too much, is this an overdose?",
+    "I feel like I can't go on and I want to end my life",
+]
+
+RAG_QUERIES = [
+    "I'm having a really strong craving tonight, what can I do?",
+    "I relapsed last weekend and I feel like I messed up everything",
+    "I'm going to be at a party on Saturday and I'm worried it will be triggering",
+    "What are the withdrawal symptoms when quitting cold turkey?",
+    "Where can I find a treatment program near me?",
+    "Is naltrexone or buprenorphine better for medication assisted treatment?",
+    "I'm so stressful and overwhelmed at work lately",
+    "Can you help me find a support group or counseling?",
+]
+
+TRIVIAL_QUERIES = [
+    "hi",
+    "thanks!",
+]
+
+GENERAL_QUERIES = [
+    "Can you tell me a bit about yourself?",
+    "What should I cook for dinner tonight?",
+    "I went for a long walk this morning and it felt great",
+    "What's a good way to start journaling?",
+]
+
+_FILLER_TURNS = [
+    ("user", "I've been trying to build better habits this month."),
+    ("assistant", "That's great to hear. Which habits have you been focusing on so far?"),
+    ("user", "Mostly sleep and cutting back on energy drinks in the afternoon."),
+    ("assistant", "Both of those work well together. How has your sleep been since you cut back?"),
+    ("user", "A little better, but I still wake up around 3am most nights."),
+    ("assistant", "Waking in the night is common while your body adjusts. Does anything help you fall back asleep?"),
+]
+
+
+_OPENERS = ["", "Honestly, ", "So ", "Quick question: ", "Hey Sora, ", "I need to ask something. ", "Ugh. "]
+
+_DETAILS = [
+    "", " It's day {n} for me.", " I'm {n} days in.", " This has been going on for {n} days.",
+    " My counselor said to ask about it.", " It's {n} minutes past midnight here.", " (asking for the {n}th time)",
+]
+
+
+def _vary(rng: random.Random, query: str) -> str:
+    """Same intent and keywords, different text, so caches don't answer it"""
+    detail = rng.choice(_DETAILS).format(n=rng.randint(1, 999))
+    return f"{rng.choice(_OPENERS)}{query}{detail}"
+
+
+def _history(turns: int, rng: random.Random, varied: bool) -> List[Dict[str, str]]:
+    # Start on a user turn so roles keep alternating user/assistant
+    offset = 2 * rng.randrange(len(_FILLER_TURNS) // 2) if varied else 0
+    history = []
+    for i in range(turns):
+        role, content = _FILLER_TURNS[(offset + i) % len(_FILLER_TURNS)]
+        if varied and role == "user":
+            content = f"{content} (week {rng.randint(1, 520)})"
+        history.append({"role": role, "content": content})
+    return history
+
+
+def _query(rng: random.Random, queries: List[str], varied: bool) -> str:
+    query = rng.choice(queries)
+    return _vary(rng, query) if varied and query not in TRIVIAL_QUERIES else query
+
+
+Request = Tuple[str, str, dict]
+
+
+def crisis(rng: random.Random, varied: bool = True) -> Request:
+    return "POST", "/api/v1/ai_chat", {"query": _query(rng, CRISIS_QUERIES, varied), "history": []}
+
+
+def rag(rng: random.Random, varied: bool = True) -> Request:
+    return "POST", "/api/v1/ai_chat", {
+        "query": _query(rng, RAG_QUERIES, varied),
+        "history": _history(rng.choice([0, 2, 4]), rng, varied)
+    }
+
+
+def general(rng: random.Random, varied: bool = True) -> Request:
+    return "POST", "/api/v1/ai_chat", {
+        "query": _query(rng, TRIVIAL_QUERIES + GENERAL_QUERIES, varied),
+        "history": _history(rng.choice([0, 2]), rng, varied)
+    }
+
+
+def long_history(rng: random.Random, varied: bool = True) -> Request:
+    return "POST", "/api/v1/ai_chat", {
+        "query": _query(rng, RAG_QUERIES + GENERAL_QUERIES, varied),
+        "history": _history(rng.choice([30, 60, 120]), rng, varied)
+    }
+
+
+def session_title(rng: random.Random, varied: bool = True) -> Request:
+    return "POST", "/api/v1/session-title", {"history": _history(rng.choice([2, 4, 6]), rng, varied)}
+
+
+SCENARIOS: Dict[str, Callable[[random.Random, bool], Request]] = {
+    "crisis": crisis,
+    "rag": rag,
+    "general": general,
+    "long_history": long_history,
+    "session_title": session_title,
+}
+
+DEFAULT_MIX = "rag=4,general=3,crisis=1,long_history=1,session_title=1"
+
+
+@dataclass
+class RequestMix:
+    """Weighted choice over scenarios"""
+    weights: Dict[str, float]
+    varied: bool = True
+
+    @classmethod
+    def parse(cls, spec: str, varied: bool = True) -> "RequestMix":
+        weights = {}
+        for part in spec.split(","):
+            name, _, weight = part.strip().partition("=")
+            if name not in SCENARIOS:
+                raise ValueError(f"Unknown scenario '{name}'. Available: {', '.join(SCENARIOS)}")
+            weights[name] = float(weight or 1)
+        if not any(w > 0 for w in weights.values()):
+            raise ValueError("Request mix needs at least one positive weight")
+        return cls(weights, varied)
+
+    def next(self, rng: random.Random) -> Tuple[str, Request]:
+        name = rng.choices(list(self.weights), weights=list(self.weights.values()))[0]
+        return name, SCENARIOS[name](rng, self.varied)
@@ -0,0 +1,136 @@
+"""
+Category partitions: do chat requests reach them, and how much do they save?
+
+1. Hit check: sends /api/v1/ai_chat requests whose queries the keyword
+   router sends to partitioned categories (cravings, medication, coping,
+   ...) through the in-process app on the stub providers, then reads
+   /health and fails (exit 1) unless the retriever has partitions built
+   from the shipped index and searched them for those requests.
+2. Latency: builds a synthetic flat index of --size vectors whose chunks
+   are spread over the three partitions, and times the same queries
+   searched in each partition and in the global index.
+
+Usage:
+    python benchmarks/partition_benchmark.py
+    python benchmarks/partition_benchmark.py --size 200000 --min-time 0.5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+# Offline providers, cold caches; must be set before the app modules are imported
+os.environ["LLM_PROVIDER"] = "stub"
+os.environ["EMBEDDING_PROVIDER"] = "stub"
+os.environ["STUB_EMBEDDING_LATENCY_P50_MS"] = "0"
+os.environ["STUB_LLM_LATENCY_P50_MS"] = "0"
+os.environ["SINGLE_FLIGHT_RESULT_TTL_SECONDS"] = "0"
+os.environ["EMBEDDING_CACHE_SIZE"] = "0"
+
+import httpx
+from com.mhire.app.services.ai_chat.ai_chat import _determine_category
+from com.mhire.app.services.rag.partitions import build_category_partitions, partition_for
+from retrieval_microbenchmark import QUERIES, build_synthetic_retriever
+
+# Routed to coping_strategies / treatment partitions by the keyword router
+CHAT_QUERIES = [
+    "I'm having a really strong craving tonight, what can I do?",
+    "I relapsed last weekend and I feel like I messed up everything",
+    "Is naltrexone or buprenorphine better for medication assisted treatment?",
+    "What are the withdrawal symptoms when quitting cold turkey?",
+    "Any breathing or grounding technique for when I'm anxious?",
+    "Where can I find a support group or counseling?",
+]
+
+# Synthetic chunks are tagged with RESOURCE_TYPES from retrieval_microbenchmark
+SYNTHETIC_PARTITION_TAGS = "emergency:sleep;coping_strategies:mental_health|exercise;treatment:addiction|nutrition"
+
+
+async def check_chat_hits() -> Dict:
+    from com.mhire.app.main import app
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        before = (await client.get("/health")).json()["retrieval"]
+        statuses = []
+        for query in CHAT_QUERIES:
+            response = await client.post("/api/v1/ai_chat", json={"query": query, "history": []})
+            statuses.append(response.status_code)
+        after = (await client.get("/health")).json()["retrieval"]
+
+    searched = {
+        key: after["searches"].get(key, 0) - before["searches"].get(key, 0)
+        for key in after["searches"]
+    }
+    return {
+        "partitions": after["partitions"],
+        "routes": {query: partition_for(_determine_category(query)) for query in CHAT_QUERIES},
+        "statuses": statuses,
+        "searches": searched,
+        "partition_searches": sum(count for key, count in searched.items() if key.startswith("partition:")),
+    }
+
+
+def median_us(func: Callable[[int], object], min_time: float, min_rounds: int = 5) -> float:
+    func(0)  # warm-up
+    timings: List[float] = []
+    started = time.perf_counter()
+    while len(timings) < min_rounds or time.perf_counter() - started < min_time:
+        t0 = time.perf_counter()
+        func(len(timings))
+        timings.append(time.perf_counter() - t0)
+    return round(statistics.median(timings) * 1e6, 2)
+
+
+def compare_latency(size: int, min_time: float, top_k: int) -> Dict:
+    print(f"  building synthetic index with {size} vectors...", file=sys.stderr)
+    retriever = build_synthetic_retriever(size, dimension=768)
+    retriever.partitions = build_category_partitions(retriever.vectorstore, SYNTHETIC_PARTITION_TAGS)
+    embeddings = [retriever.embeddings.embed_query(query) for query in QUERIES]
+
+    def search(category):
+        return lambda i: retriever._search_rows([embeddings[i % len(embeddings)]], top_k, [category])
+
+    global_us = median_us(search(None), min_time)
+    results = {"size": size, "top_k": top_k, "global_median_us": global_us, "partitions": {}}
+    for category, partition in retriever.partitions.items():
+        partition_us = median_us(search(category), min_time)
+        results["partitions"][category] = {
+            "vectors": partition.ntotal,
+            "median_us": partition_us,
+            "speedup": round(global_us / partition_us, 2) if partition_us else None,
+        }
+        print(f"  {category:<18} {partition.ntotal:>8} vectors  {partition_us:>10.1f} us  "
+              f"(global {global_us:.1f} us)", file=sys.stderr)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Category partition hit check and latency comparison")
+    parser.add_argument("--size", type=int, default=100_000, help="Synthetic index size for the latency comparison")
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--min-time", type=float, default=1.0, help="Minimum seconds to time each search")
+    args = parser.parse_args()
+
+    print("Checking that chat requests search a partition", file=sys.stderr)
+    hits = asyncio.run(check_chat_hits())
+    print("Comparing partitioned and global search latency", file=sys.stderr)
+    latency = compare_latency(args.size, args.min_time, args.top_k)
+    print(json.dumps({"chat_hits": hits, "latency": latency}, indent=2))
+
+    if not hits["partitions"] or hits["partition_searches"] == 0:
+        print("Chat requests did not search any category partition", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""
+Micro-benchmarks for the hot pieces of the RAG path
+
+Covers:
+- ai_chat._determine_category on realistic queries
+- RetrieverService.search against the shipped faiss_index (stub embedder)
+- RetrieverService.format_context
+- RAGTool._enhance_query
+- RetrieverService.search against synthetic indexes of 10k / 100k / 1M vectors
+
+Each benchmark is timed for at least --min-time seconds; median, mean and
+p95 per call are reported. Results are compared with a stored baseline and
+the script exits non-zero when any median regresses by more than
+--tolerance, or when there is no baseline to compare with (so a gate that
+lost its baseline fails instead of silently passing). Baselines are
+machine-specific: run once with --save-baseline on each machine/CI runner
+and commit or cache the file.
+
+The embedder is the offline stub provider with zero latency, so numbers
+measure our code and FAISS, not the network. The 1M index needs about 3 GB
+of RAM at 768 dimensions; use --sizes to skip it.
+
+Usage:
+    python benchmarks/retrieval_microbenchmark.py --save-baseline
+    python benchmarks/retrieval_microbenchmark.py --tolerance 0.25
+    python benchmarks/retrieval_microbenchmark.py --sizes 10000 --min-time 0.2
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+# Offline, zero-latency providers; must be set before the app modules are imported
+os.environ["LLM_PROVIDER"] = "stub"
+os.environ["EMBEDDING_PROVIDER"] = "stub"
+os.environ["STUB_EMBEDDING_LATENCY_P50_MS"] = "0"
+os.environ["STUB_LLM_LATENCY_P50_MS"] = "0"
+
+import numpy as np
+import faiss
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from com.mhire.app.services.ai_chat.ai_chat import _determine_category
+from com.mhire.app.services.providers.stub_provider import StubEmbeddings
+from com.mhire.app.services.rag.rag_tool import RAGTool
+from com.mhire.app.services.rag.retriever import RetrieverService
+from com.mhire.app.services.rag.search_executor import SearchExecutor
+
+DEFAULT_BASELINE = project_root / "benchmarks/baselines/retrieval_microbenchmark.json"
+
+QUERIES = [
+    "I'm having a really strong craving tonight, what can I do?",
+    "I relapsed last weekend and I feel like I messed up everything",
+    "I'm going to a party on Saturday and I'm worried it will be triggering",
+    "What are the withdrawal symptoms when quitting cold turkey?",
+    "Where can I find a treatment program near me?",
+    "can't sleep at night",
+    "hi, how are you today?",
+    "I went for a long walk this morning and it felt great",
+    "I feel like I can't go on anymore",
+    "Is naltrexone or buprenorphine better for medication assisted treatment?",
+]
+
+CATEGORIES = ["emergency", "coping_strategies", "treatment", "general"]
+
+RESOURCE_TYPES = ["mental_health", "addiction", "sleep", "nutrition", "exercise"]
+
+
+class SyntheticDocs:
+    """Docstore mapping that builds documents on demand, so 1M entries cost no memory"""
+
+    def __init__(self, size: int):
+        self.size = size
+
+    def __contains__(self, doc_id) -> bool:
+        return isinstance(doc_id, str) and doc_id.isdigit() and int(doc_id) < self.size
+
+    def __getitem__(self, doc_id: str) -> Document:
+        i = int(doc_id)
+        resource_type = RESOURCE_TYPES[i % len(RESOURCE_TYPES)]
+        return Document(
+            page_content=f"Synthetic resource {i} about {resource_type.replace('_', ' ')}. " * 12,
+            metadata={"source": f"synthetic_{i // 1000}.txt", "resource_type": resource_type}
+        )
+
+
+class SyntheticIds:
+    """index_to_docstore_id without a million-entry dict"""
+
+    def __init__(self, size: int):
+        self.size = size
+
+    def __getitem__(self, i) -> str:
+        return str(int(i))
+
+    def __len__(self) -> int:
+        return self.size
+
+
+def build_retriever(vectorstore: FAISS, embeddings: StubEmbeddings) -> RetrieverService:
+    """RetrieverService over a given vectorstore, without the singleton services"""
+    retriever = RetrieverService.__new__(RetrieverService)
+    retriever.similarity_threshold = 0.0
+    retriever.vectorstore = vectorstore
+    retriever.embeddings = embeddings
+    retriever.search_executor = SearchExecutor()
+    retriever.numpy_index = None
+    retriever.partitions = {}
+    retriever._stats_lock = threading.Lock()
+    retriever.search_counts = Counter()
+    return retriever
+
+
+def load_shipped_retriever() -> RetrieverService:
+    faiss_path = project_root / "com/mhire/app/data/vector_db/faiss_index"
+    embeddings = StubEmbeddings(latency_p50_ms=0)
+    vectorstore = FAISS.load_local(str(faiss_path), embeddings, allow_dangerous_deserialization=True)
+    embeddings.dimension = vectorstore.index.d
+    return build_retriever(vectorstore, embeddings)
+
+
+def build_synthetic_retriever(size: int, dimension: int, seed: int = 0) -> RetrieverService:
+    """Flat L2 index of `size` random unit vectors, added in chunks to bound peak memory"""
+    rng = np.random.default_rng(seed)
+    index = faiss.IndexFlatL2(dimension)
+    chunk = 100_000
+    for start in range(0, size, chunk):
+        vectors = rng.standard_normal((min(chunk, size - start), dimension), dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        index.add(vectors)
+    embeddings = StubEmbeddings(dimension=dimension, latency_p50_ms=0)
+    vectorstore = FAISS(
+        embedding_function=embeddings,
+        index=index,
+        docstore=InMemoryDocstore(SyntheticDocs(size)),
+        index_to_docstore_id=SyntheticIds(size)
+    )
+    return build_retriever(vectorstore, embeddings)
+
+
+def bench(func: Callable[[int], object], min_time: float, min_rounds: int = 5) -> Dict[str, float]:
+    """
+    Time func(round_number) until both min_time and min_rounds are reached
+
+    Returns:
+        Per-call statistics in microseconds
+    """
+    func(0)  # warm-up
+    timings: List[float] = []
+    started = time.perf_counter()
+    while len(timings) < min_rounds or time.perf_counter() - started < min_time:
+        t0 = time.perf_counter()
+        func(len(timings))
+        timings.append(time.perf_counter() - t0)
+    timings_us = sorted(t * 1e6 for t in timings)
+    return {
+        "median_us": round(statistics.median(timings_us), 2),
+        "mean_us": round(statistics.fmean(timings_us), 2),
+        "p95_us": round(timings_us[min(len(timings_us) - 1, int(0.95 * len(timings_us)))], 2),
+        "rounds": len(timings_us),
+    }
+
+
+def run_suite(sizes: List[int], min_time: float) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+
+    def record(name: str, func: Callable[[int], object]):
+        results[name] = bench(func, min_time)
+        print(f"  {name:<36} median {results[name]['median_us']:>12.2f} us  ({results[name]['rounds']} rounds)",
+              file=sys.stderr)
+
+    record("determine_category", lambda i: _determine_category(QUERIES[i % len(QUERIES)]))
+
+    rag_tool = RAGTool.__new__(RAGTool)
+    record("enhance_query", lambda i: rag_tool._enhance_query(QUERIES[i % len(QUERIES)], CATEGORIES[i % len(CATEGORIES)]))
+
+    shipped = load_shipped_retriever()
+    record("search[shipped]", lambda i: shipped.search(QUERIES[i % len(QUERIES)], top_k=3))
+
+    context_results = shipped.search(QUERIES[0], top_k=3)
+    record("format_context", lambda i: shipped.format_context(context_results))
+
+    for size in sizes:
+        print(f"  building synthetic index with {size} vectors...", file=sys.stderr)
+        synthetic = build_synthetic_retriever(size, shipped.vectorstore.index.d)
+        record(f"search[synthetic_{size}]", lambda i: synthetic.search(QUERIES[i % len(QUERIES)], top_k=3))
+        del synthetic
+
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: float) -> List[str]:
+    """Benchmarks whose median grew by more than `tolerance` versus the baseline"""
+    regressions = []
+    for name, stats in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        change = stats["median_us"] / before["median_us"] - 1
+        marker = "REGRESSION" if change > tolerance else ""
+        print(f"  {name:<36} {before['median_us']:>12.2f} -> {stats['median_us']:>12.2f} us  {change:+.1%} {marker}",
+              file=sys.stderr)
+        if change > tolerance:
+            regressions.append(f"{name} ({change:+.1%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RAG path micro-benchmarks with baseline comparison")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated synthetic index sizes")
+    parser.add_argument("--min-time", type=float, default=1.0, help="Minimum seconds to time each benchmark")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Write these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed median slowdown before failing")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    print("Running retrieval micro-benchmarks", file=sys.stderr)
+    results = run_suite(sizes, args.min_time)
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "faiss": getattr(faiss, "__version__", "unknown"),
+            "numpy": np.__version__,
+        },
+        "benchmarks": results,
+    }
+    print(json.dumps(report, indent=2))
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Baseline saved to {baseline_path}", file=sys.stderr)
+        return
+
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; run with --save-baseline to create one", file=sys.stderr)
+        sys.exit(2)
+
+    print(f"Comparing with baseline {baseline_path}", file=sys.stderr)
+    regressions = compare(results, json.loads(baseline_path.read_text())["benchmarks"], args.tolerance)
+    if regressions:
+        print(f"Regressions over {args.tolerance:.0%}: " + ", ".join(regressions), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+FAISS flat L2 vs NumPy exact-cosine backend: latency and recall
+
+For each corpus size, random 768-dim embeddings are indexed in both a
+faiss.IndexFlatL2 (what RetrieverService uses today) and a NumpyVectorIndex
+(RAG_VECTOR_BACKEND=numpy). Query batches of several sizes are timed on
+both, and recall@k of each backend is measured against exact cosine top-k
+computed in float64.
+
+By default the vectors are unit length, where L2 and cosine give the same
+ranking and recall differences come only from float32 ties. With
+--unnormalized the corpus keeps random norms, which is where the FAISS L2
+ranking and the `1 - score / 2` similarity drift from true cosine.
+
+Usage:
+    python benchmarks/vector_backend_benchmark.py
+    python benchmarks/vector_backend_benchmark.py --sizes 10000,100000 --batches 1,8,32 --top-k 5
+    python benchmarks/vector_backend_benchmark.py --unnormalized
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+import numpy as np
+import faiss
+from com.mhire.app.services.rag.numpy_backend import NumpyVectorIndex
+
+
+def make_corpus(size: int, dimension: int, unnormalized: bool, rng: np.random.Generator) -> np.ndarray:
+    vectors = rng.standard_normal((size, dimension), dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    if unnormalized:
+        # Spread norms over roughly an order of magnitude, like raw model outputs can
+        return vectors / norms * rng.uniform(0.3, 3.0, size=(size, 1)).astype(np.float32)
+    return vectors / norms
+
+
+def exact_cosine_top_k(corpus: np.ndarray, queries: np.ndarray, top_k: int) -> np.ndarray:
+    corpus64 = corpus.astype(np.float64)
+    corpus64 /= np.linalg.norm(corpus64, axis=1, keepdims=True)
+    queries64 = queries.astype(np.float64)
+    queries64 /= np.linalg.norm(queries64, axis=1, keepdims=True)
+    scores = queries64 @ corpus64.T
+    return np.argsort(-scores, axis=1)[:, :top_k]
+
+
+def recall(found: np.ndarray, truth: np.ndarray) -> float:
+    hits = sum(len(set(f.tolist()) & set(t.tolist())) for f, t in zip(found, truth))
+    return hits / truth.size
+
+
+def median_ms(func: Callable[[], object], min_time: float, min_rounds: int = 5) -> float:
+    func()  # warm-up
+    timings: List[float] = []
+    started = time.perf_counter()
+    while len(timings) < min_rounds or time.perf_counter() - started < min_time:
+        t0 = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - t0)
+    return round(statistics.median(timings) * 1000, 4)
+
+
+def run_size(size: int, dimension: int, batches: List[int], top_k: int,
+             unnormalized: bool, min_time: float, seed: int) -> Dict[str, object]:
+    rng = np.random.default_rng(seed)
+    corpus = make_corpus(size, dimension, unnormalized, rng)
+
+    flat = faiss.IndexFlatL2(dimension)
+    flat.add(corpus)
+    numpy_index = NumpyVectorIndex(corpus, [None] * size)
+
+    result: Dict[str, object] = {"size": size, "batches": {}}
+    for batch in batches:
+        queries = rng.standard_normal((batch, dimension), dtype=np.float32)
+        queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+        truth = exact_cosine_top_k(corpus, queries, top_k)
+
+        _, faiss_ids = flat.search(queries, top_k)
+        numpy_ids, _, _ = numpy_index.search_indices(queries, top_k)
+
+        faiss_ms = median_ms(lambda: flat.search(queries, top_k), min_time)
+        numpy_ms = median_ms(lambda: numpy_index.search_indices(queries, top_k), min_time)
+        result["batches"][str(batch)] = {
+            "faiss_flat_l2": {"median_ms": faiss_ms, "recall_at_k": round(recall(faiss_ids, truth), 4)},
+            "numpy_cosine": {"median_ms": numpy_ms, "recall_at_k": round(recall(numpy_ids, truth), 4)},
+        }
+        print(f"  N={size:<8} batch={batch:<3} faiss {faiss_ms:>9.3f} ms  numpy {numpy_ms:>9.3f} ms  "
+              f"recall faiss {recall(faiss_ids, truth):.3f} numpy {recall(numpy_ids, truth):.3f}",
+              file=sys.stderr)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FAISS flat L2 vs NumPy cosine search backend")
+    parser.add_argument("--sizes", default="10000,100000", help="Comma-separated corpus sizes")
+    parser.add_argument("--batches", default="1,8,32", help="Comma-separated query batch sizes")
+    parser.add_argument("--dimension", type=int, default=768, help="Embedding dimension")
+    parser.add_argument("--top-k", type=int, default=5, help="Results per query")
+    parser.add_argument("--unnormalized", action="store_true", help="Keep random vector norms in the corpus")
+    parser.add_argument("--min-time", type=float, default=1.0, help="Minimum seconds to time each case")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    batches = [int(batch) for batch in args.batches.split(",") if batch.strip()]
+    print(f"Comparing vector backends (top_k={args.top_k}, unnormalized={args.unnormalized})", file=sys.stderr)
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "faiss": getattr(faiss, "__version__", "unknown"),
+            "numpy": np.__version__,
+        },
+        "config": {
+            "dimension": args.dimension,
+            "top_k": args.top_k,
+            "unnormalized": args.unnormalized,
+        },
+        "results": [
+            run_size(size, args.dimension, batches, args.top_k, args.unnormalized, args.min_time, args.seed)
+            for size in sizes
+        ],
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -15,4 +15,98 @@ class Config:
             # cls._instance.COLLECTION_NAME = os.getenv("COLLECTION_NAME")
             # cls._instance.SESSION_COLLECTION_NAME = os.getenv("SESSION_COLLECTION_NAME")
 
-        return cls._instance
\ No newline at end of file
+            # RAG search executor (FAISS runs off the event loop)
+            cls._instance.RAG_SEARCH_POOL_SIZE = int(os.getenv("RAG_SEARCH_POOL_SIZE", "4"))
+            cls._instance.RAG_SEARCH_QUEUE_DEPTH = int(os.getenv("RAG_SEARCH_QUEUE_DEPTH", "64"))
+            # "faiss" (L2 index) or "numpy" (exact cosine over an in-memory matrix)
+            cls._instance.RAG_VECTOR_BACKEND = os.getenv("RAG_VECTOR_BACKEND", "faiss").lower()
+            # Per-category sub-indexes keyed on chunk resource_type and section heading;
+            # extra tags per partition as "emergency:crisis|hotlines;treatment:medication"
+            cls._instance.RAG_CATEGORY_PARTITIONS_ENABLED = os.getenv("RAG_CATEGORY_PARTITIONS_ENABLED", "true").lower() == "true"
+            cls._instance.RAG_PARTITION_TAGS = os.getenv("RAG_PARTITION_TAGS", "")
+
+            # Query embedding cache (empty DB path disables the on-disk tier)
+            cls._instance.EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "1024"))
+            cls._instance.EMBEDDING_CACHE_TTL_SECONDS = float(os.getenv("EMBEDDING_CACHE_TTL_SECONDS", "86400"))
+            cls._instance.EMBEDDING_CACHE_DB_PATH = os.getenv("EMBEDDING_CACHE_DB_PATH", "")
+            cls._instance.EMBEDDING_CACHE_DB_MAX_ROWS = int(os.getenv("EMBEDDING_CACHE_DB_MAX_ROWS", "100000"))
+
+            # Embedding micro-batching (window of 0 disables coalescing)
+            cls._instance.EMBEDDING_BATCH_WINDOW_MS = float(os.getenv("EMBEDDING_BATCH_WINDOW_MS", "5"))
+            cls._instance.EMBEDDING_BATCH_MAX_SIZE = int(os.getenv("EMBEDDING_BATCH_MAX_SIZE", "32"))
+
+            # Conversation history forwarded to the LLM
+            cls._instance.HISTORY_TOKEN_BUDGET = int(os.getenv("HISTORY_TOKEN_BUDGET", "2000"))
+            cls._instance.HISTORY_MIN_RECENT_MESSAGES = int(os.getenv("HISTORY_MIN_RECENT_MESSAGES", "2"))
+            cls._instance.HISTORY_SUMMARY_ENABLED = os.getenv("HISTORY_SUMMARY_ENABLED", "true").lower() == "true"
+            cls._instance.HISTORY_SUMMARY_CACHE_SIZE = int(os.getenv("HISTORY_SUMMARY_CACHE_SIZE", "512"))
+
+            # Hold completed chat results briefly for late duplicate requests
+            cls._instance.SINGLE_FLIGHT_RESULT_TTL_SECONDS = float(os.getenv("SINGLE_FLIGHT_RESULT_TTL_SECONDS", "2"))
+
+            # Shared AIMD concurrency limiter for Gemini calls
+            cls._instance.GEMINI_LIMITER_INITIAL = float(os.getenv("GEMINI_LIMITER_INITIAL", "8"))
+            cls._instance.GEMINI_LIMITER_MIN = float(os.getenv("GEMINI_LIMITER_MIN", "1"))
+            cls._instance.GEMINI_LIMITER_MAX = float(os.getenv("GEMINI_LIMITER_MAX", "64"))
+
+            # Hedged generation requests (opt-in)
+            cls._instance.LLM_HEDGING_ENABLED = os.getenv("LLM_HEDGING_ENABLED", "false").lower() == "true"
+            cls._instance.LLM_HEDGING_PERCENTILE = float(os.getenv("LLM_HEDGING_PERCENTILE", "0.95"))
+            cls._instance.LLM_HEDGING_MAX_RATIO = float(os.getenv("LLM_HEDGING_MAX_RATIO", "0.1"))
+            cls._instance.LLM_HEDGING_MAX_BURST = float(os.getenv("LLM_HEDGING_MAX_BURST", "2"))
+
+            # Per-request deadline (overridable per request with X-Request-Timeout-Ms)
+            cls._instance.CHAT_DEADLINE_SECONDS = float(os.getenv("CHAT_DEADLINE_SECONDS", "25"))
+            cls._instance.CHAT_DEADLINE_MAX_SECONDS = float(os.getenv("CHAT_DEADLINE_MAX_SECONDS", "55"))
+            cls._instance.RAG_GENERATION_RESERVE_SECONDS = float(os.getenv("RAG_GENERATION_RESERVE_SECONDS", "5"))
+            cls._instance.RAG_MIN_BUDGET_SECONDS = float(os.getenv("RAG_MIN_BUDGET_SECONDS", "0.3"))
+
+            # Circuit breakers around Gemini generation and embedding
+            cls._instance.BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+            cls._instance.BREAKER_RESET_TIMEOUT_SECONDS = float(os.getenv("BREAKER_RESET_TIMEOUT_SECONDS", "30"))
+
+            # Model tier routing (small talk -> lite model)
+            cls._instance.MODEL_TIERING_ENABLED = os.getenv("MODEL_TIERING_ENABLED", "true").lower() == "true"
+            cls._instance.MODEL_TIER_LITE_MAX_HISTORY = int(os.getenv("MODEL_TIER_LITE_MAX_HISTORY", "6"))
+            cls._instance.MODEL_TIER_LATENCY_SLO_SECONDS = float(os.getenv("MODEL_TIER_LATENCY_SLO_SECONDS", "6"))
+            cls._instance.MODEL_TIER_MAX_ERROR_RATE = float(os.getenv("MODEL_TIER_MAX_ERROR_RATE", "0.2"))
+            cls._instance.MODEL_TIER_HEALTH_WINDOW_SECONDS = float(os.getenv("MODEL_TIER_HEALTH_WINDOW_SECONDS", "60"))
+
+            # Seconds a JSON crisis reply waits for personalised text before sending the resources alone
+            cls._instance.CRISIS_GENERATION_TIMEOUT_SECONDS = float(os.getenv("CRISIS_GENERATION_TIMEOUT_SECONDS", "3"))
+
+            # Zero-LLM replies for greetings/thanks/acks (kill switch)
+            cls._instance.FAST_PATH_ENABLED = os.getenv("FAST_PATH_ENABLED", "true").lower() == "true"
+
+            # Batch chat endpoint
+            cls._instance.BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "100"))
+            cls._instance.BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "8"))
+
+            # Model providers ("gemini" or "stub" for offline load testing)
+            cls._instance.LLM_PROVIDER = os.getenv("LLM_PROVIDER", "gemini").lower()
+            cls._instance.EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", cls._instance.LLM_PROVIDER).lower()
+            cls._instance.STUB_SEED = int(os.getenv("STUB_SEED", "0"))
+            cls._instance.STUB_LLM_LATENCY_P50_MS = float(os.getenv("STUB_LLM_LATENCY_P50_MS", "800"))
+            cls._instance.STUB_LLM_LATENCY_P99_MS = float(os.getenv("STUB_LLM_LATENCY_P99_MS", "3000"))
+            cls._instance.STUB_LLM_ERROR_RATE = float(os.getenv("STUB_LLM_ERROR_RATE", "0"))
+            cls._instance.STUB_EMBEDDING_LATENCY_P50_MS = float(os.getenv("STUB_EMBEDDING_LATENCY_P50_MS", "60"))
+            cls._instance.STUB_EMBEDDING_LATENCY_P99_MS = float(os.getenv("STUB_EMBEDDING_LATENCY_P99_MS", "250"))
+            cls._instance.STUB_EMBEDDING_ERROR_RATE = float(os.getenv("STUB_EMBEDDING_ERROR_RATE", "0"))
+            # 0 reads the dimension from the FAISS index header
+            cls._instance.STUB_EMBEDDING_DIM = int(os.getenv("STUB_EMBEDDING_DIM", "0"))
+
+            # Stage timing: Prometheus /metrics and the Server-Timing response header
+            cls._instance.METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+            cls._instance.SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+
+            # Tracing ("none", "memory", "console" or "otlp")
+            cls._instance.TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "none").lower()
+            cls._instance.TRACING_SERVICE_NAME = os.getenv("TRACING_SERVICE_NAME", "sora-chatbot")
+            cls._instance.TRACING_MEMORY_MAX_SPANS = int(os.getenv("TRACING_MEMORY_MAX_SPANS", "5000"))
+
+            # Admin-only profiling (empty ADMIN_TOKEN disables the admin endpoints)
+            cls._instance.ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+            cls._instance.PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "60"))
+            cls._instance.PROFILE_OUTPUT_DIR = os.getenv("PROFILE_OUTPUT_DIR", "/tmp/sora-profiles")
+
+        return cls._instance
@@ -1,11 +1,22 @@
-from fastapi import FastAPI, Request, status
+from fastapi import FastAPI, HTTPException, Request, Response, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from com.mhire.app.config.config import Config
 from com.mhire.app.services.ai_chat.ai_chat_router import router as ai_chat_router  # NEW
 from com.mhire.app.services.session_title.session_title_router import router as session_title_router
+from com.mhire.app.services.profiling.profiling_router import router as profiling_router
+from com.mhire.app.services.ai_chat.ai_chat import crisis_fast_path, fast_path, llm_hedger, model_router, rag_tool
+from com.mhire.app.services.providers.provider_registry import get_provider_info
+from com.mhire.app.services.rag.embedding import get_embedding_stats
+from com.mhire.app.utils.limiter.adaptive_limiter import gemini_limiter
+from com.mhire.app.utils.resilience.circuit_breaker import generation_breaker, embedding_breaker
+from com.mhire.app.utils.metrics.stage_timer import reset_request_timings, start_request_timings
+from com.mhire.app.utils.tracing.tracing import get_recent_traces
 
 # Initialize FastAPI
 app = FastAPI(title="Gemini Chatbot API")
+config = Config()
 
 # Global exception handler for 422 validation errors
 @app.exception_handler(RequestValidationError)
@@ -19,9 +30,44 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 
+@app.middleware("http")
+async def stage_timing_middleware(request: Request, call_next):
+    """
+    Collect per-stage timings for the request, echo them in Server-Timing and
+    export them to the Prometheus histograms once the body has been sent
+    (so streamed responses include their generation time)
+    """
+    if request.url.path == "/metrics" or not (config.METRICS_ENABLED or config.SERVER_TIMING_ENABLED):
+        return await call_next(request)
+    
+    timings, token = start_request_timings()
+    try:
+        response = await call_next(request)
+    finally:
+        reset_request_timings(token)
+    
+    # Route template, not the raw path, to keep label cardinality bounded
+    endpoint = getattr(request.scope.get("route"), "path", "unmatched")
+    if config.SERVER_TIMING_ENABLED:
+        response.headers["Server-Timing"] = timings.server_timing()
+    if config.METRICS_ENABLED:
+        body = response.body_iterator
+        
+        async def observed_body():
+            try:
+                async for chunk in body:
+                    yield chunk
+            finally:
+                timings.observe(endpoint, request.method, response.status_code)
+        
+        response.body_iterator = observed_body()
+    return response
+
+
 # Include routers
 app.include_router(ai_chat_router)  
 app.include_router(session_title_router)
+app.include_router(profiling_router)
 
 
 @app.get("/")
@@ -29,9 +75,47 @@ async def root():
     return {
         "message": "Sora Chatbot API with Long-term Memory",
         "endpoints": {
-            "ai_chat": "POST /api/v1/ai-chat", }
+            "ai_chat": "POST /api/v1/ai-chat",
+            "ai_chat_stream": "POST /api/v1/ai_chat/stream (text/event-stream)",
+            "ai_chat_batch": "POST /api/v1/ai_chat/batch",
+            "metrics": "GET /metrics (Prometheus)", }
+    }
+
+
+@app.get("/health")
+async def health():
+    """Liveness plus the state of the Gemini circuit breakers, limiter and embedding cache"""
+    breakers = [generation_breaker.get_stats(), embedding_breaker.get_stats()]
+    return {
+        "status": "degraded" if any(b["state"] != "closed" for b in breakers) else "ok",
+        "providers": get_provider_info(),
+        "circuit_breakers": breakers,
+        "gemini_limiter": gemini_limiter.get_stats(),
+        "embeddings": get_embedding_stats(),
+        "retrieval": rag_tool.retriever.get_stats(),
+        "model_router": model_router.get_stats(),
+        "llm_hedging": llm_hedger.get_stats(),
+        "fast_path": fast_path.get_stats(),
+        "crisis_fast_path": crisis_fast_path.get_stats()
     }
 
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics: per-stage and end-to-end latency histograms"""
+    if not config.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+@app.get("/debug/traces")
+async def debug_traces(limit: int = 20):
+    """Recent request traces as waterfalls (only with TRACING_EXPORTER=memory)"""
+    traces = get_recent_traces(limit=max(1, min(limit, 200)))
+    if traces is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return {"traces": traces}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
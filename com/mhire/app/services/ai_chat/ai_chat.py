@@ -1,28 +1,108 @@
-from typing import List, Optional, Any
-from langchain_google_genai import ChatGoogleGenerativeAI
+from typing import List, Optional, Any, AsyncIterator, Dict, Tuple
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from com.mhire.app.config.config import Config
-from com.mhire.app.services.ai_chat.ai_chat_schema import AIChatRequest, AIChatResponse, MessageHistory
+from com.mhire.app.services.ai_chat.ai_chat_schema import AIChatRequest, AIChatResponse, AIChatBatchItemResult, MessageHistory
 from com.mhire.app.utils.prompt.prompt_function_calling import FUNCTION_CALLING_SYSTEM_PROMPT
+from com.mhire.app.utils.prompt.prompt_templates import CRISIS_FOLLOW_UP_PROMPT
 from com.mhire.app.services.rag.rag_tool import RAGTool
+from com.mhire.app.services.providers.provider_registry import create_chat_model
+from com.mhire.app.services.ai_chat.history_budget import apply_history_budget
+from com.mhire.app.services.ai_chat.history_summary import HistorySummarizer
+from com.mhire.app.services.ai_chat.crisis_fast_path import CrisisFastPath
+from com.mhire.app.services.ai_chat.fast_path import FastPathResponder
+from com.mhire.app.services.ai_chat.hedging import HedgedCaller
+from com.mhire.app.services.ai_chat.model_router import ModelRouter, ModelTier
+from com.mhire.app.services.ai_chat.single_flight import SingleFlight, chat_request_key
+from com.mhire.app.services.ai_chat.keyword_router import RAG_TRIGGER_KEYWORDS, CATEGORY_PRIORITY, KeywordRouter
+from com.mhire.app.utils.limiter.adaptive_limiter import gemini_limiter
+from com.mhire.app.utils.deadline.deadline import (
+    DeadlineExceededError,
+    ensure_budget,
+    reset_deadline,
+    set_deadline,
+    with_deadline
+)
+from com.mhire.app.utils.metrics.stage_timer import set_request_label, stage_timer
+from com.mhire.app.utils.tracing.tracing import start_span
+from com.mhire.app.utils.resilience.circuit_breaker import CircuitOpenError, generation_breaker
+from com.mhire.app.utils.prompt.prompt_degraded import (
+    DEGRADED_CRISIS_RESPONSE,
+    DEGRADED_RESOURCE_RESPONSE,
+    DEGRADED_GENERAL_RESPONSE
+)
 from com.mhire.app.logger.logger import ChatEndpoint
+import asyncio
 import json
+import time
 
 logger = ChatEndpoint.setup_chat_logger()
 
 # Initialize services
 config = Config()
-llm = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash",
-    google_api_key=config.GEMINI_API_KEY,
+llm = create_chat_model(
+    "gemini-2.5-flash",
+    temperature=0.7,
+    convert_system_message_to_human=True
+)
+
+# Cheaper tier for small talk; the router falls back between tiers on SLO breaches
+lite_llm = create_chat_model(
+    "gemini-flash-lite-latest",
     temperature=0.7,
     convert_system_message_to_human=True
 )
+model_router = ModelRouter(
+    full=ModelTier(
+        name="full",
+        model="gemini-2.5-flash",
+        llm=llm,
+        window_seconds=config.MODEL_TIER_HEALTH_WINDOW_SECONDS
+    ),
+    lite=ModelTier(
+        name="lite",
+        model="gemini-flash-lite-latest",
+        llm=lite_llm,
+        window_seconds=config.MODEL_TIER_HEALTH_WINDOW_SECONDS
+    ),
+    enabled=config.MODEL_TIERING_ENABLED,
+    lite_max_history=config.MODEL_TIER_LITE_MAX_HISTORY,
+    latency_slo_seconds=config.MODEL_TIER_LATENCY_SLO_SECONDS,
+    max_error_rate=config.MODEL_TIER_MAX_ERROR_RATE
+)
 
 # Initialize RAG tool for function calling
 rag_tool = RAGTool(similarity_threshold=0.7)
 
+# Rolling summaries of history that falls outside the token budget
+history_summarizer = (
+    HistorySummarizer(cache_size=config.HISTORY_SUMMARY_CACHE_SIZE)
+    if config.HISTORY_SUMMARY_ENABLED else None
+)
+
+# Collapse duplicate retries of the same request into one pipeline run
+chat_single_flight = SingleFlight(result_ttl_seconds=config.SINGLE_FLIGHT_RESULT_TTL_SECONDS)
+
+# Opt-in hedging of slow generation calls
+llm_hedger = HedgedCaller(
+    enabled=config.LLM_HEDGING_ENABLED,
+    percentile=config.LLM_HEDGING_PERCENTILE,
+    max_hedge_ratio=config.LLM_HEDGING_MAX_RATIO,
+    max_hedge_burst=config.LLM_HEDGING_MAX_BURST
+)
+
+# Canned replies for trivial turns ("hi", "thanks", "ok"), no LLM call
+fast_path = FastPathResponder(
+    enabled=config.FAST_PATH_ENABLED,
+    is_crisis=lambda text: _determine_category(text) == "crisis"
+)
+
+# Emergency resources precomputed from rag-data.txt for instant crisis replies
+crisis_fast_path = CrisisFastPath()
+
+# Compile RAG trigger keywords once into a single multi-pattern matcher
+keyword_router = KeywordRouter(RAG_TRIGGER_KEYWORDS, CATEGORY_PRIORITY)
+
 
 def convert_to_langchain_messages(messages: List[MessageHistory]):
     """Convert message list to LangChain message format"""
@@ -58,32 +138,459 @@ async def process_ai_chat(request: AIChatRequest) -> AIChatResponse:
     try:
         logger.info("Processing AI chat request with hybrid RAG approach")
         
-        # Convert history to LangChain format
-        history_messages = convert_to_langchain_messages(request.history)
-        logger.debug(f"Converted {len(history_messages)} history messages")
-        
-        # Step 1: Decide if RAG is needed using keyword detection (faster and more reliable)
-        logger.debug("Step 1: Determining if RAG is needed")
+        with stage_timer("fast_path"):
+            fast_response = fast_path.respond(request.query, request.history)
+        if fast_response is not None:
+            set_request_label("category", "fast_path")
+            return AIChatResponse(
+                query=request.query,
+                response=fast_response
+            )
+        
+        # Fast path: while the generation breaker is open, answer locally
+        # instead of waiting on a call that is expected to fail
+        if not generation_breaker.allow_request():
+            return await _degraded_chat_response(request)
+        
+        start_time = time.perf_counter()
+        category, results = await _retrieve_for_query(request.query)
+        return await _generate_chat_response(request, category, results, start_time)
+        
+    except DeadlineExceededError:
+        logger.warning("AI chat request ran out of time budget", exc_info=True)
+        raise
+    except Exception as e:
+        error_msg = f"Failed to process AI chat request: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        raise Exception(error_msg) from e
+
+
+async def _generate_chat_response(
+    request: AIChatRequest,
+    category: str,
+    results: List[Dict],
+    start_time: Optional[float]
+) -> AIChatResponse:
+    """
+    Step 3 of the pipeline: generate the reply for an already routed request.
+    
+    Shared by process_ai_chat and the batch endpoint.
+    
+    Args:
+        request: The chat request
+        category: Route category from _determine_category
+        results: Retrieved resources (empty for "general" and "crisis")
+        start_time: perf_counter() when the request started, for crisis timing
+            (None skips recording, e.g. for batch items with no waiting user)
+    """
+    crisis = category == "crisis"
+    crisis_deadline = time.monotonic() + config.CRISIS_GENERATION_TIMEOUT_SECONDS
+    with stage_timer("format_context"):
+        context = crisis_fast_path.block if crisis else rag_tool.retriever.format_context(results)
+    all_messages = await _build_chat_messages(request, context, crisis=crisis)
+    
+    # Step 3: Generate response
+    logger.debug(f"Calling LLM with {len(all_messages)} messages")
+    tier, _ = model_router.choose(category, len(request.history or []))
+    try:
+        with stage_timer("generation", category=category, tier=tier.name):
+            # The timeout sits inside the breaker so a hanging provider counts as a
+            # failure; a budget already spent upstream never reaches the breaker
+            ensure_budget("generation")
+            generation = generation_breaker.call(
+                lambda: with_deadline(
+                    llm_hedger.call(lambda: _generate(tier, all_messages)),
+                    "generation"
+                )
+            )
+            if crisis:
+                # The emergency resources must not wait on the model: give the
+                # personalised text a short budget of its own, outside the breaker
+                # so cutting a healthy call short is not counted as a failure
+                generation = asyncio.wait_for(generation, timeout=max(0.0, crisis_deadline - time.monotonic()))
+            response = await generation
+    except CircuitOpenError:
+        return await _degraded_chat_response(request, category, results)
+    except asyncio.TimeoutError:
+        if not crisis:
+            raise
+        logger.warning("Crisis generation ran out of its budget, returning emergency resources only")
+        response = None
+    except Exception as e:
+        if not crisis:
+            raise
+        # Never fail a crisis request: the emergency resources alone are still useful
+        logger.error(f"Crisis generation failed, returning emergency resources only: {e}", exc_info=True)
+        response = None
+    
+    logger.debug(f"Response type: {type(response)}")
+    
+    # Extract response content
+    if hasattr(response, 'content') and response.content:
+        ai_response = response.content.strip()
+        logger.debug(f"Got response: {ai_response[:100]}")
+    elif crisis:
+        ai_response = ""
+    else:
+        logger.error(f"Response has no content or is empty. Response: {response}")
+        ai_response = "I'm having trouble processing your request. Please try again."
+    
+    if crisis:
+        # Hotline numbers always lead, with the personalised text after them
+        ai_response = f"{crisis_fast_path.block}\n\n{ai_response}".strip()
+        if start_time is not None:
+            crisis_fast_path.record_time_to_first_useful_byte(
+                "json", (time.perf_counter() - start_time) * 1000
+            )
+    
+    logger.info(f"AI chat request processed successfully. Response length: {len(ai_response)}")
+    return AIChatResponse(
+        query=request.query,
+        response=ai_response
+    )
+
+
+async def _generate(tier: ModelTier, messages: List) -> Any:
+    """One generation attempt on the chosen model tier, through the shared limiter"""
+    with start_span(
+        "llm.ainvoke",
+        model=tier.model,
+        tier=tier.name,
+        message_count=len(messages),
+        prompt_chars=sum(len(m.content) for m in messages if isinstance(m.content, str))
+    ) as span:
+        response = await model_router.invoke(
+            tier,
+            lambda tier_llm: gemini_limiter.run(lambda: tier_llm.ainvoke(messages))
+        )
+        content = getattr(response, "content", None)
+        span.set_attribute("response_chars", len(content) if isinstance(content, str) else 0)
+        return response
+
+
+async def _degraded_chat_response(
+    request: AIChatRequest,
+    category: Optional[str] = None,
+    results: Optional[List[Dict]] = None
+) -> AIChatResponse:
+    """
+    Build a response locally while the generation breaker is open.
+    
+    - crisis queries get the emergency resources straight away
+    - RAG categories get the top retrieved resource
+    - everything else gets a short "try again" message
+    """
+    if category is None:
         category = _determine_category(request.query)
-        rag_needed = category != "general"
-        logger.info(f"RAG needed: {rag_needed}, category: {category}")
-        
-        # Step 2: Get context if RAG is needed
-        context = ""
-        if rag_needed:
-            logger.debug("Step 2: Retrieving RAG context")
-            context = rag_tool.search_resources(request.query, category)
-            if not context:
-                logger.debug(f"No resources found for category: {category}, trying general search")
-                context = rag_tool.search_resources(request.query, "general")
-            logger.debug(f"Retrieved context length: {len(context)}")
-        
-        # Step 3: Generate response using simple prompt
-        logger.debug("Step 3: Generating response")
-        
-        if context:
-            # Build prompt with context
-            prompt_text = f"""You are Sora, a warm and supportive best friend helping with health and habits.
+    
+    if category == "crisis":
+        ai_response = DEGRADED_CRISIS_RESPONSE.format(emergency_resources=crisis_fast_path.block)
+    else:
+        if results is None and category != "general":
+            results = await rag_tool.aretrieve_with_fallback(request.query, category)
+        if results:
+            ai_response = DEGRADED_RESOURCE_RESPONSE.format(
+                resource=rag_tool.retriever.format_context(results[:1]).strip()
+            )
+        else:
+            ai_response = DEGRADED_GENERAL_RESPONSE
+    
+    logger.warning(f"Generation breaker open, returning degraded response for category: {category}")
+    return AIChatResponse(
+        query=request.query,
+        response=ai_response
+    )
+
+
+async def process_ai_chat_deduplicated(request: AIChatRequest) -> AIChatResponse:
+    """
+    process_ai_chat behind single-flight deduplication.
+    
+    Identical requests (same query and history) that arrive while one is in
+    flight, or shortly after it finished, share its result instead of running
+    embedding, search and generation again.
+    """
+    return await chat_single_flight.do(
+        chat_request_key(request),
+        lambda: process_ai_chat(request)
+    )
+
+
+async def process_ai_chat_batch(
+    requests: List[AIChatRequest],
+    item_timeout_seconds: Optional[float] = None
+) -> List[AIChatBatchItemResult]:
+    """
+    Process many chat requests in one call (back-office jobs, evaluation runs).
+    
+    - Fast-path turns are answered locally
+    - Every RAG-bound query is embedded in one batch and searched with one
+      multi-row FAISS call
+    - Generations run concurrently, at most BATCH_MAX_CONCURRENCY at a time
+    
+    The shared retrieval and each item's generation get their own deadline
+    of item_timeout_seconds, started when the item gets a concurrency slot,
+    so items late in a large batch are not timed out by the queue ahead of them.
+    A failing item gets an error entry instead of failing the whole batch.
+    
+    Args:
+        requests: Chat requests, each with its own query and history
+        item_timeout_seconds: Time budget per item (None for no deadline)
+        
+    Returns:
+        One result per request, in request order
+    """
+    logger.info(f"Processing AI chat batch of {len(requests)} requests")
+    results: List[Optional[AIChatBatchItemResult]] = [None] * len(requests)
+    
+    set_request_label("category", "batch")
+    
+    pending = []
+    with stage_timer("route"):
+        for index, request in enumerate(requests):
+            fast_response = fast_path.respond(request.query, request.history)
+            if fast_response is not None:
+                results[index] = AIChatBatchItemResult(index=index, query=request.query, response=fast_response)
+            else:
+                pending.append((index, request, _determine_category(request.query)))
+    
+    rag_items = [(index, request.query, category) for index, request, category in pending
+                 if category not in ("general", "crisis")]
+    retrieved: Dict[int, List[Dict]] = {}
+    if rag_items and generation_breaker.allow_request():
+        deadline_token = set_deadline(item_timeout_seconds) if item_timeout_seconds is not None else None
+        try:
+            search_results = await rag_tool.aretrieve_many_with_fallback(
+                [(query, category) for _, query, category in rag_items]
+            )
+        finally:
+            if deadline_token is not None:
+                reset_deadline(deadline_token)
+        retrieved = {index: found for (index, _, _), found in zip(rag_items, search_results)}
+        logger.info(f"Batch retrieval: {len(rag_items)} queries in one search")
+    
+    semaphore = asyncio.Semaphore(max(1, config.BATCH_MAX_CONCURRENCY))
+    
+    async def run_item(index: int, request: AIChatRequest, category: str):
+        async with semaphore:
+            # Each gathered item runs in its own task context, so this deadline is per item
+            if item_timeout_seconds is not None:
+                set_deadline(item_timeout_seconds)
+            try:
+                if not generation_breaker.allow_request():
+                    # None (not []) lets an item that skipped batch retrieval retrieve for itself
+                    response = await _degraded_chat_response(request, category, retrieved.get(index))
+                else:
+                    # No crisis time-to-first-byte for batch items: no user is waiting on them
+                    response = await _generate_chat_response(
+                        request, category, retrieved.get(index, []), None
+                    )
+                results[index] = AIChatBatchItemResult(index=index, query=request.query, response=response.response)
+            except DeadlineExceededError:
+                logger.warning(f"Batch item {index} ran out of time budget")
+                results[index] = AIChatBatchItemResult(
+                    index=index, query=request.query, error="Request timeout. Please try again."
+                )
+            except Exception as e:
+                logger.error(f"Batch item {index} failed: {str(e)}", exc_info=True)
+                results[index] = AIChatBatchItemResult(
+                    index=index, query=request.query, error="Unable to process your request. Please try again later."
+                )
+    
+    await asyncio.gather(*(run_item(index, request, category) for index, request, category in pending))
+    
+    failed = sum(1 for result in results if result.error)
+    logger.info(f"AI chat batch processed: {len(results) - failed} succeeded, {failed} failed")
+    return results
+
+
+async def stream_ai_chat(request: AIChatRequest) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streaming variant of process_ai_chat.
+    
+    Yields events in order:
+    - {"event": "resources", ...} with the category and retrieved resource metadata
+    - {"event": "token", "text": ...} for each chunk of the model's token stream
+    - {"event": "done", ...} with a summary of the generation
+    
+    The caller is expected to stop iterating (and close the generator) when the
+    client disconnects; closing it closes the upstream model stream.
+    """
+    logger.info("Processing streaming AI chat request")
+    start_time = time.perf_counter()
+    
+    with stage_timer("fast_path"):
+        fast_response = fast_path.respond(request.query, request.history)
+    if fast_response is not None:
+        set_request_label("category", "fast_path")
+        yield {"event": "resources", "category": "general", "resources": []}
+        yield {"event": "token", "text": fast_response}
+        yield {
+            "event": "done",
+            "category": "general",
+            "resource_count": 0,
+            "degraded": False,
+            "fast_path": True,
+            "chunks": 1,
+            "response_length": len(fast_response),
+            "time_to_first_token_ms": round((time.perf_counter() - start_time) * 1000, 1),
+            "total_ms": round((time.perf_counter() - start_time) * 1000, 1)
+        }
+        return
+    
+    category, results = await _retrieve_for_query(request.query)
+    crisis = category == "crisis"
+    yield {
+        "event": "resources",
+        "category": category,
+        "resources": [
+            {
+                "source": result['metadata'].get('source', 'Unknown'),
+                "resource_type": result['metadata'].get('resource_type', 'general'),
+                "similarity_score": result['similarity_score']
+            }
+            for result in results
+        ]
+    }
+    
+    chunk_count = 0
+    response_length = 0
+    first_token_ms = None
+    degraded = False
+    
+    if crisis:
+        # Precomputed emergency resources go out before any generation starts
+        first_token_ms = round((time.perf_counter() - start_time) * 1000, 1)
+        crisis_fast_path.record_time_to_first_useful_byte("stream", first_token_ms)
+        chunk_count, response_length = 1, len(crisis_fast_path.block)
+        yield {"event": "token", "text": crisis_fast_path.block + "\n\n"}
+    
+    try:
+        if not generation_breaker.allow_request():
+            raise CircuitOpenError("Generation breaker is open")
+        
+        with stage_timer("format_context"):
+            context = crisis_fast_path.block if crisis else rag_tool.retriever.format_context(results)
+        all_messages = await _build_chat_messages(request, context, crisis=crisis)
+        logger.debug(f"Streaming LLM with {len(all_messages)} messages")
+        
+        tier, _ = model_router.choose(category, len(request.history or []))
+        with stage_timer("generation", category=category, tier=tier.name, streaming=True):
+            ensure_budget("generation")
+            # A stream holds its slot for the whole response, so its duration is not a latency signal
+            async with generation_breaker.guard(), gemini_limiter.slot(call_class=None):
+                stream_start = time.monotonic()
+                token_stream = tier.llm.astream(all_messages)
+                try:
+                    while True:
+                        # Each chunk waits within the request deadline, so a hung
+                        # stream fails inside the breaker instead of blocking forever
+                        try:
+                            chunk = await with_deadline(token_stream.__anext__(), "generation")
+                        except StopAsyncIteration:
+                            break
+                        text = chunk.content if isinstance(chunk.content, str) else ""
+                        if not text:
+                            continue
+                        if first_token_ms is None:
+                            first_token_ms = round((time.perf_counter() - start_time) * 1000, 1)
+                        chunk_count += 1
+                        response_length += len(text)
+                        yield {"event": "token", "text": text}
+                except Exception:
+                    tier.record(time.monotonic() - stream_start, ok=False)
+                    raise
+                else:
+                    tier.record(time.monotonic() - stream_start, ok=True)
+                finally:
+                    await token_stream.aclose()
+    except CircuitOpenError:
+        degraded = True
+        if not crisis:
+            fallback = await _degraded_chat_response(request, category, results)
+            chunk_count, response_length = 1, len(fallback.response)
+            yield {"event": "token", "text": fallback.response}
+    
+    logger.info(f"Streaming AI chat completed. Chunks: {chunk_count}, response length: {response_length}")
+    yield {
+        "event": "done",
+        "category": category,
+        "resource_count": len(results),
+        "degraded": degraded,
+        "fast_path": False,
+        "chunks": chunk_count,
+        "response_length": response_length,
+        "time_to_first_token_ms": first_token_ms,
+        "crisis_fast_path": crisis,
+        "total_ms": round((time.perf_counter() - start_time) * 1000, 1)
+    }
+
+
+async def _retrieve_for_query(query: str) -> Tuple[str, List[Dict]]:
+    """
+    Route the query to a category and retrieve RAG results when needed.
+    
+    Returns:
+        Tuple of (category, search_results); results are empty for "general" and "crisis"
+    """
+    # Step 1: Decide if RAG is needed using keyword detection (faster and more reliable)
+    logger.debug("Step 1: Determining if RAG is needed")
+    with stage_timer("route", query_chars=len(query)) as span:
+        category = _determine_category(query)
+        span.set_attribute("category", category)
+    set_request_label("category", category)
+    # Crisis turns use the precomputed emergency resources instead of a search
+    rag_needed = category not in ("general", "crisis")
+    logger.info(f"RAG needed: {rag_needed}, category: {category}")
+    
+    # Step 2: Get context if RAG is needed
+    results = []
+    if rag_needed:
+        logger.debug("Step 2: Retrieving RAG context")
+        results = await rag_tool.aretrieve_with_fallback(query, category)
+        logger.debug(f"Retrieved {len(results)} results")
+    
+    return category, results
+
+
+async def _build_chat_messages(request: AIChatRequest, context: str, crisis: bool = False) -> List:
+    """Build the full LangChain message list (history + prompt) for generation"""
+    # Keep only the most recent history that fits the token budget
+    with stage_timer("history"):
+        history_window = apply_history_budget(
+            request.history or [],
+            budget_tokens=config.HISTORY_TOKEN_BUDGET,
+            min_recent_messages=config.HISTORY_MIN_RECENT_MESSAGES
+        )
+        
+        # Convert history to LangChain format
+        history_messages = convert_to_langchain_messages(history_window.messages)
+    logger.debug(f"Converted {len(history_messages)} history messages")
+    
+    # Fold aged-out turns into a cached rolling summary instead of losing them
+    # (not for crisis turns, which must not wait on an extra model call)
+    if history_summarizer is not None and history_window.dropped and not crisis:
+        try:
+            with stage_timer("history_summary"):
+                summary = await with_deadline(
+                    history_summarizer.summarize(history_window.dropped),
+                    "history summary",
+                    reserve_seconds=config.RAG_GENERATION_RESERVE_SECONDS
+                )
+        except DeadlineExceededError as e:
+            logger.warning(f"History summary skipped to meet deadline: {e}")
+            summary = None
+        if summary:
+            history_messages = [
+                SystemMessage(content=f"Summary of the earlier conversation:\n{summary}")
+            ] + history_messages
+    
+    if crisis:
+        # Emergency resources are already shown to the user ahead of this text
+        prompt_text = CRISIS_FOLLOW_UP_PROMPT.format(query=request.query, resources=context)
+    elif context:
+        # Build prompt with context
+        prompt_text = f"""You are Sora, a warm and supportive best friend helping with health and habits.
 
 User Query: {request.query}
 
@@ -96,40 +603,15 @@ Format links clearly so the user can easily access them.
 Respond naturally based on these resources. Keep it conversational (1-2 sentences typically). 
 For serious issues, mention consulting a professional.
 ALWAYS include relevant links/resources at the end of your response."""
-        else:
-            # Build prompt without context
-            prompt_text = f"""You are Sora, a warm and supportive best friend helping with health and habits.
+    else:
+        # Build prompt without context
+        prompt_text = f"""You are Sora, a warm and supportive best friend helping with health and habits.
 
 User Query: {request.query}
 
 Respond naturally and conversationally. Keep it brief (1-2 sentences typically)."""
-        
-        # Build full message list
-        all_messages = history_messages + [HumanMessage(content=prompt_text)]
-        
-        logger.debug(f"Calling LLM with {len(all_messages)} messages")
-        response = await llm.ainvoke(all_messages)
-        
-        logger.debug(f"Response type: {type(response)}")
-        
-        # Extract response content
-        if hasattr(response, 'content') and response.content:
-            ai_response = response.content.strip()
-            logger.debug(f"Got response: {ai_response[:100]}")
-        else:
-            logger.error(f"Response has no content or is empty. Response: {response}")
-            ai_response = "I'm having trouble processing your request. Please try again."
-        
-        logger.info(f"AI chat request processed successfully. Response length: {len(ai_response)}")
-        return AIChatResponse(
-            query=request.query,
-            response=ai_response
-        )
-        
-    except Exception as e:
-        error_msg = f"Failed to process AI chat request: {str(e)}"
-        logger.error(error_msg, exc_info=True)
-        raise Exception(error_msg) from e
+    
+    return history_messages + [HumanMessage(content=prompt_text)]
 
 
 async def _should_use_rag(query: str) -> bool:
@@ -151,7 +633,10 @@ Respond with ONLY "YES" or "NO":
 
 Response:"""
         
-        response = await llm.ainvoke([HumanMessage(content=classification_prompt)])
+        response = await gemini_limiter.run(
+            lambda: llm.ainvoke([HumanMessage(content=classification_prompt)]),
+            call_class="classification"
+        )
         
         if not hasattr(response, 'content'):
             logger.warning("Classification response has no content, defaulting to NO")
@@ -182,11 +667,8 @@ async def _get_rag_context(query: str) -> tuple[str, str]:
         logger.debug(f"Determined category: {category}")
         
         # Search for resources
-        context = rag_tool.search_resources(query, category)
-        
-        if not context:
-            logger.debug(f"No resources found for category: {category}, trying general search")
-            context = rag_tool.search_resources(query, "general")
+        results = await rag_tool.aretrieve_with_fallback(query, category)
+        context = rag_tool.retriever.format_context(results)
         
         logger.debug(f"Retrieved context length: {len(context)}")
         return context, category
@@ -196,89 +678,6 @@ async def _get_rag_context(query: str) -> tuple[str, str]:
         return "", "general"
 
 
-# RAG Trigger Keywords - Comprehensive keyword mapping for RAG activation
-RAG_TRIGGER_KEYWORDS = {
-    # CRISIS & EMERGENCY (Highest Priority)
-    "crisis": [
-        "crisis", "emergency", "suicide", "suicidal", "kill myself", "end my life",
-        "want to die", "self harm", "self-harm", "hurt myself", "overdose", "od",
-        "can't go on", "no point living", "better off dead", "ending it all", "SAMHSA", "samsha"
-    ],
-    # CRAVINGS & URGES
-    "cravings": [
-        "craving", "crave", "urge", "temptation", "want to use", "need to use",
-        "thinking about using", "struggling not to", "hard not to", "can't resist",
-        "giving in", "slip up"
-    ],
-    # RELAPSE & STRUGGLES
-    "relapse": [
-        "relapse", "relapsed", "used again", "fell off", "slipped", "messed up",
-        "failed", "broke my streak", "gave in", "couldn't stop", "lost control"
-    ],
-    # TRIGGERS & DIFFICULT SITUATIONS
-    "triggers": [
-        "trigger", "triggered", "tempting situation", "high risk", "around people who",
-        "at a party", "stressful", "overwhelmed", "anxious", "depressed", "lonely",
-        "angry", "tired", "hungry"
-    ],
-    # WITHDRAWAL & SYMPTOMS
-    "withdrawal": [
-        "withdrawal", "withdrawing", "detox", "shakes", "sweating", "nausea", "sick",
-        "symptoms", "coming off", "quitting cold turkey"
-    ],
-    # HELP & RESOURCES
-    "help": [
-        "help", "need help", "where can i", "how do i get", "looking for", "find",
-        "resource", "support", "program", "treatment", "therapy", "counseling",
-        "hotline", "helpline", "crisis line", "call"
-    ],
-    # MEDICATION & TREATMENT
-    "medication": [
-        "medication", "medicine", "prescription", "drug", "treatment", "mat",
-        "medication assisted", "buprenorphine", "naltrexone", "naloxone", "narcan",
-        "methadone", "suboxone", "acamprosate", "disulfiram", "antabuse", "varenicline",
-        "chantix", "bupropion", "wellbutrin", "nicotine patch", "nicotine gum"
-    ],
-    # SPECIFIC SUBSTANCES
-    "substances": [
-        "alcohol", "drinking", "drunk", "beer", "wine", "liquor", "vodka", "opioid",
-        "heroin", "fentanyl", "oxy", "oxycodone", "percocet", "vicodin", "pills",
-        "painkillers", "cocaine", "coke", "crack", "meth", "methamphetamine", "speed",
-        "marijuana", "weed", "cannabis", "tobacco", "cigarette", "smoking", "vaping",
-        "nicotine", "soda", "junk food", "fast food", "sugar", "caffeine"
-    ],
-    # COPING TECHNIQUES
-    "coping": [
-        "cope", "coping", "deal with", "handle", "manage", "technique", "strategy",
-        "method", "tip", "advice", "what should i do", "how do i", "grounding",
-        "breathing", "mindfulness", "meditation", "distraction", "urge surfing",
-        "halt", "deads"
-    ],
-    # RECOVERY & SOBRIETY
-    "recovery": [
-        "recovery", "recovering", "sober", "sobriety", "clean", "abstinence", "quit",
-        "quitting", "stop", "stopping", "rehab", "rehabilitation", "aa", "na",
-        "12 step", "alcoholics anonymous", "narcotics anonymous", "support group"
-    ],
-    # HARM REDUCTION
-    "harm_reduction": [
-        "harm reduction", "safer use", "overdose prevention", "needle exchange",
-        "syringe", "test strips", "fentanyl test", "good samaritan", "safe injection",
-        "reduce harm"
-    ],
-    # MENTAL HEALTH
-    "mental_health": [
-        "depressed", "depression", "anxiety", "anxious", "panic", "ptsd", "trauma",
-        "bipolar", "mental health", "therapy", "psychiatrist", "psychologist", "counselor"
-    ],
-    # PHYSICAL SYMPTOMS
-    "physical": [
-        "sleep", "insomnia", "can't sleep", "tired", "exhausted", "appetite", "weight",
-        "pain", "ache", "headache", "stomach"
-    ]
-}
-
-
 def _determine_category(query: str) -> str:
     """
     Determine the resource category based on comprehensive RAG trigger keywords.
@@ -287,32 +686,14 @@ def _determine_category(query: str) -> str:
     Priority order: crisis > cravings > relapse > triggers > withdrawal > help > 
                    medication > substances > coping > recovery > harm_reduction > 
                    mental_health > physical
+    
+    Matching uses the compiled keyword router (one linear pass, word-boundary aware).
     """
-    query_lower = query.lower()
-    
-    # Priority order for category matching
-    priority_order = [
-        "crisis",
-        "cravings",
-        "relapse",
-        "triggers",
-        "withdrawal",
-        "help",
-        "medication",
-        "substances",
-        "coping",
-        "recovery",
-        "harm_reduction",
-        "mental_health",
-        "physical"
-    ]
-    
-    # Check each category in priority order
-    for category in priority_order:
-        keywords = RAG_TRIGGER_KEYWORDS.get(category, [])
-        if any(keyword in query_lower for keyword in keywords):
-            logger.debug(f"Matched category '{category}' for query: {query[:100]}")
-            return category
+    category = keyword_router.route(query)
+    
+    if category is not None:
+        logger.debug(f"Matched category '{category}' for query: {query[:100]}")
+        return category
     
     # No keywords matched - return general (no RAG needed)
     logger.debug(f"No RAG keywords matched for query: {query[:100]}")
@@ -360,7 +741,7 @@ async def _handle_llm_response(response: Any, messages: List, original_query: st
                     logger.info(f"Tool call: search_resources(query='{query}', category='{category}')")
                     
                     # Call the RAG tool
-                    context = rag_tool.search_resources(query, category)
+                    context = await rag_tool.asearch_resources(query, category)
                     tool_results.append({
                         'tool_name': 'search_resources',
                         'context': context,
@@ -445,7 +826,7 @@ Remember to:
             HumanMessage(content=follow_up_prompt)
         ]
         
-        final_response = await llm.ainvoke(final_messages)
+        final_response = await gemini_limiter.run(lambda: llm.ainvoke(final_messages))
         
         if hasattr(final_response, 'content'):
             logger.debug("Successfully generated final response with context")
@@ -1,20 +1,52 @@
-from fastapi import APIRouter, HTTPException
-from com.mhire.app.services.ai_chat.ai_chat import process_ai_chat
-from com.mhire.app.services.ai_chat.ai_chat_schema import AIChatRequest, AIChatResponse
+import json
+from contextlib import nullcontext
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from com.mhire.app.services.ai_chat.ai_chat import (
+    process_ai_chat,
+    process_ai_chat_batch,
+    process_ai_chat_deduplicated,
+    stream_ai_chat
+)
+from com.mhire.app.services.ai_chat.ai_chat_schema import AIChatBatchRequest, AIChatBatchResponse, AIChatRequest, AIChatResponse
+from com.mhire.app.config.config import Config
+from com.mhire.app.utils.deadline.deadline import DeadlineExceededError, reset_deadline, set_deadline
+from com.mhire.app.utils.tracing.tracing import SpanKind, start_span
+from com.mhire.app.utils.profiling.request_profiler import ProfilerBusyError, cprofile_request, verify_admin_token
 from com.mhire.app.logger.logger import ChatEndpoint
 
 logger = ChatEndpoint.setup_router_logger()
 
 router = APIRouter(prefix="/api/v1", tags=["AI_Chat"])
+config = Config()
+
+
+def _request_timeout_seconds(timeout_ms: Optional[int]) -> float:
+    """Deadline for this request: the client's header if given, capped by config"""
+    if timeout_ms is None or timeout_ms <= 0:
+        return config.CHAT_DEADLINE_SECONDS
+    return min(timeout_ms / 1000, config.CHAT_DEADLINE_MAX_SECONDS)
+
 
 @router.post("/ai_chat", response_model=AIChatResponse)
-async def ai_chat_endpoint(request: AIChatRequest):
+async def ai_chat_endpoint(
+    request: AIChatRequest,
+    response: Response,
+    x_request_timeout_ms: Optional[int] = Header(default=None),
+    x_profile: Optional[str] = Header(default=None),
+    x_admin_token: Optional[str] = Header(default=None)
+):
     """
     AI Chat endpoint that processes user query with provided conversation history
     
     Parameters:
     - query: User's current question/message (required)
     - history: Conversation history as a list of messages (optional)
+    - X-Request-Timeout-Ms header: time budget for the whole request (optional)
+    - X-Profile: cprofile header (admin only, with X-Admin-Token): profile this
+      request with cProfile; the saved profile id comes back in X-Profile-Id
+      and can be downloaded from GET /admin/profiles/{id}
     
     Returns:
     - query: The user's query
@@ -22,15 +54,42 @@ async def ai_chat_endpoint(request: AIChatRequest):
     
     Note: This endpoint does NOT perform any database operations.
     """
+    profiling = (x_profile or "").lower() == "cprofile"
+    if profiling and not verify_admin_token(x_admin_token):
+        raise HTTPException(status_code=403, detail="Profiling requires a valid X-Admin-Token")
+    
     try:
         logger.info(f"AI chat endpoint called")
         logger.debug(f"Query: {request.query}")
         logger.debug(f"History length: {len(request.history)}")
         
-        result = await process_ai_chat(request)
+        deadline_token = set_deadline(_request_timeout_seconds(x_request_timeout_ms))
+        try:
+            with start_span(
+                "POST /api/v1/ai_chat",
+                kind=SpanKind.SERVER,
+                query_chars=len(request.query),
+                history_length=len(request.history or [])
+            ) as span:
+                with (cprofile_request("ai_chat") if profiling else nullcontext({})) as profile:
+                    # A profiled request must do its own work, not share another's result
+                    result = await (process_ai_chat(request) if profiling else process_ai_chat_deduplicated(request))
+                span.set_attribute("response_chars", len(result.response))
+        finally:
+            reset_deadline(deadline_token)
         
+        if "id" in profile:
+            response.headers["X-Profile-Id"] = profile["id"]
         logger.info(f"AI chat endpoint completed successfully")
         return result
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except DeadlineExceededError as e:
+        logger.error(f"AI chat request exceeded its deadline: {str(e)}")
+        raise HTTPException(
+            status_code=504, 
+            detail="Request timeout. Please try again."
+        )
     except Exception as e:
         error_str = str(e)
         logger.error(f"Error processing AI chat: {error_str}", exc_info=True)
@@ -56,4 +115,108 @@ async def ai_chat_endpoint(request: AIChatRequest):
             raise HTTPException(
                 status_code=500, 
                 detail="Unable to process your request. Please try again later."
-            )
\ No newline at end of file
+            )
+
+
+@router.post("/ai_chat/batch", response_model=AIChatBatchResponse)
+async def ai_chat_batch_endpoint(
+    request: AIChatBatchRequest,
+    x_request_timeout_ms: Optional[int] = Header(default=None)
+):
+    """
+    Batch AI Chat endpoint for back-office jobs
+    
+    Parameters:
+    - items: List of /ai_chat requests (query + optional history), at most BATCH_MAX_ITEMS
+    - X-Request-Timeout-Ms header: time budget for each item (optional); the
+      batch as a whole may take longer when items wait for a concurrency slot
+    
+    Returns:
+    - results: One entry per item, in order, with either `response` or `error`
+    
+    A failing item does not fail the batch.
+    """
+    logger.info(f"AI chat batch endpoint called with {len(request.items)} items")
+    
+    if len(request.items) > config.BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch too large. At most {config.BATCH_MAX_ITEMS} items are allowed."
+        )
+    
+    try:
+        with start_span("POST /api/v1/ai_chat/batch", kind=SpanKind.SERVER, items=len(request.items)) as span:
+            results = await process_ai_chat_batch(
+                request.items,
+                item_timeout_seconds=_request_timeout_seconds(x_request_timeout_ms)
+            )
+            span.set_attribute("failed_items", sum(1 for result in results if result.error))
+        
+        logger.info(f"AI chat batch endpoint completed successfully")
+        return AIChatBatchResponse(results=results)
+    except Exception as e:
+        logger.error(f"Error processing AI chat batch: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=500, 
+            detail="Unable to process your request. Please try again later."
+        )
+
+
+@router.post("/ai_chat/stream")
+async def ai_chat_stream_endpoint(
+    request: AIChatRequest,
+    http_request: Request,
+    x_request_timeout_ms: Optional[int] = Header(default=None)
+):
+    """
+    Streaming AI Chat endpoint (Server-Sent Events)
+    
+    Parameters are the same as /ai_chat.
+    
+    Emits, in order:
+    - event: resources  -> category and retrieved resource metadata
+    - event: token      -> incremental response text
+    - event: done       -> generation summary
+    - event: error      -> emitted instead of done if generation fails
+    
+    If the client disconnects, the model stream is closed so abandoned
+    requests stop consuming LLM quota.
+    """
+    logger.info(f"AI chat stream endpoint called")
+    logger.debug(f"Query: {request.query}")
+    logger.debug(f"History length: {len(request.history)}")
+    
+    timeout_seconds = _request_timeout_seconds(x_request_timeout_ms)
+    
+    async def event_source():
+        # Set inside the generator so the deadline lives in the streaming task's context
+        deadline_token = set_deadline(timeout_seconds)
+        with start_span(
+            "POST /api/v1/ai_chat/stream",
+            kind=SpanKind.SERVER,
+            query_chars=len(request.query),
+            history_length=len(request.history or [])
+        ) as span:
+            events = stream_ai_chat(request)
+            try:
+                async for event in events:
+                    if await http_request.is_disconnected():
+                        logger.info("Client disconnected, cancelling AI chat stream")
+                        span.set_attribute("client_disconnected", True)
+                        break
+                    event_name = event.pop("event")
+                    yield f"event: {event_name}\ndata: {json.dumps(event)}\n\n"
+            except Exception as e:
+                logger.error(f"Error streaming AI chat: {str(e)}", exc_info=True)
+                span.record_exception(e)
+                detail = json.dumps({"detail": "Unable to process your request. Please try again later."})
+                yield f"event: error\ndata: {detail}\n\n"
+            finally:
+                await events.aclose()
+                reset_deadline(deadline_token)
+    
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
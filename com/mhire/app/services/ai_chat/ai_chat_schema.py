@@ -1,4 +1,4 @@
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional
 from com.mhire.app.logger.logger import ChatEndpoint
 
@@ -47,4 +47,16 @@ class AIChatResponse(BaseModel):
         except Exception as e:
             error_msg = f"Failed to create AIChatResponse: {str(e)}"
             logger.error(error_msg, exc_info=True)
-            raise
\ No newline at end of file
+            raise
+
+class AIChatBatchRequest(BaseModel):
+    items: List[AIChatRequest] = Field(..., min_length=1)
+
+class AIChatBatchItemResult(BaseModel):
+    index: int
+    query: str
+    response: Optional[str] = None
+    error: Optional[str] = None
+
+class AIChatBatchResponse(BaseModel):
+    results: List[AIChatBatchItemResult]
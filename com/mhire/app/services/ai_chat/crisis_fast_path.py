@@ -0,0 +1,106 @@
+"""
+Crisis fast path: emergency resources precomputed at startup
+"""
+import re
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional
+from com.mhire.app.utils.prompt.prompt_degraded import EMERGENCY_RESOURCES_TEXT
+from com.mhire.app.logger.logger import ChatEndpoint
+
+logger = ChatEndpoint.setup_chat_logger()
+
+RESOURCE_FILE = (
+    Path(__file__).resolve().parent.parent.parent / "data/resources/rag-data.txt"
+)
+
+_SECTION_HEADING = re.compile(r"^\d+\.\s+(.+)$")
+_ENTRY_HEADING = re.compile(r"^\d+\.\d+\s+(.+)$")
+
+
+def parse_emergency_entries(text: str) -> List[Dict[str, str]]:
+    """
+    Extract the entries of the "EMERGENCY RESOURCES" section
+
+    Returns:
+        One dict per entry with its title and "Key: value" fields
+    """
+    entries: List[Dict[str, str]] = []
+    in_section = False
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        section = _SECTION_HEADING.match(line)
+        if section and not _ENTRY_HEADING.match(line):
+            in_section = "EMERGENCY" in section.group(1).upper()
+            continue
+        if not in_section or not line:
+            continue
+        entry = _ENTRY_HEADING.match(line)
+        if entry:
+            entries.append({"title": entry.group(1)})
+        elif entries and ":" in line:
+            key, value = line.split(":", 1)
+            entries[-1][key.strip().lower()] = value.strip()
+    return entries
+
+
+def format_crisis_block(entries: List[Dict[str, str]]) -> str:
+    """Render emergency entries as a short, scannable list"""
+    lines = ["If you're in danger or thinking about ending your life, please reach out right now:"]
+    for entry in entries:
+        how = entry.get("contact") or entry.get("action") or entry.get("service", "")
+        line = f"- {entry['title']}: {how}"
+        resource = entry.get("resource")
+        if resource and resource not in line:
+            line += f" ({resource})"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def build_crisis_block(resource_file: Path = RESOURCE_FILE) -> str:
+    """Build the crisis block from the resource guide, falling back to the static text"""
+    try:
+        entries = parse_emergency_entries(resource_file.read_text(encoding="utf-8"))
+        if entries:
+            logger.info(f"Crisis block built from {len(entries)} emergency entries in {resource_file.name}")
+            return format_crisis_block(entries)
+        logger.warning(f"No emergency section found in {resource_file}, using static crisis block")
+    except OSError as e:
+        logger.error(f"Failed to read {resource_file}: {e}. Using static crisis block", exc_info=True)
+    return EMERGENCY_RESOURCES_TEXT
+
+
+class CrisisFastPath:
+    """Holds the precomputed crisis block and time-to-first-useful-byte samples"""
+
+    def __init__(self, window_size: int = 1000):
+        self.block = build_crisis_block()
+        self._ttfub_ms: Dict[str, deque] = {}
+        self.window_size = window_size
+        self.served = 0
+
+    def record_time_to_first_useful_byte(self, mode: str, elapsed_ms: float):
+        """Record how long a crisis user waited for the first hotline number"""
+        self.served += 1
+        self._ttfub_ms.setdefault(mode, deque(maxlen=self.window_size)).append(elapsed_ms)
+        logger.info(f"Crisis time-to-first-useful-byte ({mode}): {elapsed_ms:.1f}ms")
+
+    @staticmethod
+    def _percentile(samples: List[float], percentile: float) -> Optional[float]:
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        return round(ordered[min(len(ordered) - 1, int(percentile * len(ordered)))], 1)
+
+    def get_stats(self) -> Dict[str, object]:
+        return {
+            "served": self.served,
+            "time_to_first_useful_byte_ms": {
+                mode: {
+                    "p50": self._percentile(list(samples), 0.5),
+                    "p95": self._percentile(list(samples), 0.95),
+                    "count": len(samples),
+                }
+                for mode, samples in self._ttfub_ms.items()
+            },
+        }
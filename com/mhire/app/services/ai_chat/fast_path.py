@@ -0,0 +1,104 @@
+"""
+Zero-LLM fast path for greetings and other trivial turns
+"""
+import itertools
+import re
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+from com.mhire.app.utils.prompt.prompt_fast_path import FAST_PATH_TEMPLATES
+from com.mhire.app.logger.logger import ChatEndpoint
+
+logger = ChatEndpoint.setup_chat_logger()
+
+# The whole message must be one of these (plus optional "sora", punctuation)
+TRIVIAL_PATTERNS = {
+    "greeting": r"((hi+|hello+|hey+|hiya|yo|howdy)( there)?|good (morning|afternoon|evening)|what'?s up|sup)",
+    "thanks": r"(thanks?( (so|very) much)?( a lot)?|thank (you|u)( (so|very) much)?|thx|ty|tysm|appreciate (it|that)|much appreciated)",
+    "acknowledgement": r"(ok(ay)?|k+|kk|cool|got it|sounds good|nice|great|alright|sure|perfect|awesome)",
+    "farewell": r"(bye+|goodbye|good ?night|see (you|ya)( later| soon)?|later|talk (to you )?(later|soon)|ttyl|gn)",
+}
+
+
+class FastPathResponder:
+    """
+    Answer trivial turns ("hi", "thanks", "ok") from rotating templates
+
+    Matching is done with one compiled regex over the normalized query, so the
+    check costs microseconds. Anything that isn't purely trivial goes to the
+    normal pipeline.
+
+    A trivial message can still answer something said earlier ("ok" to "Would
+    you like to try a breathing exercise?"), so once there is history the fast
+    path steps aside for acknowledgements, for replies to an assistant
+    question, and for any conversation that has touched on a crisis.
+    """
+
+    def __init__(self, enabled: bool = True, is_crisis: Optional[Callable[[str], bool]] = None):
+        """
+        Args:
+            enabled: Whether trivial turns are answered from templates at all
+            is_crisis: Crisis check applied to earlier user messages
+        """
+        self.enabled = enabled
+        self.is_crisis = is_crisis
+        alternatives = "|".join(f"(?P<{intent}>{pattern})" for intent, pattern in TRIVIAL_PATTERNS.items())
+        self._matcher = re.compile(
+            rf"^(?:(?:hey |hi )?sora[\s,]*)?(?:{alternatives})(?:[\s,]*sora)?[\s!.?,:)]*$"
+        )
+        self._templates = {
+            intent: itertools.cycle(templates) for intent, templates in FAST_PATH_TEMPLATES.items()
+        }
+        self.short_circuited: Counter = Counter()
+        self.deferred_to_model = 0
+
+    def match(self, query: str) -> Optional[str]:
+        """Return the trivial intent of the query, or None"""
+        normalized = re.sub(r"\s+", " ", query.strip().lower())
+        match = self._matcher.match(normalized)
+        if match is None:
+            return None
+        return next(intent for intent, value in match.groupdict().items() if value is not None)
+
+    def _needs_model(self, intent: str, history: List) -> bool:
+        """Whether the conversation so far gives a trivial message a meaning worth a model reply"""
+        if intent == "acknowledgement":
+            return True
+        last_assistant = next((message for message in reversed(history) if message.role == "assistant"), None)
+        if last_assistant is not None and "?" in last_assistant.content:
+            return True
+        if self.is_crisis is not None:
+            return any(self.is_crisis(message.content) for message in history if message.role == "user")
+        return False
+
+    def respond(self, query: str, history: Optional[List] = None) -> Optional[str]:
+        """
+        Get a canned reply for a trivial query
+
+        Args:
+            query: Current user message
+            history: Earlier messages (objects with role and content)
+
+        Returns:
+            Reply text, or None if the fast path is disabled, the query isn't
+            trivial, or the history means the message should go to the model
+        """
+        if not self.enabled:
+            return None
+        intent = self.match(query)
+        if intent is None:
+            return None
+        if history and self._needs_model(intent, history):
+            self.deferred_to_model += 1
+            logger.debug(f"Fast path deferred '{intent}' turn to the model because of the conversation history")
+            return None
+        self.short_circuited[intent] += 1
+        logger.info(f"Fast path answered '{intent}' turn without LLM (total {sum(self.short_circuited.values())})")
+        return next(self._templates[intent])
+
+    def get_stats(self) -> Dict[str, object]:
+        return {
+            "enabled": self.enabled,
+            "short_circuited": sum(self.short_circuited.values()),
+            "by_intent": dict(self.short_circuited),
+            "deferred_to_model": self.deferred_to_model,
+        }
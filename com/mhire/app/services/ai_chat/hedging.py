@@ -0,0 +1,132 @@
+"""
+Hedged LLM requests to cut generation tail latency
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict
+from com.mhire.app.logger.logger import ChatEndpoint
+
+logger = ChatEndpoint.setup_chat_logger()
+
+
+class HedgedCaller:
+    """
+    Send a backup request when the first one is slower than usual
+
+    The hedge delay is the `percentile` of recently observed latencies. If the
+    primary call hasn't finished by then, an identical second call is started;
+    whichever finishes first wins and the other is cancelled.
+
+    Hedges are paid from a token bucket: every call adds `max_hedge_ratio`
+    tokens, a hedge costs one, and the bucket holds at most `max_hedge_burst`.
+    Hedges therefore stay under `max_hedge_ratio` of calls, and a long healthy
+    period cannot bank budget for a burst of duplicates when Gemini slows down.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        percentile: float = 0.95,
+        max_hedge_ratio: float = 0.1,
+        max_hedge_burst: float = 2.0,
+        min_samples: int = 20,
+        default_delay_seconds: float = 5.0,
+        window_size: int = 500
+    ):
+        self.enabled = enabled
+        self.percentile = percentile
+        self.max_hedge_ratio = max_hedge_ratio
+        self.max_hedge_burst = max_hedge_burst
+        self._hedge_tokens = 0.0
+        self.min_samples = min_samples
+        self.default_delay_seconds = default_delay_seconds
+        self._latencies: deque = deque(maxlen=window_size)
+
+        self.calls = 0
+        self.hedges_sent = 0
+        self.hedge_wins = 0
+        self.hedges_denied = 0
+
+    def hedge_delay(self) -> float:
+        """Current hedge trigger: the tracked latency percentile"""
+        if len(self._latencies) < self.min_samples:
+            return self.default_delay_seconds
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(self.percentile * len(ordered)))]
+
+    def _hedge_allowed(self) -> bool:
+        if self._hedge_tokens < 1:
+            return False
+        self._hedge_tokens -= 1
+        return True
+
+    async def call(self, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run func, hedging with a second identical call if it is slow
+
+        Args:
+            func: Zero-argument coroutine factory; called once or twice
+
+        Returns:
+            The result of whichever attempt finished first
+        """
+        self.calls += 1
+        self._hedge_tokens = min(self.max_hedge_burst, self._hedge_tokens + self.max_hedge_ratio)
+        start = time.monotonic()
+
+        if not self.enabled:
+            result = await func()
+            self._latencies.append(time.monotonic() - start)
+            return result
+
+        delay = self.hedge_delay()
+        primary = asyncio.ensure_future(func())
+        hedge = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done:
+                self._latencies.append(time.monotonic() - start)
+                return primary.result()
+
+            if not self._hedge_allowed():
+                self.hedges_denied += 1
+                result = await primary
+                self._latencies.append(time.monotonic() - start)
+                return result
+
+            self.hedges_sent += 1
+            hedge = asyncio.ensure_future(func())
+            logger.info(f"Hedging LLM call after {delay:.2f}s (hedges {self.hedges_sent}/{self.calls} calls)")
+
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None or not pending:
+                        for loser in pending:
+                            loser.cancel()
+                        won_by_hedge = task is hedge
+                        if won_by_hedge:
+                            self.hedge_wins += 1
+                        logger.info(
+                            f"Hedged LLM call won by {'hedge' if won_by_hedge else 'primary'} "
+                            f"in {time.monotonic() - start:.2f}s"
+                        )
+                        self._latencies.append(time.monotonic() - start)
+                        return task.result()
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "calls": self.calls,
+            "hedges_sent": self.hedges_sent,
+            "hedge_wins": self.hedge_wins,
+            "hedge_win_rate": round(self.hedge_wins / self.hedges_sent, 3) if self.hedges_sent else 0.0,
+            "hedges_denied": self.hedges_denied,
+            "hedge_delay_seconds": round(self.hedge_delay(), 3),
+        }
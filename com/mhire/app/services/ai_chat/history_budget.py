@@ -0,0 +1,79 @@
+"""
+Token-budgeted windowing of client-supplied conversation history
+"""
+from dataclasses import dataclass
+from typing import List
+from com.mhire.app.services.ai_chat.ai_chat_schema import MessageHistory
+from com.mhire.app.logger.logger import ChatEndpoint
+
+logger = ChatEndpoint.setup_chat_logger()
+
+# Gemini tokenizes English at roughly 4 characters per token
+CHARS_PER_TOKEN = 4
+# Role markers and separators added per message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Fast local token estimate (no tokenizer round trip)"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def estimate_message_tokens(message: MessageHistory) -> int:
+    return estimate_tokens(message.content) + MESSAGE_OVERHEAD_TOKENS
+
+
+@dataclass
+class HistoryWindow:
+    """Result of applying the history budget"""
+    messages: List[MessageHistory]
+    dropped: List[MessageHistory]
+    kept_tokens: int
+    dropped_tokens: int
+
+
+def apply_history_budget(
+    history: List[MessageHistory],
+    budget_tokens: int,
+    min_recent_messages: int = 2
+) -> HistoryWindow:
+    """
+    Keep the most recent messages that fit in the token budget
+
+    Messages are taken newest-first until the next one would exceed the
+    budget; everything older is dropped. The newest `min_recent_messages`
+    are always kept verbatim so the model never loses the immediate context.
+
+    Args:
+        history: Conversation history, oldest first
+        budget_tokens: Maximum estimated tokens of history to forward
+        min_recent_messages: Messages always kept regardless of budget
+
+    Returns:
+        HistoryWindow with the kept (oldest first) and dropped messages
+    """
+    kept_tokens = 0
+    split = len(history)
+
+    for index in range(len(history) - 1, -1, -1):
+        message_tokens = estimate_message_tokens(history[index])
+        is_recent = len(history) - index <= min_recent_messages
+        if not is_recent and kept_tokens + message_tokens > budget_tokens:
+            break
+        kept_tokens += message_tokens
+        split = index
+
+    dropped = history[:split]
+    window = HistoryWindow(
+        messages=history[split:],
+        dropped=dropped,
+        kept_tokens=kept_tokens,
+        dropped_tokens=sum(estimate_message_tokens(message) for message in dropped)
+    )
+
+    if dropped:
+        logger.info(
+            f"History budget trimmed {len(dropped)} message(s) (~{window.dropped_tokens} tokens); "
+            f"kept {len(window.messages)} message(s) (~{kept_tokens} tokens) of budget {budget_tokens}"
+        )
+    return window
@@ -0,0 +1,120 @@
+"""
+Incremental rolling summaries of aged-out conversation history
+"""
+import hashlib
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+from langchain_core.messages import HumanMessage
+from com.mhire.app.services.providers.provider_registry import create_chat_model
+from com.mhire.app.services.ai_chat.ai_chat_schema import MessageHistory
+from com.mhire.app.utils.limiter.adaptive_limiter import gemini_limiter
+from com.mhire.app.utils.tracing.tracing import start_span
+from com.mhire.app.logger.logger import ChatEndpoint
+
+logger = ChatEndpoint.setup_chat_logger()
+
+
+def prefix_hashes(messages: List[MessageHistory]) -> List[str]:
+    """
+    Chained hashes of every history prefix
+
+    hashes[i] identifies messages[:i + 1], so two requests that share the same
+    older turns share the same prefix hashes.
+    """
+    hashes = []
+    digest = b""
+    for message in messages:
+        digest = hashlib.sha256(
+            digest + message.role.encode("utf-8") + b"\x00" + message.content.encode("utf-8")
+        ).digest()
+        hashes.append(digest.hex())
+    return hashes
+
+
+class HistorySummarizer:
+    """
+    Rolling summary of history that no longer fits the token budget
+
+    Summaries are cached by the hash of the prefix they cover. On the next turn
+    the longest cached prefix is reused and only the newly aged-out messages
+    are folded into it, so each turn costs one small summarization at most.
+    """
+
+    def __init__(self, cache_size: int = 512):
+        self.llm = create_chat_model(
+            "gemini-flash-lite-latest",
+            temperature=0.3
+        )
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        logger.info("History summarizer initialized")
+
+    def _lookup(self, hashes: List[str]) -> Tuple[int, str]:
+        """Find the longest prefix with a cached summary -> (covered_count, summary)"""
+        for index in range(len(hashes) - 1, -1, -1):
+            summary = self._cache.get(hashes[index])
+            if summary is not None:
+                self._cache.move_to_end(hashes[index])
+                return index + 1, summary
+        return 0, ""
+
+    def _store(self, key: str, summary: str):
+        self._cache[key] = summary
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def summarize(self, aged_out: List[MessageHistory]) -> Optional[str]:
+        """
+        Get a summary covering all aged-out messages
+
+        Args:
+            aged_out: Oldest messages dropped by the history budget, oldest first
+
+        Returns:
+            Summary text, or None if there is nothing to summarize or it failed
+        """
+        if not aged_out:
+            return None
+
+        hashes = prefix_hashes(aged_out)
+        covered, previous_summary = self._lookup(hashes)
+        if covered == len(aged_out):
+            logger.debug(f"History summary cache hit for {covered} message(s)")
+            return previous_summary
+
+        new_messages = aged_out[covered:]
+        logger.debug(
+            f"Extending history summary: {covered} message(s) cached, {len(new_messages)} new"
+        )
+
+        try:
+            transcript = "\n".join(
+                f"{message.role.capitalize()}: {message.content}" for message in new_messages
+            )
+            prompt = f"""Update the running summary of a health and habits conversation between a user and Sora, their supportive AI friend.
+
+Current summary:
+{previous_summary or "(none yet)"}
+
+New messages:
+{transcript}
+
+Write the updated summary in at most 5 short sentences. Keep the user's goals, struggles, substances or habits mentioned, any crisis signals, and advice already given. Respond with ONLY the summary."""
+
+            with start_span("llm.ainvoke", purpose="history_summary", prompt_chars=len(prompt),
+                            new_messages=len(new_messages), cached_prefix=covered):
+                response = await gemini_limiter.run(
+                    lambda: self.llm.ainvoke([HumanMessage(content=prompt)]),
+                    call_class="history_summary"
+                )
+            summary = response.content.strip() if hasattr(response, "content") else ""
+            if not summary:
+                return previous_summary or None
+
+            self._store(hashes[-1], summary)
+            return summary
+
+        except Exception as e:
+            logger.error(f"History summarization failed: {e}", exc_info=True)
+            return previous_summary or None
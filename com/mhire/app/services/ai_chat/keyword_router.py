@@ -0,0 +1,259 @@
+"""
+Compiled keyword router for RAG category detection
+
+All RAG trigger keywords are compiled once into an Aho-Corasick automaton so a
+query is scanned in a single linear pass, regardless of how many keywords or
+categories exist.
+
+Matching semantics:
+- Case-insensitive
+- A keyword must start at a word boundary
+- Keywords shorter than 5 characters must also end at a word boundary, so
+  "od", "na", "aa" and "mat" no longer fire inside words like "good",
+  "banana" or "matter". Their common inflections are compiled as extra
+  whole-word patterns ("ods", "oded", "oding", "helping", "helpful",
+  "coped", "aching", ...), so "I think I ODed" is still a crisis
+- Longer keywords may be followed by word characters, so "craving" still
+  matches "cravings" and "trigger" matches "triggering"; single words ending
+  in "e" also match their "-ing" form ("managing", "overdosing")
+"""
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+
+# RAG Trigger Keywords - Comprehensive keyword mapping for RAG activation
+RAG_TRIGGER_KEYWORDS = {
+    # CRISIS & EMERGENCY (Highest Priority)
+    "crisis": [
+        "crisis", "emergency", "suicide", "suicidal", "kill myself", "end my life",
+        "want to die", "self harm", "self-harm", "hurt myself", "overdose", "od",
+        "can't go on", "no point living", "better off dead", "ending it all", "SAMHSA", "samsha"
+    ],
+    # CRAVINGS & URGES
+    "cravings": [
+        "craving", "crave", "urge", "temptation", "want to use", "need to use",
+        "thinking about using", "struggling not to", "hard not to", "can't resist",
+        "giving in", "slip up"
+    ],
+    # RELAPSE & STRUGGLES
+    "relapse": [
+        "relapse", "relapsed", "used again", "fell off", "slipped", "messed up",
+        "failed", "broke my streak", "gave in", "couldn't stop", "lost control"
+    ],
+    # TRIGGERS & DIFFICULT SITUATIONS
+    "triggers": [
+        "trigger", "triggered", "tempting situation", "high risk", "around people who",
+        "at a party", "stressful", "overwhelmed", "anxious", "depressed", "lonely",
+        "angry", "tired", "hungry"
+    ],
+    # WITHDRAWAL & SYMPTOMS
+    "withdrawal": [
+        "withdrawal", "withdrawing", "detox", "shakes", "sweating", "nausea", "sick",
+        "symptoms", "coming off", "quitting cold turkey"
+    ],
+    # HELP & RESOURCES
+    "help": [
+        "help", "need help", "where can i", "how do i get", "looking for", "find",
+        "resource", "support", "program", "treatment", "therapy", "counseling",
+        "hotline", "helpline", "crisis line", "call"
+    ],
+    # MEDICATION & TREATMENT
+    "medication": [
+        "medication", "medicine", "prescription", "drug", "treatment", "mat",
+        "medication assisted", "buprenorphine", "naltrexone", "naloxone", "narcan",
+        "methadone", "suboxone", "acamprosate", "disulfiram", "antabuse", "varenicline",
+        "chantix", "bupropion", "wellbutrin", "nicotine patch", "nicotine gum"
+    ],
+    # SPECIFIC SUBSTANCES
+    "substances": [
+        "alcohol", "drinking", "drunk", "beer", "wine", "liquor", "vodka", "opioid",
+        "heroin", "fentanyl", "oxy", "oxycodone", "percocet", "vicodin", "pills",
+        "painkillers", "cocaine", "coke", "crack", "meth", "methamphetamine", "speed",
+        "marijuana", "weed", "cannabis", "tobacco", "cigarette", "smoking", "vaping",
+        "nicotine", "soda", "junk food", "fast food", "sugar", "caffeine"
+    ],
+    # COPING TECHNIQUES
+    "coping": [
+        "cope", "coping", "deal with", "handle", "manage", "technique", "strategy",
+        "method", "tip", "advice", "what should i do", "how do i", "grounding",
+        "breathing", "mindfulness", "meditation", "distraction", "urge surfing",
+        "halt", "deads"
+    ],
+    # RECOVERY & SOBRIETY
+    "recovery": [
+        "recovery", "recovering", "sober", "sobriety", "clean", "abstinence", "quit",
+        "quitting", "stop", "stopping", "rehab", "rehabilitation", "aa", "na",
+        "12 step", "alcoholics anonymous", "narcotics anonymous", "support group"
+    ],
+    # HARM REDUCTION
+    "harm_reduction": [
+        "harm reduction", "safer use", "overdose prevention", "needle exchange",
+        "syringe", "test strips", "fentanyl test", "good samaritan", "safe injection",
+        "reduce harm"
+    ],
+    # MENTAL HEALTH
+    "mental_health": [
+        "depressed", "depression", "anxiety", "anxious", "panic", "ptsd", "trauma",
+        "bipolar", "mental health", "therapy", "psychiatrist", "psychologist", "counselor"
+    ],
+    # PHYSICAL SYMPTOMS
+    "physical": [
+        "sleep", "insomnia", "can't sleep", "tired", "exhausted", "appetite", "weight",
+        "pain", "ache", "headache", "stomach"
+    ]
+}
+
+
+# Priority order for category matching (index 0 = highest priority)
+CATEGORY_PRIORITY = [
+    "crisis",
+    "cravings",
+    "relapse",
+    "triggers",
+    "withdrawal",
+    "help",
+    "medication",
+    "substances",
+    "coping",
+    "recovery",
+    "harm_reduction",
+    "mental_health",
+    "physical"
+]
+
+# Keywords shorter than this must match a whole word (or one of its inflections)
+MIN_PREFIX_MATCH_LENGTH = 5
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum()
+
+
+def _inflections(keyword: str) -> List[str]:
+    """
+    Extra patterns a keyword should also match
+
+    Short keywords match whole words only, so their inflected forms are listed
+    explicitly: -s, -es (after sibilants), -d/-ed, -ing (dropping a final "e")
+    and -ful. An apostrophe already ends a word, so "od'd" needs no variant.
+    Longer single words ending in "e" get their "-ing" form, which a prefix
+    match cannot reach ("manage" -> "managing").
+    """
+    if not keyword[-1].isalpha():
+        return []
+    if len(keyword) >= MIN_PREFIX_MATCH_LENGTH:
+        return [keyword[:-1] + "ing"] if keyword.endswith("e") and " " not in keyword else []
+    forms = [keyword + "s", keyword + "ful"]
+    if keyword.endswith(("s", "x", "z", "ch", "sh")):
+        forms.append(keyword + "es")
+    if keyword.endswith("e"):
+        forms += [keyword + "d", keyword[:-1] + "ing"]
+    else:
+        forms += [keyword + "ed", keyword + "ing"]
+    return forms
+
+
+class KeywordRouter:
+    """Aho-Corasick matcher returning the highest-priority matching category"""
+    
+    def __init__(self, keywords: Dict[str, List[str]], priority_order: List[str]):
+        """
+        Compile keywords into the automaton
+        
+        Args:
+            keywords: Mapping of category -> trigger keywords
+            priority_order: Categories from highest to lowest priority
+        """
+        self.priority_order = list(priority_order)
+        
+        # Each pattern keeps the best (lowest) priority among the categories listing it,
+        # and must match a whole word unless some keyword allows it as a prefix
+        patterns: Dict[str, int] = {}
+        whole_words: Dict[str, bool] = {}
+        for priority, category in enumerate(self.priority_order):
+            for keyword in keywords.get(category, []):
+                keyword = keyword.lower().strip()
+                if not keyword:
+                    continue
+                whole_word = len(keyword) < MIN_PREFIX_MATCH_LENGTH
+                for pattern in [keyword] + _inflections(keyword):
+                    if priority < patterns.get(pattern, len(self.priority_order)):
+                        patterns[pattern] = priority
+                    whole_words[pattern] = whole_words.get(pattern, True) and whole_word
+        
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Per state: (keyword length, priority, whole-word required)
+        self._outputs: List[List[Tuple[int, int, bool]]] = [[]]
+        
+        for keyword, priority in patterns.items():
+            self._add_pattern(keyword, priority, whole_words[keyword])
+        self._build_fail_links()
+        self.pattern_count = len(patterns)
+    
+    def _add_pattern(self, keyword: str, priority: int, whole_word: bool):
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+        self._outputs[state].append((len(keyword), priority, whole_word))
+    
+    def _build_fail_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                if self._fail[next_state] == next_state:
+                    self._fail[next_state] = 0
+                self._outputs[next_state].extend(self._outputs[self._fail[next_state]])
+    
+    @staticmethod
+    def _ends_at_boundary(text: str, end: int) -> bool:
+        # Plurals and other inflections are compiled as their own patterns
+        return end >= len(text) or not _is_word_char(text[end])
+    
+    def route(self, query: str) -> Optional[str]:
+        """
+        Find the highest-priority category whose keywords appear in the query
+        
+        Args:
+            query: User's query text
+            
+        Returns:
+            Category name, or None if no keyword matched
+        """
+        text = query.lower()
+        best = len(self.priority_order)
+        state = 0
+        
+        for i, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            
+            for length, priority, whole_word in self._outputs[state]:
+                if priority >= best:
+                    continue
+                start = i - length + 1
+                if start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if whole_word and not self._ends_at_boundary(text, i + 1):
+                    continue
+                best = priority
+                if best == 0:
+                    return self.priority_order[0]
+        
+        if best < len(self.priority_order):
+            return self.priority_order[best]
+        return None
@@ -0,0 +1,153 @@
+"""
+Latency-aware model tier routing for chat generation
+"""
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Tuple
+from com.mhire.app.logger.logger import ChatEndpoint
+
+logger = ChatEndpoint.setup_chat_logger()
+
+
+@dataclass
+class ModelTier:
+    """
+    A chat model plus its recent health (latency and error rate)
+
+    Outcomes older than `window_seconds` are dropped, so a tier that stopped
+    receiving traffic after going over budget falls back under `min_samples`
+    and is treated as healthy again instead of staying downgraded forever.
+    """
+    name: str
+    model: str
+    llm: Any
+    window_size: int = 100
+    window_seconds: float = 60.0
+    _outcomes: deque = field(default_factory=deque)
+
+    def record(self, latency: float, ok: bool):
+        self._outcomes.append((time.monotonic(), latency, ok))
+        while len(self._outcomes) > self.window_size:
+            self._outcomes.popleft()
+
+    def _recent(self) -> deque:
+        cutoff = time.monotonic() - self.window_seconds
+        while self._outcomes and self._outcomes[0][0] < cutoff:
+            self._outcomes.popleft()
+        return self._outcomes
+
+    @property
+    def sample_count(self) -> int:
+        return len(self._recent())
+
+    @property
+    def error_rate(self) -> float:
+        outcomes = self._recent()
+        if not outcomes:
+            return 0.0
+        return sum(1 for _, _, ok in outcomes if not ok) / len(outcomes)
+
+    @property
+    def p90_latency(self) -> float:
+        latencies = sorted(latency for _, latency, ok in self._recent() if ok)
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(0.9 * len(latencies)))]
+
+    def is_healthy(self, latency_slo_seconds: float, max_error_rate: float, min_samples: int = 10) -> bool:
+        if self.sample_count < min_samples:
+            return True
+        return self.error_rate <= max_error_rate and self.p90_latency <= latency_slo_seconds
+
+
+class ModelRouter:
+    """
+    Pick the generation tier for each chat turn
+
+    Rules, in order:
+    1. Small talk ("general" category) with a short history goes to the lite tier
+    2. Everything else goes to the full tier
+    3. If the chosen tier is over its latency SLO or error budget and the
+       other tier is healthy, switch (crisis turns never leave the full tier).
+       Tier health only covers the last `window_seconds`, so a switch lasts
+       until the bad outcomes age out rather than for good
+
+    Every decision is counted by (tier, reason) so the cost of the full model
+    can be measured.
+    """
+
+    def __init__(
+        self,
+        full: ModelTier,
+        lite: ModelTier,
+        enabled: bool = True,
+        lite_max_history: int = 6,
+        latency_slo_seconds: float = 6.0,
+        max_error_rate: float = 0.2
+    ):
+        self.full = full
+        self.lite = lite
+        self.enabled = enabled
+        self.lite_max_history = lite_max_history
+        self.latency_slo_seconds = latency_slo_seconds
+        self.max_error_rate = max_error_rate
+        self.decisions: Counter = Counter()
+
+    def _healthy(self, tier: ModelTier) -> bool:
+        return tier.is_healthy(self.latency_slo_seconds, self.max_error_rate)
+
+    def choose(self, category: str, history_length: int) -> Tuple[ModelTier, str]:
+        """
+        Args:
+            category: Route category from _determine_category
+            history_length: Number of history messages in the request
+
+        Returns:
+            Tuple of (tier, reason)
+        """
+        if not self.enabled:
+            tier, reason = self.full, "tiering_disabled"
+        elif category == "crisis":
+            tier, reason = self.full, "crisis"
+        elif category == "general" and history_length <= self.lite_max_history:
+            tier, reason = self.lite, "small_talk"
+            if not self._healthy(self.lite) and self._healthy(self.full):
+                tier, reason = self.full, "lite_over_budget"
+        else:
+            tier, reason = self.full, "rag_or_long_history"
+            if not self._healthy(self.full) and self._healthy(self.lite):
+                tier, reason = self.lite, "full_over_budget"
+
+        self.decisions[(tier.name, reason)] += 1
+        logger.info(
+            f"Model route: tier={tier.name} model={tier.model} reason={reason} "
+            f"category={category} history={history_length}"
+        )
+        return tier, reason
+
+    async def invoke(self, tier: ModelTier, func: Callable[[Any], Awaitable[Any]]) -> Any:
+        """Call func(tier.llm) and record its latency and outcome against the tier"""
+        start = time.monotonic()
+        try:
+            result = await func(tier.llm)
+        except Exception:
+            tier.record(time.monotonic() - start, ok=False)
+            raise
+        tier.record(time.monotonic() - start, ok=True)
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "decisions": {f"{tier}:{reason}": count for (tier, reason), count in self.decisions.items()},
+            "tiers": {
+                tier.name: {
+                    "model": tier.model,
+                    "error_rate": round(tier.error_rate, 3),
+                    "p90_latency_seconds": round(tier.p90_latency, 3),
+                    "samples": tier.sample_count,
+                }
+                for tier in (self.full, self.lite)
+            },
+        }
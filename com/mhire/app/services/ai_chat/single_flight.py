@@ -0,0 +1,101 @@
+"""
+Single-flight deduplication of identical in-flight chat requests
+"""
+import asyncio
+import hashlib
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple
+from com.mhire.app.services.ai_chat.ai_chat_schema import AIChatRequest
+from com.mhire.app.logger.logger import ChatEndpoint
+
+logger = ChatEndpoint.setup_chat_logger()
+
+
+def chat_request_key(request: AIChatRequest) -> str:
+    """Canonical hash of the query and history of a chat request"""
+    payload = json.dumps(
+        {
+            "query": request.query,
+            "history": [[message.role, message.content] for message in request.history or []]
+        },
+        ensure_ascii=False,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls with the same key into one execution
+
+    Concurrent duplicates await the same task. Successful results are also
+    held for `result_ttl_seconds` so retries arriving just after completion
+    are answered without recomputing. Failures are never held.
+    """
+
+    def __init__(self, result_ttl_seconds: float = 2.0):
+        self.result_ttl_seconds = result_ttl_seconds
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._completed: Dict[str, Tuple[float, Any]] = {}
+        self.executions = 0
+        self.shared_hits = 0
+        self.held_hits = 0
+
+    def _get_held(self, key: str):
+        entry = self._completed.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if time.monotonic() > expires_at:
+            del self._completed[key]
+            return None
+        return entry
+
+    def _on_done(self, key: str, task: asyncio.Task):
+        self._in_flight.pop(key, None)
+        if task.cancelled() or task.exception() is not None or self.result_ttl_seconds <= 0:
+            return
+        self._completed[key] = (time.monotonic() + self.result_ttl_seconds, task.result())
+        # Prune expired results so the map stays bounded by recent traffic
+        now = time.monotonic()
+        for expired_key in [k for k, (expires_at, _) in self._completed.items() if expires_at < now]:
+            del self._completed[expired_key]
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run func once per key among concurrent callers
+
+        Args:
+            key: Deduplication key (see chat_request_key)
+            func: Zero-argument coroutine factory doing the actual work
+
+        Returns:
+            The shared result
+        """
+        held = self._get_held(key)
+        if held is not None:
+            self.held_hits += 1
+            logger.info(f"Single-flight: answered duplicate from recent result ({key[:12]})")
+            return held[1]
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.shared_hits += 1
+            logger.info(f"Single-flight: joined in-flight request ({key[:12]})")
+        else:
+            self.executions += 1
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done, k=key: self._on_done(k, done))
+
+        # Shield so one caller disconnecting doesn't cancel the work for the others
+        return await asyncio.shield(task)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "executions": self.executions,
+            "shared_hits": self.shared_hits,
+            "held_hits": self.held_hits,
+            "in_flight": len(self._in_flight),
+        }
@@ -0,0 +1,95 @@
+import asyncio
+import time
+from typing import Literal, Optional
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse
+from com.mhire.app.config.config import Config
+from com.mhire.app.utils.profiling.sampler import StackSampler
+from com.mhire.app.utils.profiling.request_profiler import (
+    ProfilerBusyError,
+    profiling_slot,
+    resolve_profile_path,
+    verify_admin_token
+)
+from com.mhire.app.logger.logger import ChatEndpoint
+
+logger = ChatEndpoint.setup_router_logger()
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+config = Config()
+
+
+def require_admin(x_admin_token: Optional[str]):
+    """404 when admin endpoints are disabled (no ADMIN_TOKEN), 403 on a bad token"""
+    if not config.ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not verify_admin_token(x_admin_token):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+@router.post("/profile")
+async def profile_worker(
+    seconds: float = Query(default=10.0, gt=0),
+    mode: Literal["wall", "cpu"] = "wall",
+    format: Literal["collapsed", "speedscope"] = "speedscope",
+    interval_ms: float = Query(default=5.0, ge=1.0, le=1000.0),
+    x_admin_token: Optional[str] = Header(default=None)
+):
+    """
+    Sample this worker's stacks for N seconds (admin only)
+
+    Parameters:
+    - seconds: Sampling duration, capped by PROFILE_MAX_SECONDS
+    - mode: "wall" (all threads plus suspended asyncio task stacks) or "cpu" (running frames only)
+    - format: "speedscope" (JSON for speedscope.app) or "collapsed" (flamegraph.pl input)
+    - interval_ms: Time between samples
+    - X-Admin-Token header: must match ADMIN_TOKEN
+
+    The worker keeps serving requests while it is sampled. With several
+    uvicorn workers, the request lands on one of them; repeat to cover others.
+    """
+    require_admin(x_admin_token)
+    duration = min(seconds, config.PROFILE_MAX_SECONDS)
+    logger.info(f"Profiling worker for {duration}s (mode={mode}, interval={interval_ms}ms)")
+
+    try:
+        with profiling_slot():
+            sampler = StackSampler(
+                interval_seconds=interval_ms / 1000,
+                mode=mode,
+                loop=asyncio.get_running_loop()
+            )
+            # Sample from a thread so the event loop (and its tasks) keep running
+            await asyncio.to_thread(sampler.run, duration)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    logger.info(f"Profiling finished: {sampler.sample_count} ticks, {len(sampler.samples)} unique stacks")
+    filename = f"profile-{time.strftime('%Y%m%dT%H%M%S')}-{mode}"
+    if format == "collapsed":
+        return PlainTextResponse(
+            sampler.to_collapsed(),
+            headers={"Content-Disposition": f'attachment; filename="{filename}.collapsed.txt"'}
+        )
+    return JSONResponse(
+        sampler.to_speedscope(),
+        headers={"Content-Disposition": f'attachment; filename="{filename}.speedscope.json"'}
+    )
+
+
+@router.get("/profiles/{profile_id}")
+async def download_request_profile(
+    profile_id: str,
+    x_admin_token: Optional[str] = Header(default=None)
+):
+    """
+    Download a per-request cProfile capture (admin only)
+
+    The id comes from the X-Profile-Id response header of a request sent with
+    `X-Profile: cprofile`. Open it with pstats or snakeviz.
+    """
+    require_admin(x_admin_token)
+    path = resolve_profile_path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/octet-stream", filename=profile_id)
@@ -0,0 +1,121 @@
+"""
+Provider registry: builds chat models and embeddings for the configured backend
+"""
+from typing import Any, Callable, Dict
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from com.mhire.app.config.config import Config
+from com.mhire.app.logger.logger import ChatEndpoint
+
+logger = ChatEndpoint.setup_chat_logger()
+
+ChatModelFactory = Callable[..., BaseChatModel]
+EmbeddingsFactory = Callable[[str], Embeddings]
+
+_chat_providers: Dict[str, ChatModelFactory] = {}
+_embedding_providers: Dict[str, EmbeddingsFactory] = {}
+
+
+def register_chat_provider(name: str, factory: ChatModelFactory):
+    """Register factory(model, temperature, **kwargs) -> chat model under a provider name"""
+    _chat_providers[name] = factory
+
+
+def register_embedding_provider(name: str, factory: EmbeddingsFactory):
+    """Register factory(model) -> embeddings under a provider name"""
+    _embedding_providers[name] = factory
+
+
+def _lookup(registry: Dict[str, Callable], name: str, kind: str) -> Callable:
+    factory = registry.get(name)
+    if factory is None:
+        raise ValueError(f"Unknown {kind} provider '{name}'. Available: {', '.join(sorted(registry))}")
+    return factory
+
+
+def create_chat_model(model: str, temperature: float = 0.7, **kwargs: Any) -> BaseChatModel:
+    """
+    Build a chat model on the configured LLM_PROVIDER
+
+    Args:
+        model: Model name (e.g. "gemini-2.5-flash"); stub providers only label with it
+        temperature: Sampling temperature
+        **kwargs: Provider-specific options, ignored by providers that don't use them
+
+    Returns:
+        A LangChain chat model (supports ainvoke, astream and prompt chaining)
+    """
+    provider = Config().LLM_PROVIDER
+    logger.info(f"Creating chat model: provider={provider} model={model}")
+    return _lookup(_chat_providers, provider, "LLM")(model, temperature, **kwargs)
+
+
+def create_embeddings(model: str = "models/embedding-001") -> Embeddings:
+    """Build embeddings on the configured EMBEDDING_PROVIDER"""
+    provider = Config().EMBEDDING_PROVIDER
+    logger.info(f"Creating embeddings: provider={provider} model={model}")
+    return _lookup(_embedding_providers, provider, "embedding")(model)
+
+
+def embedding_namespace(model: str) -> str:
+    """
+    Cache namespace for query embeddings
+
+    Gemini keeps the bare model name so existing on-disk caches stay valid;
+    other providers are prefixed so their vectors never mix with Gemini's.
+    """
+    provider = Config().EMBEDDING_PROVIDER
+    return model if provider == "gemini" else f"{provider}:{model}"
+
+
+def get_provider_info() -> Dict[str, str]:
+    config = Config()
+    return {"llm": config.LLM_PROVIDER, "embeddings": config.EMBEDDING_PROVIDER}
+
+
+def _gemini_chat(model: str, temperature: float, **kwargs: Any) -> BaseChatModel:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    return ChatGoogleGenerativeAI(
+        model=model,
+        google_api_key=Config().GEMINI_API_KEY,
+        temperature=temperature,
+        **kwargs
+    )
+
+
+def _gemini_embeddings(model: str) -> Embeddings:
+    from langchain_google_genai import GoogleGenerativeAIEmbeddings
+    return GoogleGenerativeAIEmbeddings(
+        model=model,
+        google_api_key=Config().GEMINI_API_KEY
+    )
+
+
+def _stub_chat(model: str, temperature: float, **kwargs: Any) -> BaseChatModel:
+    from com.mhire.app.services.providers.stub_provider import StubChatModel
+    config = Config()
+    return StubChatModel(
+        model_name=model,
+        latency_p50_ms=config.STUB_LLM_LATENCY_P50_MS,
+        latency_p99_ms=config.STUB_LLM_LATENCY_P99_MS,
+        error_rate=config.STUB_LLM_ERROR_RATE,
+        seed=config.STUB_SEED
+    )
+
+
+def _stub_embeddings(model: str) -> Embeddings:
+    from com.mhire.app.services.providers.stub_provider import StubEmbeddings, read_index_dimension
+    config = Config()
+    return StubEmbeddings(
+        dimension=config.STUB_EMBEDDING_DIM or read_index_dimension(),
+        latency_p50_ms=config.STUB_EMBEDDING_LATENCY_P50_MS,
+        latency_p99_ms=config.STUB_EMBEDDING_LATENCY_P99_MS,
+        error_rate=config.STUB_EMBEDDING_ERROR_RATE,
+        seed=config.STUB_SEED
+    )
+
+
+register_chat_provider("gemini", _gemini_chat)
+register_chat_provider("stub", _stub_chat)
+register_embedding_provider("gemini", _gemini_embeddings)
+register_embedding_provider("stub", _stub_embeddings)
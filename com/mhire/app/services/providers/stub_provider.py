@@ -0,0 +1,228 @@
+"""
+Offline stub LLM and embeddings for load testing without Gemini quota
+"""
+import asyncio
+import hashlib
+import math
+import random
+import re
+import struct
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Iterator, List, Optional
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+from com.mhire.app.logger.logger import ChatEndpoint
+
+logger = ChatEndpoint.setup_chat_logger()
+
+FAISS_INDEX_FILE = (
+    Path(__file__).resolve().parent.parent.parent / "data/vector_db/faiss_index/index.faiss"
+)
+DEFAULT_EMBEDDING_DIM = 768
+
+# Z-score of the 99th percentile of a standard normal distribution
+_Z_P99 = 2.3263
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+
+CANNED_RESPONSES = (
+    "That sounds like a lot to carry. Small, steady steps tend to work better than big changes "
+    "all at once, so it might help to pick one thing you can try this week and see how it feels.",
+    "Thanks for sharing that with me. A good place to start is noticing when it happens most - "
+    "time of day, place, or mood - because those patterns usually point to the easiest change to make.",
+    "You're already doing something important by thinking this through. If you'd like, we can break "
+    "it into a simple plan with one goal, one obstacle you expect, and one way to handle it.",
+    "It's completely understandable to feel that way. Be patient with yourself - progress is rarely a "
+    "straight line, and a setback is information rather than failure.",
+)
+
+
+class StubProviderError(RuntimeError):
+    """Injected failure from the stub provider"""
+
+
+def read_index_dimension(index_file: Path = FAISS_INDEX_FILE) -> int:
+    """
+    Read the vector dimension from a FAISS index header without loading faiss
+
+    Every FAISS index file starts with a 4-byte type code followed by the
+    dimension as an int32. Falls back to 768 (models/embedding-001).
+    """
+    try:
+        with open(index_file, "rb") as f:
+            header = f.read(8)
+        if len(header) == 8:
+            return struct.unpack("<i", header[4:8])[0]
+    except OSError as e:
+        logger.warning(f"Could not read FAISS index header at {index_file}: {e}")
+    return DEFAULT_EMBEDDING_DIM
+
+
+class LatencyModel:
+    """
+    Log-normal latency described by its median and 99th percentile
+
+    A seeded RNG keeps runs reproducible. p99 <= p50 gives a constant latency.
+    """
+
+    def __init__(self, p50_ms: float, p99_ms: float, error_rate: float = 0.0, seed: int = 0):
+        self.p50_ms = max(0.0, p50_ms)
+        self.sigma = math.log(p99_ms / p50_ms) / _Z_P99 if p50_ms > 0 and p99_ms > p50_ms else 0.0
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+
+    def sample_seconds(self) -> float:
+        if self.p50_ms <= 0:
+            return 0.0
+        return self._rng.lognormvariate(math.log(self.p50_ms), self.sigma) / 1000
+
+    def should_fail(self) -> bool:
+        return self.error_rate > 0 and self._rng.random() < self.error_rate
+
+
+def _message_text(messages: List[BaseMessage]) -> str:
+    return "\n".join(m.content if isinstance(m.content, str) else str(m.content) for m in messages)
+
+
+class StubChatModel(BaseChatModel):
+    """
+    Chat model that returns a canned reply chosen by a hash of the prompt
+
+    The same prompt always gets the same reply. Latency and failures follow
+    the configured LatencyModel; streaming spends 40% of the sampled latency
+    before the first chunk and spreads the rest across the words.
+    """
+
+    model_name: str = "stub"
+    latency_p50_ms: float = 800.0
+    latency_p99_ms: float = 3000.0
+    error_rate: float = 0.0
+    seed: int = 0
+
+    _latency: LatencyModel = PrivateAttr()
+
+    def __init__(self, **data: Any):
+        super().__init__(**data)
+        self._latency = LatencyModel(self.latency_p50_ms, self.latency_p99_ms, self.error_rate, self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub-chat"
+
+    def _reply(self, messages: List[BaseMessage]) -> str:
+        digest = hashlib.sha256(_message_text(messages).encode("utf-8")).digest()
+        return CANNED_RESPONSES[digest[0] % len(CANNED_RESPONSES)]
+
+    def _maybe_fail(self):
+        if self._latency.should_fail():
+            raise StubProviderError(f"503 Service Unavailable (stub {self.model_name}: injected failure)")
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        time.sleep(self._latency.sample_seconds())
+        self._maybe_fail()
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self._reply(messages)))])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        await asyncio.sleep(self._latency.sample_seconds())
+        self._maybe_fail()
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self._reply(messages)))])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        words = self._reply(messages).split(" ")
+        latency = self._latency.sample_seconds()
+        time.sleep(latency * 0.4)
+        self._maybe_fail()
+        for index, word in enumerate(words):
+            if index:
+                time.sleep(latency * 0.6 / len(words))
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word if index == 0 else " " + word))
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        words = self._reply(messages).split(" ")
+        latency = self._latency.sample_seconds()
+        await asyncio.sleep(latency * 0.4)
+        self._maybe_fail()
+        for index, word in enumerate(words):
+            if index:
+                await asyncio.sleep(latency * 0.6 / len(words))
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word if index == 0 else " " + word))
+
+
+class StubEmbeddings(Embeddings):
+    """
+    Deterministic hashed bag-of-words embeddings
+
+    Each token is hashed to a signed bucket of a `dimension`-sized vector and
+    the result is L2-normalized, so texts sharing words land close together
+    and FAISS searches over the stubbed index return plausible neighbours.
+    One batch call pays one sampled latency, like the real API.
+    """
+
+    def __init__(
+        self,
+        dimension: int = DEFAULT_EMBEDDING_DIM,
+        latency_p50_ms: float = 60.0,
+        latency_p99_ms: float = 250.0,
+        error_rate: float = 0.0,
+        seed: int = 0
+    ):
+        self.dimension = dimension
+        self._latency = LatencyModel(latency_p50_ms, latency_p99_ms, error_rate, seed)
+
+    def _vector(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimension
+        tokens = _TOKEN_PATTERN.findall(text.lower()) or [text]
+        for token in tokens:
+            bucket = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+            vector[bucket % self.dimension] += 1.0 if (bucket >> 63) & 1 else -1.0
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [value / norm for value in vector]
+
+    def _maybe_fail(self):
+        if self._latency.should_fail():
+            raise StubProviderError("503 Service Unavailable (stub embeddings: injected failure)")
+
+    def embed_documents(self, texts: List[str], **kwargs: Any) -> List[List[float]]:
+        time.sleep(self._latency.sample_seconds())
+        self._maybe_fail()
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text: str, **kwargs: Any) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str], **kwargs: Any) -> List[List[float]]:
+        await asyncio.sleep(self._latency.sample_seconds())
+        self._maybe_fail()
+        return [self._vector(text) for text in texts]
+
+    async def aembed_query(self, text: str, **kwargs: Any) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
@@ -1,13 +1,139 @@
 """
-Embedding generation using Google Gemini
+Embedding generation using the configured provider (Google Gemini by default)
 """
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
+import asyncio
+from typing import Dict, List, Optional, Set
+from langchain_core.embeddings import Embeddings
 from com.mhire.app.config.config import Config
+from com.mhire.app.services.rag.embedding_cache import CachedEmbeddings
+from com.mhire.app.services.providers.provider_registry import create_embeddings, embedding_namespace
+from com.mhire.app.utils.limiter.adaptive_limiter import gemini_limiter
+from com.mhire.app.utils.resilience.circuit_breaker import embedding_breaker
 from com.mhire.app.logger.logger import ChatEndpoint
 
 logger = ChatEndpoint.setup_chat_logger()
 
 
+class RateLimitedEmbeddings(Embeddings):
+    """Routes async embedding calls through the embedding breaker and shared Gemini limiter"""
+    
+    def __init__(self, embeddings: Embeddings):
+        self.embeddings = embeddings
+    
+    async def aembed_query(self, text: str) -> List[float]:
+        return await embedding_breaker.call(
+            lambda: gemini_limiter.run(lambda: self.embeddings.aembed_query(text), call_class="embedding")
+        )
+    
+    async def aembed_documents(self, texts: List[str], **kwargs) -> List[List[float]]:
+        return await embedding_breaker.call(
+            lambda: gemini_limiter.run(
+                lambda: self.embeddings.aembed_documents(texts, **kwargs),
+                call_class="embedding"
+            )
+        )
+    
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+
+
+class EmbeddingCoalescer(Embeddings):
+    """
+    Micro-batches concurrent aembed_query calls into one embed_documents request
+    
+    Texts arriving within `window_ms` of the first pending text (or until
+    `max_batch_size` texts are queued) are sent as a single batched call and
+    the vectors are fanned back out to the waiting callers. Sync calls are
+    passed straight through.
+    """
+    
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        window_ms: float = 5,
+        max_batch_size: int = 32,
+        batch_kwargs: Optional[Dict] = None
+    ):
+        """
+        Args:
+            embeddings: Underlying embeddings client
+            window_ms: How long to wait for more texts after the first one arrives
+            max_batch_size: Flush immediately once this many texts are queued
+            batch_kwargs: Extra kwargs for aembed_documents (e.g. the query task type)
+        """
+        self.embeddings = embeddings
+        self.window_s = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.batch_kwargs = batch_kwargs or {}
+        
+        self._pending: List[tuple[str, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # The loop only holds weak references to tasks; keep in-flight flushes alive
+        self._flush_tasks: Set[asyncio.Task] = set()
+        self.batches_sent = 0
+        self.texts_embedded = 0
+    
+    async def aembed_query(self, text: str) -> List[float]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+        
+        if len(self._pending) >= self.max_batch_size:
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+            self._on_window_closed(loop)
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window_s, self._on_window_closed, loop)
+        
+        return await future
+    
+    def _on_window_closed(self, loop: asyncio.AbstractEventLoop):
+        self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = loop.create_task(self._flush(batch))
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+    
+    async def _flush(self, batch: List[tuple[str, asyncio.Future]]):
+        # Identical texts in the same window share one slot in the request
+        unique_texts = list(dict.fromkeys(text for text, _ in batch))
+        try:
+            vectors = await self.embeddings.aembed_documents(unique_texts, **self.batch_kwargs)
+            self.batches_sent += 1
+            self.texts_embedded += len(unique_texts)
+            logger.debug(f"Coalesced {len(batch)} embedding requests into one batch of {len(unique_texts)}")
+            by_text = dict(zip(unique_texts, vectors))
+            for text, future in batch:
+                if not future.done():
+                    future.set_result(by_text[text])
+        except Exception as e:
+            logger.error(f"Batched embedding request failed: {e}", exc_info=True)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+    
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+    
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self.embeddings.aembed_documents(texts)
+    
+    def get_stats(self) -> Dict[str, float]:
+        """Get how many batched requests were sent and how many texts they carried"""
+        return {
+            "batches_sent": self.batches_sent,
+            "texts_embedded": self.texts_embedded,
+            "avg_batch_size": round(self.texts_embedded / self.batches_sent, 2) if self.batches_sent else 0.0,
+        }
+
+
 class EmbeddingService:
     _instance = None
     
@@ -23,9 +149,24 @@ class EmbeddingService:
             
         try:
             config = Config()
-            self.embeddings = GoogleGenerativeAIEmbeddings(
-                model="models/embedding-001",
-                google_api_key=config.GEMINI_API_KEY
+            model = "models/embedding-001"
+            base_embeddings = RateLimitedEmbeddings(create_embeddings(model))
+            self.coalescer = None
+            if config.EMBEDDING_BATCH_WINDOW_MS > 0:
+                base_embeddings = self.coalescer = EmbeddingCoalescer(
+                    base_embeddings,
+                    window_ms=config.EMBEDDING_BATCH_WINDOW_MS,
+                    max_batch_size=config.EMBEDDING_BATCH_MAX_SIZE,
+                    # Keep batched vectors identical to embed_query output
+                    batch_kwargs={"task_type": "RETRIEVAL_QUERY"}
+                )
+            self.embeddings = CachedEmbeddings(
+                base_embeddings,
+                namespace=embedding_namespace(model),
+                max_size=config.EMBEDDING_CACHE_SIZE,
+                ttl_seconds=config.EMBEDDING_CACHE_TTL_SECONDS,
+                db_path=config.EMBEDDING_CACHE_DB_PATH or None,
+                db_max_rows=config.EMBEDDING_CACHE_DB_MAX_ROWS
             )
             self._initialized = True
             logger.info("Embedding service initialized successfully")
@@ -35,4 +176,23 @@ class EmbeddingService:
     
     def get_embeddings(self):
         """Get the embeddings instance"""
-        return self.embeddings
\ No newline at end of file
+        return self.embeddings
+    
+    def get_cache_stats(self):
+        """Get query embedding cache hit/miss counters"""
+        return self.embeddings.get_stats()
+    
+    def get_stats(self) -> Dict[str, Optional[Dict]]:
+        """Get cache and coalescer counters (coalescer is None when batching is disabled)"""
+        return {
+            "cache": self.get_cache_stats(),
+            "coalescer": self.coalescer.get_stats() if self.coalescer is not None else None,
+        }
+
+
+def get_embedding_stats() -> Optional[Dict[str, Optional[Dict]]]:
+    """Embedding counters for /health, or None before the embedding service has been created"""
+    service = EmbeddingService._instance
+    if service is None or not service._initialized:
+        return None
+    return service.get_stats()
@@ -0,0 +1,221 @@
+"""
+LRU + TTL cache for query embeddings with an optional SQLite tier
+"""
+import asyncio
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+from langchain_core.embeddings import Embeddings
+from com.mhire.app.utils.metrics.stage_timer import record_cache_lookup
+from com.mhire.app.logger.logger import ChatEndpoint
+
+logger = ChatEndpoint.setup_chat_logger()
+
+
+def normalize_text(text: str) -> str:
+    """Normalize query text so trivially different spellings share a cache entry"""
+    return re.sub(r"\s+", " ", text.strip().lower())
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that caches query vectors
+
+    Lookups go memory LRU -> SQLite (if configured) -> remote embeddings.
+    Only queries are cached; embed_documents is passed through because
+    document embeddings use a different task type and are only computed
+    while building the index.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        namespace: str,
+        max_size: int = 1024,
+        ttl_seconds: float = 3600,
+        db_path: Optional[str] = None,
+        db_max_rows: int = 100_000,
+        db_prune_every: int = 500
+    ):
+        """
+        Args:
+            embeddings: Underlying embeddings client
+            namespace: Model identifier mixed into the cache key
+            max_size: Maximum number of vectors held in memory
+            ttl_seconds: Entry lifetime in both tiers
+            db_path: SQLite file for the on-disk tier, or None to disable it
+            db_max_rows: Maximum rows kept on disk; the oldest are deleted beyond it
+            db_prune_every: Disk writes between prunes (expired rows and the row cap)
+        """
+        self.embeddings = embeddings
+        self.namespace = namespace
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.db_max_rows = db_max_rows
+        self.db_prune_every = db_prune_every
+        self._writes_since_prune = 0
+
+        self._memory: "OrderedDict[str, tuple[float, List[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._db = None
+        if db_path:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS query_embeddings ("
+                "key TEXT PRIMARY KEY, created_at REAL NOT NULL, vector BLOB NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS query_embeddings_created_at ON query_embeddings (created_at)"
+            )
+            self._db.commit()
+            self._prune_disk()
+            logger.info(f"Embedding disk cache enabled at {db_path}")
+
+    def _key(self, text: str) -> str:
+        payload = f"{self.namespace}\x00{normalize_text(text)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _get_memory(self, key: str) -> Optional[List[float]]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            created_at, vector = entry
+            if time.time() - created_at > self.ttl_seconds:
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return vector
+
+    def _put_memory(self, key: str, vector: List[float], created_at: float):
+        with self._lock:
+            self._memory[key] = (created_at, vector)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_size:
+                self._memory.popitem(last=False)
+
+    def _get_disk(self, key: str) -> Optional[List[float]]:
+        if self._db is None:
+            return None
+        with self._lock:
+            row = self._db.execute(
+                "SELECT created_at, vector FROM query_embeddings WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        created_at, blob = row
+        if time.time() - created_at > self.ttl_seconds:
+            return None
+        vector = array("f", blob).tolist()
+        with self._lock:
+            self.disk_hits += 1
+        self._put_memory(key, vector, created_at)
+        return vector
+
+    def _put_disk(self, key: str, vector: List[float], created_at: float):
+        if self._db is None:
+            return
+        try:
+            with self._lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO query_embeddings (key, created_at, vector) VALUES (?, ?, ?)",
+                    (key, created_at, array("f", vector).tobytes())
+                )
+                self._db.commit()
+                self._writes_since_prune += 1
+                prune = self._writes_since_prune >= self.db_prune_every
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to write embedding to disk cache: {e}")
+            return
+        if prune:
+            self._prune_disk()
+
+    def _prune_disk(self):
+        """Delete expired rows, then the oldest rows beyond db_max_rows"""
+        try:
+            with self._lock:
+                self._writes_since_prune = 0
+                expired = self._db.execute(
+                    "DELETE FROM query_embeddings WHERE created_at < ?",
+                    (time.time() - self.ttl_seconds,)
+                ).rowcount
+                evicted = self._db.execute(
+                    "DELETE FROM query_embeddings WHERE key IN ("
+                    "SELECT key FROM query_embeddings ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                    (self.db_max_rows,)
+                ).rowcount
+                self._db.commit()
+            if expired or evicted:
+                logger.info(f"Pruned embedding disk cache: {expired} expired, {evicted} over the row cap")
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to prune embedding disk cache: {e}")
+
+    def _store(self, key: str, vector: List[float]):
+        created_at = time.time()
+        self._put_memory(key, vector, created_at)
+        self._put_disk(key, vector, created_at)
+
+    def _record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def embed_query(self, text: str) -> List[float]:
+        key = self._key(text)
+        vector = self._get_memory(key)
+        if vector is None:
+            vector = self._get_disk(key)
+        record_cache_lookup(vector is not None)
+        if vector is not None:
+            return vector
+
+        self._record_miss()
+        vector = self.embeddings.embed_query(text)
+        self._store(key, vector)
+        return vector
+
+    async def aembed_query(self, text: str) -> List[float]:
+        key = self._key(text)
+        vector = self._get_memory(key)
+        if vector is None and self._db is not None:
+            vector = await asyncio.to_thread(self._get_disk, key)
+        record_cache_lookup(vector is not None)
+        if vector is not None:
+            return vector
+
+        self._record_miss()
+        vector = await self.embeddings.aembed_query(text)
+        if self._db is not None:
+            await asyncio.to_thread(self._store, key, vector)
+        else:
+            self._put_memory(key, vector, time.time())
+        return vector
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self.embeddings.aembed_documents(texts)
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get hit/miss counters and current memory tier size"""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+                "memory_size": len(self._memory),
+            }
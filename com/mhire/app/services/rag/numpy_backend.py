@@ -0,0 +1,110 @@
+"""
+Exact cosine-similarity search over an in-memory NumPy matrix
+"""
+from typing import Any, List, Optional, Sequence, Tuple
+import numpy as np
+from com.mhire.app.logger.logger import ChatEndpoint
+
+logger = ChatEndpoint.setup_chat_logger()
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return np.ascontiguousarray(matrix / norms, dtype=np.float32)
+
+
+class NumpyVectorIndex:
+    """
+    L2-normalized embeddings in one contiguous float32 matrix
+
+    A batch of queries is scored with a single matrix product, so scores are
+    true cosine similarities (not derived from L2 distances). Top-k uses
+    argpartition (O(N) per query instead of a full sort) and the similarity
+    threshold is applied as one vectorized mask.
+    """
+
+    def __init__(self, vectors: np.ndarray, documents: Sequence[Any]):
+        """
+        Args:
+            vectors: (N, d) embeddings, normalized here
+            documents: Document for each row, in the same order
+        """
+        if len(vectors) != len(documents):
+            raise ValueError(f"{len(vectors)} vectors but {len(documents)} documents")
+        self.matrix = _normalize_rows(np.asarray(vectors, dtype=np.float32))
+        self.documents = list(documents)
+
+    @classmethod
+    def from_faiss(cls, vectorstore) -> "NumpyVectorIndex":
+        """Copy the vectors and documents out of a LangChain FAISS store (flat index)"""
+        index = vectorstore.index
+        vectors = index.reconstruct_n(0, index.ntotal)
+        documents = [
+            vectorstore.docstore.search(vectorstore.index_to_docstore_id[i])
+            for i in range(index.ntotal)
+        ]
+        logger.info(f"NumPy vector index built: {index.ntotal} vectors x {index.d} dims")
+        return cls(vectors, documents)
+
+    @property
+    def ntotal(self) -> int:
+        return self.matrix.shape[0]
+
+    def search_indices(
+        self,
+        queries: Any,
+        top_k: int,
+        threshold: Optional[float] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Top-k rows per query, best first
+
+        Args:
+            queries: (d,) or (n, d) query embeddings
+            top_k: Results per query
+            threshold: Minimum cosine similarity; None keeps all top-k
+
+        Returns:
+            (indices, scores, keep) arrays of shape (n, k); keep masks rows under the threshold
+        """
+        query_matrix = np.asarray(queries, dtype=np.float32)
+        if query_matrix.ndim == 1:
+            query_matrix = query_matrix[None, :]
+        query_matrix = _normalize_rows(query_matrix)
+
+        scores = query_matrix @ self.matrix.T
+        total = scores.shape[1]
+        k = min(top_k, total)
+        if k <= 0:
+            empty = np.empty((len(query_matrix), 0))
+            return empty.astype(np.int64), empty.astype(np.float32), empty.astype(bool)
+
+        if k < total:
+            # Unordered top-k in linear time, then sort just those k
+            indices = np.argpartition(scores, total - k, axis=1)[:, total - k:]
+        else:
+            indices = np.broadcast_to(np.arange(total), scores.shape)
+        top_scores = np.take_along_axis(scores, indices, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        indices = np.take_along_axis(indices, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        keep = top_scores >= threshold if threshold is not None else np.ones_like(top_scores, dtype=bool)
+        return indices, top_scores, keep
+
+    def search(
+        self,
+        queries: Any,
+        top_k: int,
+        threshold: Optional[float] = None
+    ) -> List[List[Tuple[Any, float]]]:
+        """
+        Returns:
+            (document, cosine similarity) pairs per query, best first, above the threshold
+        """
+        indices, scores, keep = self.search_indices(queries, top_k, threshold)
+        return [
+            [(self.documents[i], float(score)) for i, score in zip(row_indices[row_keep], row_scores[row_keep])]
+            for row_indices, row_scores, row_keep in zip(indices, scores, keep)
+        ]
@@ -0,0 +1,185 @@
+"""
+Per-category sub-indexes built from chunk metadata and section headings
+"""
+import re
+from typing import Any, Dict, List, Optional, Sequence, Set
+import faiss
+import numpy as np
+from com.mhire.app.services.rag.numpy_backend import NumpyVectorIndex
+from com.mhire.app.logger.logger import ChatEndpoint
+
+logger = ChatEndpoint.setup_chat_logger()
+
+# Chunk tags (resource_type or section slug) that belong to each partition.
+# "general" has no partition: it always searches the global index.
+DEFAULT_PARTITION_TAGS = {
+    "emergency": {"emergency", "emergency_resources"},
+    "coping_strategies": {"coping_strategies", "tips_strategies", "detailed_techniques"},
+    "treatment": {"treatment", "medication_treatment", "harm_reduction", "support_resources"},
+}
+
+# Keyword-router categories (ai_chat._determine_category) -> partition.
+# Categories not listed here (e.g. "physical") search the global index.
+ROUTE_PARTITIONS = {
+    "crisis": "emergency",
+    "cravings": "coping_strategies",
+    "relapse": "coping_strategies",
+    "triggers": "coping_strategies",
+    "coping": "coping_strategies",
+    "recovery": "coping_strategies",
+    "mental_health": "coping_strategies",
+    "withdrawal": "treatment",
+    "help": "treatment",
+    "medication": "treatment",
+    "substances": "treatment",
+    "harm_reduction": "treatment",
+}
+
+# Top-level headings like "3. MEDICATION TREATMENT" (not "3.1 Overview")
+_SECTION_HEADING = re.compile(r"^\d+\.\s+([A-Z][A-Z0-9 &/,\-]+?)\s*$", re.MULTILINE)
+
+
+def partition_for(category: str) -> str:
+    """Partition a router or tool category searches in (unchanged if it is already a partition name)"""
+    return ROUTE_PARTITIONS.get(category, category)
+
+
+def section_slug(title: str) -> str:
+    """Tag for a section heading, e.g. TIPS & STRATEGIES -> tips_strategies"""
+    return re.sub(r"[^a-z0-9]+", "_", title.lower()).strip("_")
+
+
+def chunk_sections(documents: Sequence[Any]) -> List[List[str]]:
+    """
+    Top-level sections each chunk belongs to, in index order
+
+    Chunks indexed with a "sections" metadata entry use it. Otherwise the
+    headings are read from the text: a chunk belongs to every section heading
+    it contains, and text before its first heading continues the section of
+    the previous chunk from the same source.
+
+    Returns:
+        Section slugs per chunk (empty before the first heading of a source)
+    """
+    sections: List[List[str]] = []
+    current: Optional[str] = None
+    current_source = None
+    for doc in documents:
+        metadata = getattr(doc, "metadata", None) or {}
+        if metadata.get("source") != current_source:
+            current, current_source = None, metadata.get("source")
+        if metadata.get("sections"):
+            found = list(metadata["sections"])
+        else:
+            text = getattr(doc, "page_content", "")
+            headings = list(_SECTION_HEADING.finditer(text))
+            found = []
+            if current and (not headings or text[:headings[0].start()].strip()):
+                found.append(current)
+            found.extend(section_slug(match.group(1)) for match in headings)
+        if found:
+            current = found[-1]
+        sections.append(found)
+    return sections
+
+
+class CategoryPartition:
+    """
+    The chunks of one RAG category in their own flat index
+
+    Searching a partition scans only its vectors, so a category search costs
+    O(partition size) rather than O(corpus) and cannot return chunks from
+    unrelated sections.
+    """
+
+    def __init__(self, category: str, vectors: np.ndarray, documents: Sequence[Any], backend: str = "faiss"):
+        """
+        Args:
+            category: RAG category this partition serves
+            vectors: (n, d) embeddings of the partition's chunks
+            documents: Document for each row, in the same order
+            backend: "faiss" (flat L2, like the global index) or "numpy" (exact cosine)
+        """
+        self.category = category
+        self.documents = list(documents)
+        self.index = None
+        self.numpy_index = None
+        if backend == "numpy":
+            self.numpy_index = NumpyVectorIndex(vectors, self.documents)
+        else:
+            self.index = faiss.IndexFlatL2(vectors.shape[1])
+            self.index.add(np.ascontiguousarray(vectors, dtype=np.float32))
+
+    @property
+    def ntotal(self) -> int:
+        return len(self.documents)
+
+
+def parse_partition_tags(spec: str) -> Dict[str, Set[str]]:
+    """
+    Chunk tags each partition covers
+
+    Args:
+        spec: Extra tags per partition, e.g. "emergency:crisis|hotlines;treatment:medication"
+
+    Returns:
+        Partition -> set of resource_type values and section slugs
+    """
+    mapping = {category: set(tags) for category, tags in DEFAULT_PARTITION_TAGS.items()}
+    for entry in spec.split(";"):
+        if not entry.strip():
+            continue
+        category, _, tags = entry.partition(":")
+        category = category.strip()
+        if category not in mapping:
+            logger.warning(f"Ignoring partition tags for unknown category '{category}'")
+            continue
+        mapping[category].update(tag.strip() for tag in tags.split("|") if tag.strip())
+    return mapping
+
+
+def build_category_partitions(vectorstore, spec: str = "", backend: str = "faiss") -> Dict[str, CategoryPartition]:
+    """
+    Split a LangChain FAISS store into per-category partitions
+
+    A chunk joins a partition when its resource_type or one of its sections
+    is among the partition's tags. Categories with no matching chunks get no
+    partition, so their searches go straight to the global index.
+
+    Args:
+        vectorstore: Loaded FAISS vectorstore (flat index)
+        spec: RAG_PARTITION_TAGS value
+        backend: Index type for the partitions
+
+    Returns:
+        Category -> partition, for non-empty categories only
+    """
+    mapping = parse_partition_tags(spec)
+    index = vectorstore.index
+    documents = [
+        vectorstore.docstore.search(vectorstore.index_to_docstore_id[i])
+        for i in range(index.ntotal)
+    ]
+
+    rows: Dict[str, List[int]] = {category: [] for category in mapping}
+    for i, (doc, sections) in enumerate(zip(documents, chunk_sections(documents))):
+        tags = set(sections)
+        resource_type = (getattr(doc, "metadata", None) or {}).get("resource_type")
+        if resource_type:
+            tags.add(resource_type)
+        for category, category_tags in mapping.items():
+            if tags & category_tags:
+                rows[category].append(i)
+
+    partitions = {}
+    for category, category_rows in rows.items():
+        if not category_rows:
+            continue
+        vectors = np.vstack([index.reconstruct(row) for row in category_rows])
+        partitions[category] = CategoryPartition(
+            category, vectors, [documents[row] for row in category_rows], backend
+        )
+
+    sizes = {category: partition.ntotal for category, partition in partitions.items()}
+    logger.info(f"Category partitions over {index.ntotal} vectors: {sizes or 'none'}")
+    return partitions
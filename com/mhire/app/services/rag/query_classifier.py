@@ -1,8 +1,8 @@
 """
 Classify queries as CRITICAL or NORMAL
 """
-from langchain_google_genai import ChatGoogleGenerativeAI
-from com.mhire.app.config.config import Config
+from com.mhire.app.services.providers.provider_registry import create_chat_model
+from com.mhire.app.utils.limiter.adaptive_limiter import gemini_limiter
 from com.mhire.app.logger.logger import ChatEndpoint
 
 logger = ChatEndpoint.setup_chat_logger()
@@ -10,10 +10,8 @@ logger = ChatEndpoint.setup_chat_logger()
 
 class QueryClassifier:
     def __init__(self):
-        config = Config()
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash-lite",  # Faster model for classification
-            google_api_key=config.GEMINI_API_KEY,
+        self.llm = create_chat_model(
+            "gemini-2.0-flash-lite",  # Faster model for classification
             temperature=0,  # Deterministic classification
         )
         logger.info("Query classifier initialized")
@@ -54,7 +52,10 @@ Query: "{query}"
 
 Respond with ONLY one word: CRITICAL or NORMAL"""
 
-            response = await self.llm.ainvoke(classification_prompt)
+            response = await gemini_limiter.run(
+                lambda: self.llm.ainvoke(classification_prompt),
+                call_class="classification"
+            )
             classification = response.content.strip().upper()
             
             # Ensure valid response
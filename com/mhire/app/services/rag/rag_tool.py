@@ -2,8 +2,12 @@
 RAG Tool for LLM function calling
 Provides search_resources function that LLM can autonomously call
 """
-from typing import List, Dict, Literal
+from typing import List, Dict, Literal, Tuple
+from com.mhire.app.config.config import Config
+from com.mhire.app.services.rag.partitions import partition_for
 from com.mhire.app.services.rag.retriever import RetrieverService
+from com.mhire.app.utils.deadline.deadline import DeadlineExceededError, remaining_budget, with_deadline
+from com.mhire.app.utils.tracing.tracing import start_span
 from com.mhire.app.logger.logger import ChatEndpoint
 
 logger = ChatEndpoint.setup_chat_logger()
@@ -15,8 +19,20 @@ class RAGTool:
     def __init__(self, similarity_threshold: float = 0.7):
         """Initialize RAG tool with retriever"""
         self.retriever = RetrieverService(similarity_threshold=similarity_threshold)
+        config = Config()
+        # Time kept back for generation, and the least worth spending on retrieval
+        self.generation_reserve_seconds = config.RAG_GENERATION_RESERVE_SECONDS
+        self.min_retrieval_budget_seconds = config.RAG_MIN_BUDGET_SECONDS
         logger.info("RAG tool initialized")
     
+    def _has_retrieval_budget(self) -> bool:
+        """Whether the request deadline leaves enough time to embed and search"""
+        budget = remaining_budget(self.generation_reserve_seconds)
+        if budget is not None and budget < self.min_retrieval_budget_seconds:
+            logger.info(f"Skipping retrieval: only {budget:.2f}s of budget left before generation reserve")
+            return False
+        return True
+    
     def search_resources(
         self,
         query: str,
@@ -45,6 +61,9 @@ class RAGTool:
             >>> tool.search_resources("suicidal thoughts", category="emergency")
             >>> tool.search_resources("medication options", category="treatment")
         """
+        if not self._has_retrieval_budget():
+            return ""
+        
         try:
             logger.debug(f"RAG tool called: query='{query}', category='{category}'")
             
@@ -53,7 +72,9 @@ class RAGTool:
             logger.debug(f"Enhanced query: '{enhanced_query}'")
             
             # Perform semantic search
-            search_results = self.retriever.search(enhanced_query, top_k=top_k)
+            with start_span("rag.search_resources", category=category, top_k=top_k) as span:
+                search_results = self.retriever.search(enhanced_query, top_k=top_k, category=partition_for(category))
+                span.set_attribute("result_count", len(search_results))
             
             if not search_results:
                 logger.info(f"No resources found for: {query}")
@@ -69,6 +90,192 @@ class RAGTool:
             logger.error(f"RAG tool search failed: {e}", exc_info=True)
             return ""
     
+    async def asearch_resources(
+        self,
+        query: str,
+        category: Literal["emergency", "coping_strategies", "treatment", "general"] = "general",
+        top_k: int = 3
+    ) -> str:
+        """
+        Async variant of search_resources for use inside request handlers
+        
+        Embedding is awaited natively and the FAISS lookup runs on the bounded
+        search executor, so a slow embedding call never stalls the event loop.
+        
+        Args:
+            query: What to search for
+            category: Resource category to prioritize
+            top_k: Number of results to retrieve (default: 3)
+            
+        Returns:
+            Formatted context string with relevant resources, or empty string if none found
+        """
+        search_results = await self.aretrieve(query, category, top_k=top_k)
+        if not search_results:
+            return ""
+        return self.retriever.format_context(search_results)
+    
+    async def aretrieve(
+        self,
+        query: str,
+        category: Literal["emergency", "coping_strategies", "treatment", "general"] = "general",
+        top_k: int = 3
+    ) -> List[Dict]:
+        """
+        Retrieve raw search results (content, metadata, score) without formatting
+        
+        Used when the caller needs resource metadata as well as the context string,
+        e.g. the streaming endpoint emits sources before generating.
+        
+        Args:
+            query: What to search for
+            category: Resource category to prioritize
+            top_k: Number of results to retrieve (default: 3)
+            
+        Returns:
+            List of search results, or empty list if none found
+        """
+        if not self._has_retrieval_budget():
+            return []
+        
+        try:
+            logger.debug(f"RAG tool called (async): query='{query}', category='{category}'")
+            
+            enhanced_query = self._enhance_query(query, category)
+            logger.debug(f"Enhanced query: '{enhanced_query}'")
+            
+            with start_span("rag.retrieve", category=category, top_k=top_k) as span:
+                search_results = await with_deadline(
+                    self.retriever.asearch(enhanced_query, top_k=top_k, category=partition_for(category)),
+                    "retrieval",
+                    reserve_seconds=self.generation_reserve_seconds
+                )
+                span.set_attribute("result_count", len(search_results))
+            
+            if not search_results:
+                logger.info(f"No resources found for: {query}")
+                return []
+            
+            logger.info(f"Retrieved {len(search_results)} resources for category: {category}")
+            return search_results
+            
+        except DeadlineExceededError as e:
+            logger.warning(f"Retrieval skipped to meet deadline: {e}")
+            return []
+        except Exception as e:
+            logger.error(f"RAG tool async search failed: {e}", exc_info=True)
+            return []
+    
+    async def aretrieve_with_fallback(
+        self,
+        query: str,
+        category: str,
+        top_k: int = 3
+    ) -> List[Dict]:
+        """
+        Retrieve for a category, falling back to "general", in a single round trip
+        
+        A category with a partition (router categories map onto one, e.g.
+        "cravings" -> coping_strategies) is searched there, and the retriever
+        falls back to the global index when the partition comes up empty.
+        Otherwise both enhanced query variants are embedded in one batch and
+        searched with one multi-row FAISS call; the category result is preferred
+        and the general result is used only when the category result is empty.
+        
+        Args:
+            query: What to search for
+            category: Resource category to prioritize
+            top_k: Number of results to retrieve (default: 3)
+            
+        Returns:
+            List of search results, or empty list if neither variant matched
+        """
+        if category == "general":
+            return await self.aretrieve(query, "general", top_k=top_k)
+        
+        results = await self.aretrieve_many_with_fallback([(query, category)], top_k=top_k)
+        return results[0]
+    
+    async def aretrieve_many_with_fallback(
+        self,
+        items: List[Tuple[str, str]],
+        top_k: int = 3
+    ) -> List[List[Dict]]:
+        """
+        Category-with-general-fallback retrieval for many queries at once
+        
+        Every query variant across all items is embedded together and searched
+        in one executor call, each category variant in its partition when it has one.
+        
+        Args:
+            items: (query, category) pairs
+            top_k: Number of results to retrieve per query
+            
+        Returns:
+            One result list per item, in order
+        """
+        if not items:
+            return []
+        if not self._has_retrieval_budget():
+            return [[] for _ in items]
+        
+        try:
+            logger.debug(f"RAG tool called (with fallback) for {len(items)} queries")
+            
+            # Row layout: each item contributes its category variant (unless it is
+            # already "general") followed by its general variant. A partitioned
+            # category needs no general variant: the retriever falls back to the
+            # global index itself when the partition comes up empty.
+            enhanced_queries = []
+            row_categories = []
+            rows = []
+            for query, category in items:
+                category_row = None
+                general_row = None
+                partition = partition_for(category)
+                if category != "general":
+                    category_row = len(enhanced_queries)
+                    enhanced_queries.append(self._enhance_query(query, category))
+                    row_categories.append(partition)
+                if not self.retriever.has_partition(partition):
+                    general_row = len(enhanced_queries)
+                    enhanced_queries.append(self._enhance_query(query, "general"))
+                    row_categories.append(None)
+                rows.append((category_row, general_row))
+            
+            with start_span(
+                "rag.retrieve_many", items=len(items), variants=len(enhanced_queries), top_k=top_k,
+                categories=[category for _, category in items]
+            ) as span:
+                search_results = await with_deadline(
+                    self.retriever.asearch_many(enhanced_queries, top_k=top_k, categories=row_categories),
+                    "retrieval",
+                    reserve_seconds=self.generation_reserve_seconds
+                )
+                
+                results = []
+                for (query, category), (category_row, general_row) in zip(items, rows):
+                    category_results = search_results[category_row] if category_row is not None else []
+                    general_results = search_results[general_row] if general_row is not None else []
+                    if category_results:
+                        logger.info(f"Retrieved {len(category_results)} resources for category: {category}")
+                        results.append(category_results)
+                    elif general_results:
+                        logger.info(f"No resources for category: {category}, using {len(general_results)} general resources")
+                        results.append(general_results)
+                    else:
+                        logger.info(f"No resources found for: {query}")
+                        results.append([])
+                span.set_attribute("result_counts", [len(found) for found in results])
+            return results
+            
+        except DeadlineExceededError as e:
+            logger.warning(f"Retrieval skipped to meet deadline: {e}")
+            return [[] for _ in items]
+        except Exception as e:
+            logger.error(f"RAG tool fallback search failed: {e}", exc_info=True)
+            return [[] for _ in items]
+    
     def _enhance_query(self, query: str, category: str) -> str:
         """
         Enhance query with category context for better semantic search
@@ -1,8 +1,17 @@
 """
 Semantic search and retrieval logic
 """
-from typing import List, Dict
+import asyncio
+import threading
+from collections import Counter
+from typing import Any, List, Dict, Optional
+import numpy as np
+from com.mhire.app.config.config import Config
+from com.mhire.app.services.rag.numpy_backend import NumpyVectorIndex
+from com.mhire.app.services.rag.partitions import CategoryPartition, build_category_partitions
 from com.mhire.app.services.rag.vector_store import VectorStoreService
+from com.mhire.app.services.rag.search_executor import SearchExecutor
+from com.mhire.app.utils.metrics.stage_timer import stage_timer
 from com.mhire.app.logger.logger import ChatEndpoint
 
 logger = ChatEndpoint.setup_chat_logger()
@@ -19,15 +28,42 @@ class RetrieverService:
         self.similarity_threshold = similarity_threshold
         vector_store_service = VectorStoreService()
         self.vectorstore = vector_store_service.get_vectorstore()
-        logger.info(f"Retriever initialized with threshold: {similarity_threshold}")
+        self.embeddings = vector_store_service.embeddings
+        self.search_executor = SearchExecutor()
+        config = Config()
+        # "numpy" scores true cosine similarity over an in-memory copy of the index
+        self.numpy_index = (
+            NumpyVectorIndex.from_faiss(self.vectorstore)
+            if config.RAG_VECTOR_BACKEND == "numpy" else None
+        )
+        # Category searches scan only their partition, falling back to the global index
+        self.partitions: Dict[str, CategoryPartition] = (
+            build_category_partitions(
+                self.vectorstore,
+                config.RAG_PARTITION_TAGS,
+                backend=config.RAG_VECTOR_BACKEND
+            )
+            if config.RAG_CATEGORY_PARTITIONS_ENABLED else {}
+        )
+        self._stats_lock = threading.Lock()
+        self.search_counts: Counter = Counter()
+        logger.info(
+            f"Retriever initialized with threshold: {similarity_threshold}, "
+            f"backend: {'numpy' if self.numpy_index is not None else 'faiss'}"
+        )
+    
+    def has_partition(self, category: str) -> bool:
+        """Whether searches for this category are confined to a partition"""
+        return category in self.partitions
     
-    def search(self, query: str, top_k: int = 3) -> List[Dict]:
+    def search(self, query: str, top_k: int = 3, category: Optional[str] = None) -> List[Dict]:
         """
         Search for relevant resources based on query
         
         Args:
             query: User's query text
             top_k: Number of top results to retrieve
+            category: Search only this category's partition (global index if it has none or it comes up empty)
             
         Returns:
             List of relevant document chunks with metadata and scores
@@ -35,34 +71,241 @@ class RetrieverService:
         try:
             logger.debug(f"Searching for query: {query[:100]}...")
             
-            # Perform similarity search with scores
-            results = self.vectorstore.similarity_search_with_score(
-                query=query,
-                k=top_k
-            )
+            # Perform similarity search with scores (embedding included)
+            with stage_timer("search", top_k=top_k, rows=1) as span:
+                filtered = self._search_rows([self.embeddings.embed_query(query)], top_k, [category])[0]
+                self._annotate_span(span, [filtered], [category])
             
-            # Filter by similarity threshold and format results
-            relevant_results = []
-            for doc, score in results:
-                # FAISS returns distance, lower is better
-                # Convert to similarity (1 - normalized_distance)
-                similarity = 1 - (score / 2)  # Rough normalization
-                
-                if similarity >= self.similarity_threshold:
-                    relevant_results.append({
-                        'content': doc.page_content,
-                        'metadata': doc.metadata,
-                        'similarity_score': round(similarity, 3)
-                    })
-                    logger.debug(f"Found relevant chunk with score: {similarity:.3f}")
-            
-            logger.info(f"Retrieved {len(relevant_results)} relevant results above threshold")
-            return relevant_results
+            return filtered
             
         except Exception as e:
             logger.error(f"Search failed: {e}", exc_info=True)
             return []
     
+    async def asearch(self, query: str, top_k: int = 3, category: Optional[str] = None) -> List[Dict]:
+        """
+        Async variant of search that never blocks the event loop
+        
+        The query is embedded with the native async client and the FAISS
+        lookup runs on the bounded search executor.
+        
+        Args:
+            query: User's query text
+            top_k: Number of top results to retrieve
+            category: Search only this category's partition (global index if it has none or it comes up empty)
+            
+        Returns:
+            List of relevant document chunks with metadata and scores
+        """
+        try:
+            logger.debug(f"Async searching for query: {query[:100]}...")
+            
+            with stage_timer("embed", queries=1):
+                embedding = await self.embeddings.aembed_query(query)
+            with stage_timer("search", top_k=top_k, rows=1) as span:
+                filtered = (await self.search_executor.run(self._search_rows, [embedding], top_k, [category]))[0]
+                self._annotate_span(span, [filtered], [category])
+            
+            return filtered
+            
+        except Exception as e:
+            logger.error(f"Async search failed: {e}", exc_info=True)
+            return []
+    
+    async def asearch_many(
+        self,
+        queries: List[str],
+        top_k: int = 3,
+        categories: Optional[List[Optional[str]]] = None
+    ) -> List[List[Dict]]:
+        """
+        Search several query variants with one embedding round trip and one FAISS call
+        
+        The queries are embedded concurrently (the embedding coalescer merges them
+        into a single batched request) and searched as one multi-row matrix.
+        
+        Args:
+            queries: Query texts to search for
+            top_k: Number of top results to retrieve per query
+            categories: Optional category per query, as for search
+            
+        Returns:
+            One list of relevant results per query, in the same order
+        """
+        try:
+            logger.debug(f"Batch searching {len(queries)} query variants")
+            
+            with stage_timer("embed", queries=len(queries)):
+                embeddings = await asyncio.gather(
+                    *(self.embeddings.aembed_query(query) for query in queries)
+                )
+            with stage_timer("search", top_k=top_k, rows=len(embeddings)) as span:
+                filtered = await self.search_executor.run(self._search_rows, embeddings, top_k, categories)
+                self._annotate_span(span, filtered, categories)
+            
+            return filtered
+            
+        except Exception as e:
+            logger.error(f"Batch search failed: {e}", exc_info=True)
+            return [[] for _ in queries]
+    
+    def _search_rows(
+        self,
+        embeddings: List[List[float]],
+        top_k: int,
+        categories: Optional[List[Optional[str]]] = None
+    ) -> List[List[Dict]]:
+        """
+        Search query vectors, each in its category partition or the global index
+        
+        Rows are grouped so each partition is searched once for all its rows.
+        Rows whose partition yields nothing above the threshold are searched
+        again, with the same vector, on the global index.
+        
+        Returns:
+            One list of relevant results per query row
+        """
+        results: List[Optional[List[Dict]]] = [None] * len(embeddings)
+        
+        counts: Counter = Counter()
+        
+        groups: Dict[str, List[int]] = {}
+        for row, category in enumerate(categories or []):
+            if category in self.partitions:
+                groups.setdefault(category, []).append(row)
+        for category, rows in groups.items():
+            found = self._search_index([embeddings[row] for row in rows], top_k, self.partitions[category])
+            counts[f"partition:{category}"] += len(rows)
+            for row, row_results in zip(rows, found):
+                if row_results:
+                    results[row] = row_results
+                else:
+                    counts["partition_fallbacks"] += 1
+                    logger.info(f"No results in '{category}' partition, falling back to the global index")
+        
+        global_rows = [row for row, row_results in enumerate(results) if row_results is None]
+        if global_rows:
+            found = self._search_index([embeddings[row] for row in global_rows], top_k)
+            counts["global"] += len(global_rows)
+            for row, row_results in zip(global_rows, found):
+                results[row] = row_results
+        
+        # Runs on the search executor's threads
+        with self._stats_lock:
+            self.search_counts.update(counts)
+        return results
+    
+    def _search_index(
+        self,
+        embeddings: List[List[float]],
+        top_k: int,
+        partition: Optional[CategoryPartition] = None
+    ) -> List[List[Dict]]:
+        """
+        Search a matrix of query vectors on the configured backend and apply the threshold
+        
+        Args:
+            embeddings: Query vectors
+            top_k: Number of top results per row
+            partition: Category partition to search instead of the global index
+            
+        Returns:
+            One list of relevant results per query row
+        """
+        numpy_index = partition.numpy_index if partition is not None else self.numpy_index
+        if numpy_index is not None:
+            rows = numpy_index.search(embeddings, top_k, threshold=self.similarity_threshold)
+            results = [[self._result(doc, similarity) for doc, similarity in row] for row in rows]
+            logger.info(f"Retrieved {[len(row) for row in results]} relevant results above threshold")
+            return results
+        return [self._filter_results(row) for row in self._search_vectors(embeddings, top_k, partition)]
+    
+    def _search_vectors(
+        self,
+        embeddings: List[List[float]],
+        top_k: int,
+        partition: Optional[CategoryPartition] = None
+    ) -> List[List]:
+        """
+        Run a single FAISS search over a matrix of query vectors
+        
+        Returns:
+            (document, distance) pairs per query row, like similarity_search_with_score
+        """
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        faiss_index = partition.index if partition is not None else self.vectorstore.index
+        distances, indices = faiss_index.search(matrix, top_k)
+        
+        results = []
+        for row_distances, row_indices in zip(distances, indices):
+            row = []
+            for distance, index in zip(row_distances, row_indices):
+                if index == -1:
+                    # FAISS pads with -1 when the index has fewer than top_k vectors
+                    continue
+                if partition is not None:
+                    doc = partition.documents[index]
+                else:
+                    doc = self.vectorstore.docstore.search(self.vectorstore.index_to_docstore_id[index])
+                row.append((doc, float(distance)))
+            results.append(row)
+        return results
+    
+    def _annotate_span(self, span, filtered: List[List[Dict]], categories: Optional[List[Optional[str]]] = None):
+        """Attach result counts and similarity scores to a search span"""
+        span.set_attribute("backend", "numpy" if self.numpy_index is not None else "faiss")
+        span.set_attribute(
+            "partitions",
+            [category if category in self.partitions else "global" for category in categories or [None]]
+        )
+        span.set_attribute("faiss.ntotal", self.vectorstore.index.ntotal)
+        span.set_attribute("result_counts", [len(rows) for rows in filtered])
+        span.set_attribute(
+            "similarity_scores",
+            [result['similarity_score'] for rows in filtered for result in rows]
+        )
+    
+    def _filter_results(self, results: List) -> List[Dict]:
+        """
+        Filter raw (document, distance) pairs by similarity threshold
+        
+        Args:
+            results: FAISS (document, distance) pairs
+            
+        Returns:
+            List of relevant document chunks with metadata and scores
+        """
+        relevant_results = []
+        for doc, score in results:
+            # FAISS returns distance, lower is better
+            # Convert to similarity (1 - normalized_distance)
+            similarity = 1 - (score / 2)  # Rough normalization
+            
+            if similarity >= self.similarity_threshold:
+                relevant_results.append(self._result(doc, similarity))
+                logger.debug(f"Found relevant chunk with score: {similarity:.3f}")
+        
+        logger.info(f"Retrieved {len(relevant_results)} relevant results above threshold")
+        return relevant_results
+    
+    def _result(self, doc, similarity: float) -> Dict:
+        return {
+            'content': doc.page_content,
+            'metadata': doc.metadata,
+            'similarity_score': round(similarity, 3)
+        }
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Partition sizes and how many query rows each partition (or the global index) searched"""
+        with self._stats_lock:
+            counts = dict(self.search_counts)
+        return {
+            "backend": "numpy" if self.numpy_index is not None else "faiss",
+            "ntotal": self.vectorstore.index.ntotal,
+            "partitions": {category: partition.ntotal for category, partition in self.partitions.items()},
+            "searches": counts,
+        }
+    
     def format_context(self, results: List[Dict]) -> str:
         """
         Format retrieved results into context string for LLM
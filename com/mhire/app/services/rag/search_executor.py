@@ -0,0 +1,76 @@
+"""
+Bounded thread pool for running blocking vector searches off the event loop
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable
+from com.mhire.app.config.config import Config
+from com.mhire.app.logger.logger import ChatEndpoint
+
+logger = ChatEndpoint.setup_chat_logger()
+
+
+class SearchQueueFullError(RuntimeError):
+    """Raised when the search executor already has its maximum number of pending jobs"""
+
+
+class SearchExecutor:
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        config = Config()
+        self.pool_size = config.RAG_SEARCH_POOL_SIZE
+        self.queue_depth = config.RAG_SEARCH_QUEUE_DEPTH
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.pool_size,
+            thread_name_prefix="rag-search"
+        )
+        self._pending = 0
+        self._initialized = True
+        logger.info(
+            f"Search executor initialized: pool_size={self.pool_size}, queue_depth={self.queue_depth}"
+        )
+
+    @property
+    def pending(self) -> int:
+        """Number of jobs running or waiting for a worker"""
+        return self._pending
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking callable on the pool without blocking the event loop
+
+        Args:
+            func: Blocking function to execute (e.g. a FAISS search)
+
+        Returns:
+            The function's return value
+
+        Raises:
+            SearchQueueFullError: If pool_size + queue_depth jobs are already pending
+        """
+        if self._pending >= self.pool_size + self.queue_depth:
+            raise SearchQueueFullError(
+                f"Search queue full ({self._pending} pending jobs)"
+            )
+
+        loop = asyncio.get_running_loop()
+        future = self.executor.submit(partial(func, *args, **kwargs))
+        self._pending += 1
+        # Count the job until the worker thread finishes it, not until the caller
+        # stops waiting: a cancelled await leaves the search running in the pool
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._job_done))
+        return await asyncio.wrap_future(future, loop=loop)
+
+    def _job_done(self):
+        self._pending -= 1
@@ -1,15 +1,14 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import HumanMessage, AIMessage
 from langchain_core.prompts import ChatPromptTemplate
 from typing import List, Dict
-from com.mhire.app.config.config import Config
+from com.mhire.app.services.providers.provider_registry import create_chat_model
+from com.mhire.app.utils.limiter.adaptive_limiter import gemini_limiter
+from com.mhire.app.utils.metrics.stage_timer import stage_timer
 
 class SessionTitleService:
     def __init__(self):
-        config = Config()
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-flash-lite-latest",
-            google_api_key=config.GEMINI_API_KEY,
+        self.llm = create_chat_model(
+            "gemini-flash-lite-latest",
             temperature=0.3
         )
         
@@ -28,7 +27,7 @@ class SessionTitleService:
             ("human", "Conversation:\n{conversation}\n\nGenerate a 3-word title:")
         ])
             
-    def generate_session_title(self, history: List[Dict[str, str]]) -> str:
+    async def generate_session_title(self, history: List[Dict[str, str]]) -> str:
         """
         Generate a 3-word session title based on chat history using LangChain
         
@@ -40,16 +39,21 @@ class SessionTitleService:
         """
         try:
             # Format the chat history
-            formatted_history = "\n".join([
-                f"{msg['role'].capitalize()}: {msg['content']}" 
-                for msg in history
-            ])
+            with stage_timer("format_history"):
+                formatted_history = "\n".join([
+                    f"{msg['role'].capitalize()}: {msg['content']}" 
+                    for msg in history
+                ])
             
             # Create the chain
             chain = self.prompt | self.llm
             
             # Invoke the chain
-            response = chain.invoke({"conversation": formatted_history})
+            with stage_timer("generation", purpose="session_title", prompt_chars=len(formatted_history)):
+                response = await gemini_limiter.run(
+                    lambda: chain.ainvoke({"conversation": formatted_history}),
+                    call_class="session_title"
+                )
             
             # Extract title from response
             title = response.content.strip()
@@ -4,6 +4,7 @@ from com.mhire.app.services.session_title.session_title_schema import (
     SessionTitleResponse
 )
 from com.mhire.app.services.session_title.session_title import session_title_service
+from com.mhire.app.utils.tracing.tracing import SpanKind, start_span
 
 router = APIRouter(
     prefix="/api/v1",
@@ -24,7 +25,8 @@ async def generate_session_title(request: SessionTitleRequest):
         history_dict = [msg.model_dump() for msg in request.history]
         
         # Generate title using Gemini via LangChain
-        title = session_title_service.generate_session_title(history_dict)
+        with start_span("POST /api/v1/session-title", kind=SpanKind.SERVER, history_length=len(history_dict)):
+            title = await session_title_service.generate_session_title(history_dict)
         
         return SessionTitleResponse(session_title=title)
         
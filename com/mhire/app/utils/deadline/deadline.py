@@ -0,0 +1,73 @@
+"""
+Per-request deadlines propagated through the chat pipeline via contextvars
+"""
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Optional
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when a stage cannot finish before the request deadline"""
+
+
+_current_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+def set_deadline(timeout_seconds: float):
+    """Start a deadline for the current request context; returns a reset token"""
+    return _current_deadline.set(time.monotonic() + timeout_seconds)
+
+
+def reset_deadline(token):
+    _current_deadline.reset(token)
+
+
+def remaining_budget(reserve_seconds: float = 0.0) -> Optional[float]:
+    """
+    Seconds left before the deadline, minus time reserved for later stages
+
+    Returns:
+        Remaining seconds (may be <= 0), or None when no deadline is set
+    """
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic() - reserve_seconds
+
+
+def ensure_budget(stage: str, reserve_seconds: float = 0.0):
+    """
+    Fail fast before starting a stage whose budget is already spent
+
+    Raises:
+        DeadlineExceededError: If no time is left for the stage
+    """
+    budget = remaining_budget(reserve_seconds)
+    if budget is not None and budget <= 0:
+        raise DeadlineExceededError(f"No time budget left for {stage}")
+
+
+async def with_deadline(awaitable: Awaitable[Any], stage: str, reserve_seconds: float = 0.0) -> Any:
+    """
+    Await within the remaining budget
+
+    Args:
+        awaitable: Work for this stage
+        stage: Stage name used in the error message
+        reserve_seconds: Budget kept back for stages that run afterwards
+
+    Raises:
+        DeadlineExceededError: If the budget is already spent or runs out
+    """
+    budget = remaining_budget(reserve_seconds)
+    if budget is None:
+        return await awaitable
+    if budget <= 0:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise DeadlineExceededError(f"No time budget left for {stage}")
+    try:
+        return await asyncio.wait_for(awaitable, timeout=budget)
+    except asyncio.TimeoutError as e:
+        raise DeadlineExceededError(f"{stage} exceeded its {budget:.2f}s budget") from e
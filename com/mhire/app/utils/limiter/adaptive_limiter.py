@@ -0,0 +1,176 @@
+"""
+Adaptive (AIMD) concurrency limiter shared by all Gemini call sites
+"""
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from com.mhire.app.config.config import Config
+from com.mhire.app.logger.logger import ChatEndpoint
+
+logger = ChatEndpoint.setup_chat_logger()
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Whether an exception from Gemini means we are over quota"""
+    error_str = str(error).lower()
+    return any(marker in error_str for marker in ("429", "quota", "rate limit", "resource_exhausted", "resource exhausted"))
+
+
+class AdaptiveLimiter:
+    """
+    Additive-increase / multiplicative-decrease concurrency limit
+
+    While calls succeed the limit grows by roughly one slot per "window" of
+    completed calls (limit += 1 / limit). On a rate-limit error, or when a
+    call's latency exceeds `latency_spike_factor` times the smoothed latency
+    of its call class, the limit is multiplied by `backoff_ratio` (at most
+    once per cooldown). Callers beyond the limit wait in FIFO order.
+
+    Each call class ("embedding", "generation", ...) keeps its own latency
+    baseline, because a ~1 s generation is not a spike relative to ~60 ms
+    embeddings. A class needs `latency_warmup_calls` samples before its
+    latency can trigger a backoff; a call class of None (e.g. a stream held
+    open for the whole response) never does.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: float = 8,
+        min_limit: float = 1,
+        max_limit: float = 64,
+        backoff_ratio: float = 0.5,
+        latency_spike_factor: float = 3.0,
+        cooldown_seconds: float = 1.0,
+        latency_warmup_calls: int = 20
+    ):
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = float(min_limit)
+        self.max_limit = float(max_limit)
+        self.backoff_ratio = backoff_ratio
+        self.latency_spike_factor = latency_spike_factor
+        self.cooldown_seconds = cooldown_seconds
+        self.latency_warmup_calls = latency_warmup_calls
+
+        self.in_flight = 0
+        self._waiters: deque = deque()
+        # call class -> (smoothed latency, samples seen)
+        self._latency_baselines: Dict[str, Tuple[float, int]] = {}
+        self._last_decrease = 0.0
+        self.rate_limited_count = 0
+        self.latency_spike_count = 0
+
+    @property
+    def queue_length(self) -> int:
+        return len(self._waiters)
+
+    def _has_capacity(self) -> bool:
+        return self.in_flight < max(1, int(self.limit))
+
+    async def _acquire(self):
+        if self._has_capacity() and not self._waiters:
+            self.in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            elif waiter.done() and not waiter.cancelled():
+                # Slot was handed to us as we were cancelled; pass it on
+                self._release()
+            raise
+
+    def _release(self):
+        self.in_flight -= 1
+        self._wake_waiters()
+
+    def _wake_waiters(self):
+        while self._waiters and self._has_capacity():
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def _on_success(self, latency: float, call_class: Optional[str]):
+        spike = False
+        if call_class is not None:
+            smoothed, samples = self._latency_baselines.get(call_class, (latency, 0))
+            spike = samples >= self.latency_warmup_calls and latency > smoothed * self.latency_spike_factor
+            self._latency_baselines[call_class] = (0.9 * smoothed + 0.1 * latency, samples + 1)
+
+        if spike:
+            self.latency_spike_count += 1
+            self._decrease(f"{call_class} latency spike {latency:.2f}s")
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._wake_waiters()
+
+    def _decrease(self, reason: str):
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown_seconds:
+            return
+        self._last_decrease = now
+        previous = self.limit
+        self.limit = max(self.min_limit, self.limit * self.backoff_ratio)
+        logger.warning(
+            f"Limiter '{self.name}' backing off ({reason}): limit {previous:.1f} -> {self.limit:.1f}, "
+            f"in_flight={self.in_flight}, queued={self.queue_length}"
+        )
+
+    @asynccontextmanager
+    async def slot(self, call_class: Optional[str] = "generation"):
+        """
+        Hold one concurrency slot for the duration of the block
+
+        Args:
+            call_class: Latency baseline the call is compared against; None skips spike detection
+        """
+        await self._acquire()
+        start = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            if is_rate_limit_error(e):
+                self.rate_limited_count += 1
+                self._decrease("rate limited")
+            raise
+        else:
+            self._on_success(time.monotonic() - start, call_class)
+        finally:
+            self._release()
+
+    async def run(self, func: Callable[[], Awaitable[Any]], call_class: Optional[str] = "generation") -> Any:
+        """Run a coroutine factory inside one concurrency slot"""
+        async with self.slot(call_class):
+            return await func()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "queue_length": self.queue_length,
+            "rate_limited": self.rate_limited_count,
+            "latency_spikes": self.latency_spike_count,
+            "latency_baselines": {
+                call_class: round(smoothed, 3) for call_class, (smoothed, _) in self._latency_baselines.items()
+            },
+        }
+
+
+_config = Config()
+
+# Shared by every Gemini chat and embedding call in the process
+gemini_limiter = AdaptiveLimiter(
+    "gemini",
+    initial_limit=_config.GEMINI_LIMITER_INITIAL,
+    min_limit=_config.GEMINI_LIMITER_MIN,
+    max_limit=_config.GEMINI_LIMITER_MAX
+)
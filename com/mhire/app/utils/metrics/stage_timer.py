@@ -0,0 +1,150 @@
+"""
+Per-request stage timers, exported as Prometheus histograms and Server-Timing
+
+Each request gets a RequestTimings collector in a contextvar (set by the HTTP
+middleware in main.py). Pipeline code wraps its steps in `stage_timer(...)`
+and tags the request with `set_request_label` / `record_cache_lookup`; the
+middleware renders the Server-Timing header and observes the histograms
+once the response body has been sent, so every stage of a request carries
+the same category and cache labels. Each stage is also a tracing span.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+from prometheus_client import Histogram
+from com.mhire.app.utils.tracing.tracing import start_span
+
+# Spans sub-millisecond routing up to the generation deadline
+_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+STAGE_SECONDS = Histogram(
+    "sora_stage_duration_seconds",
+    "Time spent in each pipeline stage",
+    ["endpoint", "stage", "category", "cache"],
+    buckets=_BUCKETS
+)
+
+REQUEST_SECONDS = Histogram(
+    "sora_request_duration_seconds",
+    "End-to-end request time including the response body",
+    ["endpoint", "method", "status", "category", "cache"],
+    buckets=_BUCKETS
+)
+
+
+class RequestTimings:
+    """Stage durations and labels collected over one request"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.stages: List[Tuple[str, float]] = []
+        self.labels: Dict[str, str] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def add(self, stage: str, seconds: float):
+        self.stages.append((stage, seconds))
+
+    @property
+    def cache_label(self) -> str:
+        if self.cache_hits and self.cache_misses:
+            return "partial"
+        if self.cache_hits:
+            return "hit"
+        if self.cache_misses:
+            return "miss"
+        return "none"
+
+    @property
+    def category_label(self) -> str:
+        return self.labels.get("category", "none")
+
+    def server_timing(self) -> str:
+        """
+        Server-Timing header value, e.g. `embed;dur=41.2;desc="cache miss", search;dur=0.8`
+
+        Repeated stages (batch requests) are summed, with the count in desc.
+        """
+        totals: Dict[str, List[float]] = {}
+        for stage, seconds in self.stages:
+            totals.setdefault(stage, []).append(seconds)
+        entries = []
+        for stage, durations in totals.items():
+            entry = f"{stage};dur={sum(durations) * 1000:.2f}"
+            desc = []
+            if len(durations) > 1:
+                desc.append(f"x{len(durations)}")
+            if stage == "embed":
+                desc.append(f"cache {self.cache_label}")
+            if desc:
+                entry += f';desc="{" ".join(desc)}"'
+            entries.append(entry)
+        if "category" in self.labels:
+            entries.append(f'category;desc="{self.labels["category"]}"')
+        entries.append(f"total;dur={(time.perf_counter() - self.start) * 1000:.1f}")
+        return ", ".join(entries)
+
+    def observe(self, endpoint: str, method: str, status: int):
+        """Export this request to the Prometheus histograms"""
+        category, cache = self.category_label, self.cache_label
+        for stage, seconds in self.stages:
+            STAGE_SECONDS.labels(endpoint, stage, category, cache).observe(seconds)
+        REQUEST_SECONDS.labels(endpoint, method, str(status), category, cache).observe(
+            time.perf_counter() - self.start
+        )
+
+
+_current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def start_request_timings():
+    """Start collecting for the current request; returns (timings, reset token)"""
+    timings = RequestTimings()
+    return timings, _current_timings.set(timings)
+
+
+def reset_request_timings(token):
+    _current_timings.reset(token)
+
+
+@contextmanager
+def stage_timer(stage: str, **span_attributes):
+    """
+    Time a block as one pipeline stage of the current request
+
+    Outside a request (scripts, benchmarks) the stage is observed directly
+    with endpoint="none".
+
+    Yields:
+        The stage's tracing span, for attributes known only after the work
+    """
+    start = time.perf_counter()
+    try:
+        with start_span(stage, **span_attributes) as span:
+            yield span
+    finally:
+        elapsed = time.perf_counter() - start
+        timings = _current_timings.get()
+        if timings is not None:
+            timings.add(stage, elapsed)
+        else:
+            STAGE_SECONDS.labels("none", stage, "none", "none").observe(elapsed)
+
+
+def set_request_label(name: str, value: str):
+    """Tag the current request (e.g. category="cravings"); no-op outside a request"""
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.labels[name] = value
+
+
+def record_cache_lookup(hit: bool):
+    """Count an embedding cache lookup for the current request's cache label"""
+    timings = _current_timings.get()
+    if timings is None:
+        return
+    if hit:
+        timings.cache_hits += 1
+    else:
+        timings.cache_misses += 1
@@ -0,0 +1,90 @@
+"""
+Admin check and per-request cProfile capture
+"""
+import cProfile
+import hmac
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+from com.mhire.app.config.config import Config
+from com.mhire.app.logger.logger import ChatEndpoint
+
+logger = ChatEndpoint.setup_chat_logger()
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profile is requested while another one is running"""
+
+
+def verify_admin_token(token: Optional[str]) -> bool:
+    """Constant-time check against ADMIN_TOKEN; always False when no token is configured"""
+    expected = Config().ADMIN_TOKEN
+    if not expected or not token:
+        return False
+    return hmac.compare_digest(token.encode("utf-8"), expected.encode("utf-8"))
+
+
+def profile_output_dir() -> Path:
+    path = Path(Config().PROFILE_OUTPUT_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def resolve_profile_path(profile_id: str) -> Optional[Path]:
+    """Path of a saved profile by id, refusing anything that is not a plain file name"""
+    if not profile_id or "/" in profile_id or "\\" in profile_id or profile_id.startswith("."):
+        return None
+    path = profile_output_dir() / profile_id
+    return path if path.is_file() else None
+
+
+_active = False
+
+
+@contextmanager
+def profiling_slot():
+    """
+    Reserve the worker's single profiling slot (sampler or cProfile)
+
+    Raises:
+        ProfilerBusyError: If another profile is already running
+    """
+    global _active
+    if _active:
+        raise ProfilerBusyError("A profile is already running on this worker")
+    _active = True
+    try:
+        yield
+    finally:
+        _active = False
+
+
+@contextmanager
+def cprofile_request(label: str):
+    """
+    cProfile the enclosed block and save the stats as <id>.prof
+
+    cProfile hooks the whole thread, so other requests interleaved on the event
+    loop while this one awaits are included too; use it on a quiet worker or
+    read the profile with that in mind.
+
+    Yields:
+        Dict that receives "id" (the saved file name) after the block exits
+
+    Raises:
+        ProfilerBusyError: If another profile is already running
+    """
+    with profiling_slot():
+        holder: Dict[str, str] = {}
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield holder
+        finally:
+            profiler.disable()
+        profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{label}-{uuid.uuid4().hex[:8]}.prof"
+        profiler.dump_stats(str(profile_output_dir() / profile_id))
+        holder["id"] = profile_id
+        logger.info(f"Saved request profile {profile_id}")
@@ -0,0 +1,190 @@
+"""
+Sampling profiler for a live worker
+
+A background thread snapshots every thread's Python stack (sys._current_frames)
+at a fixed interval. In "wall" mode the suspended coroutine chain of every
+asyncio task on the event loop is sampled as well, so time spent awaiting
+Gemini or the search executor shows up under the request that waits on it.
+In "cpu" mode a thread is only sampled if its own CPU clock
+(pthread_getcpuclockid) advanced since the previous tick, so threads parked
+in C-level waits (an idle ThreadPoolExecutor worker in SimpleQueue.get, the
+event loop in epoll) are dropped the way py-spy does without --idle. Where
+per-thread CPU clocks are unavailable, samples whose innermost Python frame
+is a known blocking wait are dropped instead.
+
+Output is either collapsed stacks ("a;b;c 42" per line, for flamegraph.pl or
+speedscope) or a speedscope JSON document.
+"""
+import asyncio
+import sys
+import threading
+import time
+from collections import Counter
+from types import FrameType
+from typing import Any, Dict, List, Optional, Tuple
+
+Stack = Tuple[str, ...]
+
+# Innermost functions that mean "waiting, not running" (fallback without CPU clocks).
+# Executor workers and the event loop block in C, below _worker and _run_once.
+_IDLE_FUNCTIONS = {
+    "select", "poll", "epoll", "kqueue", "control", "wait", "_wait_for_tstate_lock",
+    "acquire", "sleep", "get", "accept", "recv", "recv_into", "read", "readinto",
+    "_worker", "_run_once",
+}
+
+
+def _thread_cpu_time(ident: int) -> Optional[float]:
+    """CPU seconds consumed by a thread, or None where per-thread clocks are unsupported"""
+    try:
+        return time.clock_gettime(time.pthread_getcpuclockid(ident))
+    except (AttributeError, OSError):
+        return None
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({code.co_filename}:{frame.f_lineno})"
+
+
+def _thread_stack(frame: Optional[FrameType]) -> List[FrameType]:
+    frames = []
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+    frames.reverse()
+    return frames
+
+
+def _coroutine_stack(coro: Any) -> Stack:
+    """Follow cr_await / ag_await / gi_yieldfrom from a task's coroutine to the innermost await"""
+    labels = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None) or getattr(coro, "ag_frame", None)
+        if frame is None:
+            # Not a Python coroutine (a Future or C-level awaitable): name it and stop
+            labels.append(type(coro).__name__)
+            break
+        labels.append(_frame_label(frame))
+        coro = (
+            getattr(coro, "cr_await", None)
+            or getattr(coro, "gi_yieldfrom", None)
+            or getattr(coro, "ag_await", None)
+        )
+    return tuple(labels)
+
+
+class StackSampler:
+    """
+    Sample all threads (and asyncio tasks) for a fixed duration
+
+    Args:
+        interval_seconds: Time between samples
+        mode: "wall" (everything, including idle waits and task stacks) or "cpu"
+        loop: Event loop whose tasks are sampled in wall mode
+    """
+
+    def __init__(self, interval_seconds: float = 0.005, mode: str = "wall",
+                 loop: Optional[asyncio.AbstractEventLoop] = None):
+        if mode not in ("wall", "cpu"):
+            raise ValueError(f"Unknown profiling mode '{mode}'")
+        self.interval_seconds = interval_seconds
+        self.mode = mode
+        self.loop = loop
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self.duration_seconds = 0.0
+        self._cpu_times: Dict[int, float] = {}
+
+    def _on_cpu(self, ident: int, frames: List[FrameType]) -> bool:
+        """Whether a thread ran since the previous tick (cpu mode)"""
+        cpu_time = _thread_cpu_time(ident)
+        if cpu_time is None:
+            return not (frames and frames[-1].f_code.co_name in _IDLE_FUNCTIONS)
+        previous = self._cpu_times.get(ident)
+        self._cpu_times[ident] = cpu_time
+        # The first tick of a thread only records its baseline
+        return previous is not None and cpu_time > previous
+
+    def _sample_threads(self, own_ident: int):
+        # Only live threads: their idents are valid pthread handles for the CPU clock
+        names = {thread.ident: thread.name for thread in threading.enumerate() if thread.is_alive()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident or ident not in names:
+                continue
+            frames = _thread_stack(frame)
+            if self.mode == "cpu" and not self._on_cpu(ident, frames):
+                continue
+            stack = (f"thread:{names[ident]}",) + tuple(_frame_label(f) for f in frames)
+            self.samples[stack] += 1
+
+    def _sample_tasks(self):
+        if self.loop is None or self.mode != "wall":
+            return
+        try:
+            tasks = list(asyncio.all_tasks(self.loop))
+        except RuntimeError:
+            # The task set changed while we copied it; skip this tick
+            return
+        for task in tasks:
+            if task.done():
+                continue
+            stack = _coroutine_stack(task.get_coro())
+            if stack:
+                self.samples[(f"task:{task.get_name()}",) + stack] += 1
+
+    def run(self, duration_seconds: float) -> "StackSampler":
+        """Sample for duration_seconds; blocks the calling thread (run it off the event loop)"""
+        own_ident = threading.get_ident()
+        start = time.perf_counter()
+        deadline = start + duration_seconds
+        next_tick = start
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            if now < next_tick:
+                time.sleep(next_tick - now)
+            self._sample_threads(own_ident)
+            self._sample_tasks()
+            self.sample_count += 1
+            next_tick += self.interval_seconds
+        self.duration_seconds = time.perf_counter() - start
+        return self
+
+    def to_collapsed(self) -> str:
+        """Brendan Gregg collapsed-stack format, root first, one stack per line"""
+        return "\n".join(
+            f"{';'.join(stack)} {count}" for stack, count in self.samples.most_common()
+        ) + "\n"
+
+    def to_speedscope(self, name: str = "sora worker") -> Dict[str, Any]:
+        """Speedscope file (https://www.speedscope.app/file-format-schema.json), one sampled profile"""
+        frame_index: Dict[str, int] = {}
+        frames: List[Dict[str, str]] = []
+        samples: List[List[int]] = []
+        weights: List[float] = []
+        for stack, count in self.samples.items():
+            indices = []
+            for label in stack:
+                if label not in frame_index:
+                    frame_index[label] = len(frames)
+                    frames.append({"name": label})
+                indices.append(frame_index[label])
+            samples.append(indices)
+            weights.append(count * self.interval_seconds)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": f"{name} ({self.mode})",
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": round(self.duration_seconds, 6),
+                "samples": samples,
+                "weights": weights,
+            }],
+            "name": name,
+            "exporter": "com.mhire.app.utils.profiling",
+        }
@@ -0,0 +1,21 @@
+"""
+Locally built responses used when the AI service is unavailable
+"""
+
+EMERGENCY_RESOURCES_TEXT = """If you're in immediate danger, please call 911 right now.
+- 988 Suicide & Crisis Lifeline: call or text 988 (24/7)
+- Crisis Text Line: text HOME to 741741 (24/7)
+- Veterans Crisis Line: call 988 and press 1, or text 838255
+- Find treatment near you: https://findtreatment.gov/"""
+
+DEGRADED_CRISIS_RESPONSE = """I'm really glad you reached out, and I want to make sure you get support right away.
+
+{emergency_resources}"""
+
+DEGRADED_RESOURCE_RESPONSE = """I'm having trouble putting together a full reply right now, but here's something that might help:
+
+{resource}
+
+I'll be back to my usual self soon - please try me again in a moment."""
+
+DEGRADED_GENERAL_RESPONSE = """I'm having trouble responding right now. Please try again in a moment - I'm still here for you."""
@@ -0,0 +1,29 @@
+"""
+Canned Sora replies for trivial turns answered without calling the LLM
+(casual, 1-2 sentences, no emojis - same voice as the main system prompt)
+"""
+
+FAST_PATH_TEMPLATES = {
+    "greeting": [
+        "Hey! Good to see you. What's on your mind today?",
+        "Hi there! How are things going with your habits lately?",
+        "Hey, glad you stopped by. Anything you want to work on today?",
+        "Hello! How are you feeling today?",
+    ],
+    "thanks": [
+        "Anytime! I'm here whenever you need me.",
+        "Of course - happy to help. You've got this.",
+        "No problem at all. Let me know how it goes!",
+        "Glad I could help. Keep it up!",
+    ],
+    "acknowledgement": [
+        "Sounds good! I'm here if anything comes up.",
+        "Got it. Let me know whenever you want to pick this back up.",
+        "Cool. Anything else on your mind?",
+    ],
+    "farewell": [
+        "Take care! Talk soon.",
+        "Bye for now - proud of you for checking in.",
+        "See you later! Be kind to yourself today.",
+    ],
+}
@@ -0,0 +1,139 @@
+"""
+Circuit breaker for the Gemini generation and embedding clients
+"""
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict
+from com.mhire.app.config.config import Config
+from com.mhire.app.logger.logger import ChatEndpoint
+
+logger = ChatEndpoint.setup_chat_logger()
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a dependency whose breaker is open"""
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after `failure_threshold` consecutive failures.
+    Open -> half-open after `reset_timeout_seconds`; up to `half_open_max_calls`
+    probe calls are let through. A successful probe closes the breaker, a
+    failed one re-opens it for another timeout.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout_seconds: float = 30.0,
+        half_open_max_calls: int = 1
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.half_open_max_calls = half_open_max_calls
+
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._half_open_in_flight = 0
+        self.rejected_count = 0
+        self.open_count = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout_seconds:
+            self._transition(self.HALF_OPEN)
+        return self._state
+
+    def _transition(self, state: str):
+        if state == self._state:
+            return
+        logger.warning(f"Circuit breaker '{self.name}': {self._state} -> {state}")
+        self._state = state
+        if state == self.OPEN:
+            self._opened_at = time.monotonic()
+            self.open_count += 1
+        if state != self.HALF_OPEN:
+            self._half_open_in_flight = 0
+
+    def allow_request(self) -> bool:
+        """Whether a call would currently be let through (no side effects)"""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN:
+            return self._half_open_in_flight < self.half_open_max_calls
+        return False
+
+    def _on_success(self):
+        self._consecutive_failures = 0
+        if self._state != self.CLOSED:
+            self._transition(self.CLOSED)
+
+    def _on_failure(self):
+        self._consecutive_failures += 1
+        if self._state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+            self._transition(self.OPEN)
+
+    @asynccontextmanager
+    async def guard(self):
+        """
+        Guard a block (e.g. a token stream) with the breaker
+
+        Raises:
+            CircuitOpenError: If the breaker is open or its half-open probes are taken
+        """
+        state = self.state
+        if not self.allow_request():
+            self.rejected_count += 1
+            raise CircuitOpenError(f"Circuit breaker '{self.name}' is {state}")
+
+        probing = state == self.HALF_OPEN
+        if probing:
+            self._half_open_in_flight += 1
+            logger.info(f"Circuit breaker '{self.name}': sending half-open probe")
+        try:
+            yield
+        except Exception:
+            self._on_failure()
+            raise
+        else:
+            self._on_success()
+        finally:
+            if probing and self._half_open_in_flight > 0:
+                self._half_open_in_flight -= 1
+
+    async def call(self, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run a coroutine factory through the breaker"""
+        async with self.guard():
+            return await func()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "state": self.state,
+            "consecutive_failures": self._consecutive_failures,
+            "open_count": self.open_count,
+            "rejected": self.rejected_count,
+        }
+
+
+_config = Config()
+
+generation_breaker = CircuitBreaker(
+    "gemini_generation",
+    failure_threshold=_config.BREAKER_FAILURE_THRESHOLD,
+    reset_timeout_seconds=_config.BREAKER_RESET_TIMEOUT_SECONDS
+)
+
+embedding_breaker = CircuitBreaker(
+    "gemini_embedding",
+    failure_threshold=_config.BREAKER_FAILURE_THRESHOLD,
+    reset_timeout_seconds=_config.BREAKER_RESET_TIMEOUT_SECONDS
+)
@@ -0,0 +1,151 @@
+"""
+Request tracing on the OpenTelemetry API
+
+TRACING_EXPORTER selects where finished spans go:
+- "none"   (default) no SDK is installed, so every span is a no-op
+- "memory" spans are kept in a bounded in-process buffer, served as
+           waterfalls by GET /debug/traces (offline / load-test use)
+- "console" spans are printed as JSON
+- "otlp"   spans are exported over OTLP/HTTP (needs
+           opentelemetry-exporter-otlp-proto-http; endpoint from the standard
+           OTEL_EXPORTER_OTLP_ENDPOINT variable)
+
+Spans propagate through contextvars, so children created in awaited
+coroutines and asyncio tasks attach to the request's root span.
+"""
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Sequence
+from opentelemetry import trace
+from opentelemetry.trace import SpanKind
+from com.mhire.app.config.config import Config
+from com.mhire.app.logger.logger import ChatEndpoint
+
+logger = ChatEndpoint.setup_chat_logger()
+
+_memory_exporter = None
+
+
+def _build_memory_exporter(max_spans: int):
+    from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+    class RecentSpanExporter(SpanExporter):
+        """Keeps the most recent finished spans; older ones are dropped"""
+
+        def __init__(self, max_spans: int):
+            self._spans = deque(maxlen=max_spans)
+
+        def export(self, spans: Sequence) -> "SpanExportResult":
+            self._spans.extend(spans)
+            return SpanExportResult.SUCCESS
+
+        def get_finished_spans(self) -> List:
+            return list(self._spans)
+
+        def shutdown(self):
+            self._spans.clear()
+
+    return RecentSpanExporter(max_spans)
+
+
+def configure_tracing(config: Config):
+    """Install the SDK tracer provider for the configured exporter (once, at import)"""
+    global _memory_exporter
+    exporter_name = config.TRACING_EXPORTER
+    if exporter_name == "none":
+        return
+
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter, SimpleSpanProcessor
+
+    provider = TracerProvider(resource=Resource.create({"service.name": config.TRACING_SERVICE_NAME}))
+    if exporter_name == "memory":
+        _memory_exporter = _build_memory_exporter(config.TRACING_MEMORY_MAX_SPANS)
+        provider.add_span_processor(SimpleSpanProcessor(_memory_exporter))
+    elif exporter_name == "console":
+        provider.add_span_processor(BatchSpanProcessor(ConsoleSpanExporter()))
+    elif exporter_name == "otlp":
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError:
+            logger.error("TRACING_EXPORTER=otlp needs opentelemetry-exporter-otlp-proto-http; tracing disabled")
+            return
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    else:
+        logger.error(f"Unknown TRACING_EXPORTER '{exporter_name}'; tracing disabled")
+        return
+
+    trace.set_tracer_provider(provider)
+    logger.info(f"Tracing enabled with '{exporter_name}' exporter")
+
+
+configure_tracing(Config())
+_tracer = trace.get_tracer("com.mhire.app")
+
+
+@contextmanager
+def start_span(name: str, kind: SpanKind = SpanKind.INTERNAL, **attributes: Any):
+    """
+    Start a span as a child of the current one
+
+    None-valued attributes are dropped. Exceptions leaving the block are
+    recorded on the span and mark it as an error.
+
+    Yields:
+        The span, for attributes only known after the work (result counts etc.)
+    """
+    with _tracer.start_as_current_span(
+        name,
+        kind=kind,
+        attributes={key: value for key, value in attributes.items() if value is not None}
+    ) as span:
+        yield span
+
+
+def get_recent_traces(limit: int = 20) -> Optional[List[Dict[str, Any]]]:
+    """
+    Most recent traces from the memory exporter as waterfalls
+
+    Returns:
+        Newest first; each trace lists its spans in start order with offset and
+        duration in ms and their depth under the root. None when the memory
+        exporter is not active.
+    """
+    if _memory_exporter is None:
+        return None
+
+    traces: "OrderedDict[int, List]" = OrderedDict()
+    for span in _memory_exporter.get_finished_spans():
+        traces.setdefault(span.context.trace_id, []).append(span)
+
+    waterfalls = []
+    for trace_id, spans in list(traces.items())[-limit:][::-1]:
+        spans.sort(key=lambda s: s.start_time)
+        parents = {s.context.span_id: s.parent.span_id if s.parent else None for s in spans}
+
+        def depth(span_id: int) -> int:
+            level = 0
+            while parents.get(span_id) in parents:
+                span_id = parents[span_id]
+                level += 1
+            return level
+
+        trace_start = spans[0].start_time
+        trace_end = max(s.end_time for s in spans)
+        waterfalls.append({
+            "trace_id": format(trace_id, "032x"),
+            "duration_ms": round((trace_end - trace_start) / 1e6, 2),
+            "spans": [
+                {
+                    "name": s.name,
+                    "depth": depth(s.context.span_id),
+                    "offset_ms": round((s.start_time - trace_start) / 1e6, 2),
+                    "duration_ms": round((s.end_time - s.start_time) / 1e6, 2),
+                    "status": s.status.status_code.name,
+                    "attributes": dict(s.attributes or {}),
+                }
+                for s in spans
+            ],
+        })
+    return waterfalls
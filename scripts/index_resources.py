@@ -7,10 +7,8 @@ import os
 import sys
 from pathlib import Path
 from typing import List
-from google import genai
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import FAISS
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
 from langchain_community.document_loaders import (
     PyPDFLoader,
     TextLoader,
@@ -23,18 +21,18 @@ project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
 from com.mhire.app.config.config import Config
+from com.mhire.app.services.providers.provider_registry import create_embeddings
+from com.mhire.app.services.rag.partitions import chunk_sections
 
 
 class ResourceIndexer:
     def __init__(self):
         self.config = Config()
-        genai.Client(api_key=self.config.GEMINI_API_KEY)
         
-        # Initialize embeddings
-        self.embeddings = GoogleGenerativeAIEmbeddings(
-            model="models/embedding-001",
-            google_api_key=self.config.GEMINI_API_KEY
-        )
+        # Initialize embeddings (EMBEDDING_PROVIDER=stub builds an offline index for load tests)
+        self.embeddings = create_embeddings("models/embedding-001")
+        if self.config.EMBEDDING_PROVIDER != "gemini":
+            print(f"⚠️  Using '{self.config.EMBEDDING_PROVIDER}' embeddings - this index is only for offline testing")
         
         # Text splitter for chunking
         self.text_splitter = RecursiveCharacterTextSplitter(
@@ -112,6 +110,10 @@ class ResourceIndexer:
         chunks = self.text_splitter.split_documents(documents)
         print(f"✅ Created {len(chunks)} chunks")
         
+        # Record each chunk's top-level sections; the retriever partitions by them
+        for chunk, sections in zip(chunks, chunk_sections(chunks)):
+            chunk.metadata['sections'] = sections
+        
         print(f"\n🧠 Generating embeddings and creating FAISS index...")
         print("   (This may take a few minutes depending on content size)")
         
@@ -140,6 +142,7 @@ class ResourceIndexer:
     def _display_index_stats(self, chunks):
         """Display statistics about indexed resources"""
         resource_types = {}
+        sections = {}
         sources = set()
         
         for chunk in chunks:
@@ -147,6 +150,8 @@ class ResourceIndexer:
             source = chunk.metadata.get('source', 'unknown')
             
             resource_types[rtype] = resource_types.get(rtype, 0) + 1
+            for section in chunk.metadata.get('sections') or ['none']:
+                sections[section] = sections.get(section, 0) + 1
             sources.add(source)
         
         print("\n" + "="*50)
@@ -157,6 +162,9 @@ class ResourceIndexer:
         print("\nBreakdown by resource type:")
         for rtype, count in resource_types.items():
             print(f"  • {rtype}: {count} chunks")
+        print("\nBreakdown by section:")
+        for section, count in sections.items():
+            print(f"  • {section}: {count} chunks")
         print("="*50)
     
     def run(self):